@@ -1,4 +1,14 @@
-# pylint: disable=wildcard-import, unused-wildcard-import, unused-import
-# flake8: noqa: F405
-from admin_panel.integrations import sqlalchemy
-from admin_panel import schema
+import importlib
+
+# Подмодули загружаются при первом обращении: import admin_panel не тянет FastAPI, SQLAlchemy и прочее
+LAZY_SUBMODULES = {
+    'sqlalchemy': 'admin_panel.integrations.sqlalchemy',
+    'schema': 'admin_panel.schema',
+}
+
+
+def __getattr__(name):
+    if name in LAZY_SUBMODULES:
+        return importlib.import_module(LAZY_SUBMODULES[name])
+
+    raise AttributeError(f'module "admin_panel" has no attribute "{name}"')
@@ -1,24 +1,32 @@
+import asyncio
+import json
+
 from fastapi import APIRouter, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
 
 from admin_panel.api.utils import get_category
-from admin_panel.exceptions import AdminAPIException
+from admin_panel.exceptions import AdminAPIException, APIError
 from admin_panel.schema.admin_schema import AdminSchema
 from admin_panel.schema.graphs.category_graphs import CategoryGraphs, GraphData, GraphsDataResult
 from admin_panel.translations import LanguageManager
+from admin_panel.translations import TranslateText as _
 from admin_panel.utils import get_logger
 
 router = APIRouter(prefix="/graph", tags=["Category - Graph"])
 
 logger = get_logger()
 
+# Интервал комментариев-пингов в потоке SSE в секундах
+SSE_PING_INTERVAL = 15
+
 
 @router.post(path='/{group}/{category}/')
 async def graph_data(request: Request, group: str, category: str, data: GraphData) -> GraphsDataResult:
     schema: AdminSchema = request.app.state.schema
     schema_category, user = await get_category(request, group, category, check_type=CategoryGraphs)
 
-    result: GraphsDataResult = await schema_category.get_data(data, user)
+    result: GraphsDataResult = await schema_category.get_cached_data(data, user)
 
     language_slug = request.headers.get('Accept-Language')
     language_manager: LanguageManager = schema.get_language_manager(language_slug)
@@ -28,3 +36,62 @@ async def graph_data(request: Request, group: str, category: str, data: GraphDat
         return JSONResponse(result.model_dump(mode='json', context=context))
     except AdminAPIException as e:
         return JSONResponse(e.get_error().model_dump(mode='json', context=context), status_code=e.status_code)
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f'event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n'
+
+
+@router.get(path='/{group}/{category}/stream/')
+async def graph_stream(
+        request: Request,
+        group: str,
+        category: str,
+        search: str | None = None,
+        filters: str | None = None,
+):
+    '''
+    Server-Sent Events with chart updates: "snapshot" with all charts, then "patch" events
+    that replace series from the "start" index of the changed charts.
+    '''
+    schema: AdminSchema = request.app.state.schema
+    schema_category, user = await get_category(request, group, category, check_type=CategoryGraphs)
+
+    language_slug = request.headers.get('Accept-Language')
+    language_manager: LanguageManager = schema.get_language_manager(language_slug)
+    context = {'language_manager': language_manager}
+
+    try:
+        if not schema_category.live_interval:
+            raise AdminAPIException(
+                APIError(message=_('method_not_allowed'), code='method_not_allowed'), status_code=500,
+            )
+
+        try:
+            data = GraphData(search=search, filters=json.loads(filters) if filters else {})
+        except (ValueError, ValidationError) as e:
+            msg = _('filter_error') % {'error': str(e)}
+            raise AdminAPIException(APIError(message=msg, code='filters_exception'), status_code=400) from e
+
+    except AdminAPIException as e:
+        return JSONResponse(e.get_error().model_dump(mode='json', context=context), status_code=e.status_code)
+
+    hub = schema_category.get_graph_stream_hub()
+
+    async def event_stream():
+        async with hub.subscribe(data, user) as queue:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_PING_INTERVAL)
+                except asyncio.TimeoutError:
+                    # Комментарий SSE не дает прокси закрыть неактивное соединение
+                    yield ': ping\n\n'
+                    continue
+
+                yield format_sse(event.type, event.model_dump(mode='json', context=context))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
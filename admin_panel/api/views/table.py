@@ -1,16 +1,22 @@
+import json
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from admin_panel.api.utils import get_category
 from admin_panel.exceptions import AdminAPIException, APIError
+from admin_panel.importers import ImportFormat, get_import_format, iter_import_rows
+from admin_panel.jobs import ActionJob
 from admin_panel.schema import AdminSchema
-from admin_panel.schema.table.admin_action import ActionData, ActionResult
+from admin_panel.schema.table.admin_action import ActionData, ActionJobResult, ActionResult
 from admin_panel.schema.table.category_table import CategoryTable
-from admin_panel.schema.table.table_models import CreateResult, ListData, RetrieveResult, TableListResult, UpdateResult
+from admin_panel.schema.table.table_models import (
+    BulkCreateResult, BulkUpdateResult, CreateResult, ListData, RetrieveManyData, RetrieveManyResult, RetrieveResult,
+    TableListResult, UpdateResult)
 from admin_panel.translations import LanguageManager
-from admin_panel.utils import get_logger
+from admin_panel.translations import TranslateText as _
+from admin_panel.utils import get_logger, make_etag
 
 router = APIRouter(prefix="/table", tags=["Category - Table"])
 
@@ -52,11 +58,51 @@ async def table_retrieve(request: Request, group: str, category: str, pk: Any) -
     language_manager: LanguageManager = schema.get_language_manager(language_slug)
     context = {'language_manager': language_manager}
 
+    # Содержимое ответа зависит от языка и пользователя
+    headers = {'Vary': 'Accept-Language, Authorization'}
+    if_none_match = request.headers.get('If-None-Match')
+
     try:
+        if if_none_match:
+            etag = await schema_category.get_retrieve_etag(pk, user, language_manager)
+            if etag and etag == if_none_match:
+                return Response(status_code=304, headers={**headers, 'ETag': etag})
+
         result: RetrieveResult = await schema_category.retrieve(pk, user, language_manager)
     except AdminAPIException as e:
         return JSONResponse(e.get_error().model_dump(mode='json', context=context), status_code=e.status_code)
 
+    content = result.model_dump(mode='json', context=context)
+    etag = result.etag or make_etag(json.dumps(content, sort_keys=True).encode())
+    headers['ETag'] = etag
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(content=content, headers=headers)
+
+
+@router.post(path='/{group}/{category}/retrieve-many/')
+async def table_retrieve_many(
+        request: Request,
+        group: str,
+        category: str,
+        retrieve_data: RetrieveManyData,
+) -> RetrieveManyResult:
+    schema: AdminSchema = request.app.state.schema
+
+    schema_category, user = await get_category(request, group, category, check_type=CategoryTable)
+    if not schema_category.has_retrieve_many:
+        raise HTTPException(status_code=404, detail=f"Category {group}.{category} is not allowed for retrive")
+
+    language_slug = request.headers.get('Accept-Language')
+    language_manager: LanguageManager = schema.get_language_manager(language_slug)
+    context = {'language_manager': language_manager}
+
+    try:
+        result: RetrieveManyResult = await schema_category.retrieve_many(retrieve_data.pks, user, language_manager)
+    except AdminAPIException as e:
+        return JSONResponse(e.get_error().model_dump(mode='json', context=context), status_code=e.status_code)
+
     return JSONResponse(content=result.model_dump(mode='json', context=context))
 
 
@@ -106,6 +152,80 @@ async def table_update(request: Request, group: str, category: str, pk: Any) ->
     return JSONResponse(content=result.model_dump(mode='json', context=context))
 
 
+@router.post(
+    path='/{group}/{category}/import/',
+    responses={400: {"model": APIError}},
+)
+async def table_import(request: Request, group: str, category: str) -> BulkCreateResult:
+    '''
+    Imports records from CSV (with header) or JSONL request body.
+    '''
+    schema: AdminSchema = request.app.state.schema
+
+    schema_category, user = await get_category(request, group, category, check_type=CategoryTable)
+    if not schema_category.has_import:
+        raise HTTPException(status_code=404, detail=f"Category {group}.{category} is not allowed for import")
+
+    language_slug = request.headers.get('Accept-Language')
+    language_manager: LanguageManager = schema.get_language_manager(language_slug)
+    context = {'language_manager': language_manager}
+
+    content_type = request.headers.get('Content-Type')
+    import_format = get_import_format(content_type)
+    if import_format is None:
+        msg = _('import_format_not_supported') % {'content_type': content_type}
+        error = APIError(message=msg, code='import_format_not_supported')
+        return JSONResponse(error.model_dump(mode='json', context=context), status_code=400)
+
+    try:
+        result: BulkCreateResult = await schema_category.bulk_create(
+            iter_import_rows(request.stream(), import_format),
+            user,
+            language_manager,
+            coerce_strings=import_format == ImportFormat.CSV,
+        )
+    except AdminAPIException as e:
+        return JSONResponse(e.get_error().model_dump(mode='json', context=context), status_code=e.status_code)
+
+    return JSONResponse(content=result.model_dump(mode='json', context=context))
+
+
+@router.patch(
+    path='/{group}/{category}/bulk-update/',
+    responses={400: {"model": APIError}},
+)
+async def table_bulk_update(request: Request, group: str, category: str) -> BulkUpdateResult:
+    '''
+    Updates several records in one transaction; request body is {pk: partial_data}.
+    '''
+    schema: AdminSchema = request.app.state.schema
+
+    schema_category, user = await get_category(request, group, category, check_type=CategoryTable)
+    if not schema_category.has_bulk_update:
+        raise HTTPException(status_code=404, detail=f"Category {group}.{category} is not allowed for bulk update")
+
+    language_slug = request.headers.get('Accept-Language')
+    language_manager: LanguageManager = schema.get_language_manager(language_slug)
+    context = {'language_manager': language_manager}
+
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+
+    try:
+        if not isinstance(data, dict) or not all(isinstance(row_data, dict) for row_data in data.values()):
+            raise AdminAPIException(
+                APIError(message=_('bulk_update_bad_body'), code='bulk_update_bad_body'), status_code=400,
+            )
+
+        result: BulkUpdateResult = await schema_category.bulk_update(data, user, language_manager)
+    except AdminAPIException as e:
+        return JSONResponse(e.get_error().model_dump(mode='json', context=context), status_code=e.status_code)
+
+    return JSONResponse(content=result.model_dump(mode='json', context=context))
+
+
 @router.post(
     path='/{group}/{category}/action/{action}/',
     responses={400: {"model": APIError}},
@@ -134,3 +254,35 @@ async def table_action(
         return JSONResponse(e.get_error().model_dump(mode='json', context=context), status_code=e.status_code)
 
     return JSONResponse(content=result.model_dump(mode='json', context=context))
+
+
+@router.get(
+    path='/{group}/{category}/action-job/{job_id}/',
+    responses={400: {"model": APIError}},
+)
+async def table_action_job(request: Request, group: str, category: str, job_id: str) -> ActionJobResult:
+    '''
+    Progress and result of the background action started by @admin_action(background=True).
+    '''
+    schema: AdminSchema = request.app.state.schema
+
+    schema_category, user = await get_category(request, group, category, check_type=CategoryTable)
+
+    job: ActionJob | None = await schema.action_job_runner.get_job(job_id)
+    if job is None or job.category != schema_category.slug or job.username != user.username:
+        raise HTTPException(status_code=404, detail=f'Action job "{job_id}" is not found')
+
+    language_slug = request.headers.get('Accept-Language')
+    language_manager: LanguageManager = schema.get_language_manager(language_slug)
+    context = {'language_manager': language_manager}
+
+    result = ActionJobResult(
+        id=job.id,
+        status=job.status,
+        progress=job.progress,
+        total=job.total,
+        progress_message=language_manager.get_text(job.progress_message),
+        result=job.result.model_dump(mode='json', context=context) if job.result else None,
+        error=job.error.model_dump(mode='json', context=context) if job.error else None,
+    )
+    return JSONResponse(content=result.model_dump(mode='json'))
@@ -0,0 +1,58 @@
+import abc
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class CacheBackend(abc.ABC):
+    '''
+    Key-value cache used by categories.
+
+    Subclass it to share cache between workers (redis, memcached, etc.).
+    '''
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Any | None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def delete(self, key: str):
+        raise NotImplementedError()
+
+
+class LocalCacheBackend(CacheBackend):
+    '''
+    In-process LRU cache with per-key TTL.
+    '''
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float | None = None):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
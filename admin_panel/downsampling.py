@@ -0,0 +1,250 @@
+import decimal
+import functools
+from typing import List, Sequence
+
+
+@functools.lru_cache(maxsize=None)
+def get_numpy():
+    '''
+    NumPy module when installed, otherwise None; imported on first use
+    '''
+    try:
+        # pylint: disable=import-outside-toplevel
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+class DownsampleMethod:
+    # Largest-Triangle-Three-Buckets: сохраняет форму линии
+    LTTB = 'lttb'
+    # Минимум и максимум каждого интервала: сохраняет пики
+    MINMAX = 'minmax'
+    # Среднее по интервалу: сглаживает шум
+    AVERAGE = 'average'
+
+    ALL = (LTTB, MINMAX, AVERAGE)
+
+
+def get_bucket_bounds(size: int, buckets: int) -> List[tuple]:
+    step = size / buckets
+    return [(int(i * step), int((i + 1) * step)) for i in range(buckets)]
+
+
+def _lttb_python(x: Sequence[float], y: Sequence[float], threshold: int) -> List[int]:
+    size = len(y)
+    # Первая и последняя точки сохраняются всегда, остальные делятся на threshold - 2 интервала
+    bounds = get_bucket_bounds(size - 2, threshold - 2)
+
+    selected = [0]
+    a = 0
+    for i, (start, end) in enumerate(bounds):
+        start, end = start + 1, end + 1
+
+        if i + 1 < len(bounds):
+            next_start, next_end = bounds[i + 1][0] + 1, bounds[i + 1][1] + 1
+        else:
+            next_start, next_end = size - 1, size
+        count = next_end - next_start
+        avg_x = sum(x[next_start:next_end]) / count
+        avg_y = sum(y[next_start:next_end]) / count
+
+        ax, ay = x[a], y[a]
+        max_area = -1
+        max_index = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                max_index = j
+
+        selected.append(max_index)
+        a = max_index
+
+    selected.append(size - 1)
+    return selected
+
+
+def _lttb_numpy(x, y, threshold: int) -> List[int]:
+    np = get_numpy()
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    size = len(y)
+    bounds = get_bucket_bounds(size - 2, threshold - 2)
+
+    selected = [0]
+    a = 0
+    for i, (start, end) in enumerate(bounds):
+        start, end = start + 1, end + 1
+
+        if i + 1 < len(bounds):
+            next_start, next_end = bounds[i + 1][0] + 1, bounds[i + 1][1] + 1
+        else:
+            next_start, next_end = size - 1, size
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        selected.append(a)
+
+    selected.append(size - 1)
+    return selected
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> List[int]:
+    '''
+    Indices of points selected by Largest-Triangle-Three-Buckets
+    '''
+    if threshold >= len(y) or threshold < 3:
+        return list(range(len(y)))
+
+    if get_numpy() is not None:
+        return _lttb_numpy(x, y, threshold)
+    return _lttb_python(x, y, threshold)
+
+
+def minmax_indices(y: Sequence[float], threshold: int) -> List[int]:
+    '''
+    Indices of min and max points of every bucket, in the original order
+    '''
+    if threshold >= len(y) or threshold < 2:
+        return list(range(len(y)))
+
+    bounds = get_bucket_bounds(len(y), threshold // 2)
+
+    np = get_numpy()
+    if np is not None:
+        values = np.asarray(y, dtype=float)
+        selected = set()
+        for start, end in bounds:
+            chunk = values[start:end]
+            selected.add(start + int(chunk.argmin()))
+            selected.add(start + int(chunk.argmax()))
+        return sorted(selected)
+
+    selected = set()
+    for start, end in bounds:
+        chunk = range(start, end)
+        selected.add(min(chunk, key=y.__getitem__))
+        selected.add(max(chunk, key=y.__getitem__))
+    return sorted(selected)
+
+
+def average_buckets(y: Sequence[float], threshold: int) -> tuple:
+    '''
+    Mean of every bucket; returns (bucket start indices, values)
+    '''
+    if threshold >= len(y) or threshold < 1:
+        return list(range(len(y))), list(y)
+
+    bounds = get_bucket_bounds(len(y), threshold)
+    starts = [start for start, _ in bounds]
+
+    np = get_numpy()
+    if np is not None:
+        values = np.add.reduceat(np.asarray(y, dtype=float), starts) / np.diff([*starts, len(y)])
+        return starts, values.tolist()
+
+    return starts, [sum(y[start:end]) / (end - start) for start, end in bounds]
+
+
+NUMBER_TYPES = {int, float, decimal.Decimal}
+
+
+def _to_floats(values):
+    # Пропуски и нечисловые значения не прореживаются: такие графики отдаются как есть
+    if not set(map(type, values)) <= NUMBER_TYPES:
+        return None
+
+    np = get_numpy()
+    if np is not None:
+        return np.fromiter(map(float, values), dtype=float, count=len(values))
+    return list(map(float, values))
+
+
+def _get_indices_x(size: int):
+    np = get_numpy()
+    if np is not None:
+        return np.arange(size, dtype=float)
+    return list(map(float, range(size)))
+
+
+def _select(x: Sequence[float], y: Sequence[float], max_points: int, method: str) -> List[int]:
+    if method == DownsampleMethod.LTTB:
+        return lttb_indices(x, y, max_points)
+    return minmax_indices(y, max_points)
+
+
+def _downsample_points(points: list, max_points: int, method: str) -> list:
+    y = _to_floats([point.get('y') if isinstance(point, dict) else None for point in points])
+    if y is None:
+        return points
+
+    if method == DownsampleMethod.AVERAGE:
+        starts, values = average_buckets(y, max_points)
+        return [{**points[start], 'y': value} for start, value in zip(starts, values)]
+
+    x = _to_floats([point.get('x') for point in points])
+    if x is None:
+        x = _get_indices_x(len(points))
+    return [points[i] for i in _select(x, y, max_points, method)]
+
+
+def downsample_chart_data(data: dict, max_points: int, method: str = DownsampleMethod.LTTB) -> dict:
+    '''
+    Reduces chart.js data {"labels": [...], "datasets": [{"data": [...]}]} to about max_points points per dataset.
+
+    Datasets of numbers share labels and keep the same points;
+    datasets of {"x": ..., "y": ...} points are downsampled separately.
+    '''
+    if method not in DownsampleMethod.ALL:
+        raise AttributeError(f'Downsample method "{method}" must be one of {DownsampleMethod.ALL}')
+
+    datasets = data.get('datasets') or []
+    labels = data.get('labels')
+
+    if labels is None:
+        result_datasets = []
+        for dataset in datasets:
+            points = dataset.get('data') or []
+            if len(points) > max_points:
+                dataset = {**dataset, 'data': _downsample_points(points, max_points, method)}
+            result_datasets.append(dataset)
+        return {**data, 'datasets': result_datasets}
+
+    size = len(labels)
+    if size <= max_points:
+        return data
+
+    series = []
+    for dataset in datasets:
+        values = dataset.get('data') or []
+        y = _to_floats(values) if len(values) == size else None
+        if y is None:
+            return data
+        series.append(y)
+
+    if method == DownsampleMethod.AVERAGE:
+        # Без наборов данных подписи усреднять не по чему
+        if not series:
+            return data
+
+        result_datasets = []
+        for dataset, y in zip(datasets, series):
+            starts, values = average_buckets(y, max_points)
+            result_datasets.append({**dataset, 'data': values})
+        return {**data, 'labels': [labels[i] for i in starts], 'datasets': result_datasets}
+
+    # Общие подписи: объединяем выбранные точки всех наборов
+    x = _get_indices_x(size)
+    indices = sorted({i for y in series for i in _select(x, y, max_points, method)})
+    return {
+        **data,
+        'labels': [labels[i] for i in indices],
+        'datasets': [
+            {**dataset, 'data': [dataset['data'][i] for i in indices]}
+            for dataset in datasets
+        ],
+    }
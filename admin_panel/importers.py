@@ -0,0 +1,113 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+
+from admin_panel.exceptions import APIError
+from admin_panel.translations import TranslateText as _
+
+
+class ImportFormat:
+    CSV = 'csv'
+    JSONL = 'jsonl'
+
+
+IMPORT_CONTENT_TYPES = {
+    'text/csv': ImportFormat.CSV,
+    'application/csv': ImportFormat.CSV,
+    'application/jsonl': ImportFormat.JSONL,
+    'application/x-jsonlines': ImportFormat.JSONL,
+    'application/x-ndjson': ImportFormat.JSONL,
+}
+
+
+def get_import_format(content_type: str | None) -> str | None:
+    if not content_type:
+        return None
+    return IMPORT_CONTENT_TYPES.get(content_type.split(';')[0].strip().lower())
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]):
+    '''
+    Splits byte chunks into decoded lines keeping "\n" line endings.
+    '''
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    tail = ''
+    async for chunk in chunks:
+        # Только "\n" завершает строку: \u2028 и прочие разделители str.splitlines допустимы в значениях
+        # Последняя строка может быть неполной
+        *lines, tail = (tail + decoder.decode(chunk)).split('\n')
+
+        for line in lines:
+            yield line.removesuffix('\r') + '\n'
+
+    tail += decoder.decode(b'', final=True)
+    if tail:
+        yield tail.removesuffix('\r')
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]):
+    '''
+    Yields complete CSV records; quoted values may contain line breaks.
+    '''
+    record = ''
+    async for line in iter_lines(chunks):
+        record += line
+
+        # Нечетное количество кавычек - запись продолжается на следующей строке
+        if record.count('"') % 2:
+            continue
+
+        yield record
+        record = ''
+
+    if record:
+        yield record
+
+
+async def iter_import_rows(chunks: AsyncIterator[bytes], import_format: str):
+    '''
+    Stream-parses uploaded file.
+
+    Yields (row_number, data, error) where data is None when the row can not be parsed.
+    '''
+    if import_format == ImportFormat.CSV:
+        header = None
+        row_number = 0
+        async for record in iter_csv_records(chunks):
+            values = next(csv.reader([record]), None)
+            if not values:
+                continue
+
+            if header is None:
+                header = [v.strip() for v in values]
+                continue
+
+            row_number += 1
+            if len(values) != len(header):
+                msg = _('import_columns_mismatch') % {'expected': len(header), 'got': len(values)}
+                yield row_number, None, APIError(message=msg, code='import_parse_error')
+                continue
+
+            yield row_number, dict(zip(header, values)), None
+        return
+
+    row_number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+
+        row_number += 1
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            msg = _('import_parse_error') % {'error': str(e)}
+            yield row_number, None, APIError(message=msg, code='import_parse_error')
+            continue
+
+        if not isinstance(data, dict):
+            msg = _('import_parse_error') % {'error': f'expected object, got {type(data).__name__}'}
+            yield row_number, None, APIError(message=msg, code='import_parse_error')
+            continue
+
+        yield row_number, data, None
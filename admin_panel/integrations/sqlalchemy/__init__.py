@@ -3,4 +3,8 @@
 from .auth import SQLAlchemyJWTAdminAuthentication
 from .autocomplete import SQLAlchemyAdminAutocompleteMixin
 from .fields_schema import SQLAlchemyFieldsSchema
+from .graphs import Aggregate, SQLAlchemyAdminGraphs, SQLAlchemyChart, TimeBucket
+from .pk import PrimaryKeyCodec
+from .rollups import SQLAlchemyRollup
+from .search import CastSearch, ExactSearch, FullTextSearch, ILikeSearch, PrefixSearch, SearchStrategy, TrigramSearch
 from .table import *
@@ -1,5 +1,6 @@
 from admin_panel.auth import AdminAuthentication, AuthData, AuthResult, UserABC, UserResult
 from admin_panel.exceptions import AdminAPIException, APIError
+from admin_panel.integrations.sqlalchemy.model_info import get_model_info
 from admin_panel.translations import TranslateText as _
 from admin_panel.utils import get_logger
 
@@ -22,7 +23,6 @@ class SQLAlchemyJWTAdminAuthentication(AdminAuthentication):
             raise ValueError("JWT secret must be a non-empty string")
 
         # pylint: disable=import-outside-toplevel
-        from sqlalchemy.inspection import inspect
         try:
             import jwt
         except ImportError as e:
@@ -31,8 +31,7 @@ class SQLAlchemyJWTAdminAuthentication(AdminAuthentication):
 
         assert hasattr(jwt, "encode"), "PyJWT is not installed"
 
-        mapper = inspect(user_model)
-        columns = {col.key for col in mapper.columns}
+        columns = get_model_info(user_model).column_keys
 
         required = {self.pk_name, "username", "is_admin"}
         missing = required - columns
@@ -86,7 +85,7 @@ class SQLAlchemyJWTAdminAuthentication(AdminAuthentication):
     async def authenticate(self, headers: dict) -> UserABC:
         # pylint: disable=import-outside-toplevel
         import jwt
-        from sqlalchemy import inspect, select
+        from sqlalchemy import select
 
         token = headers.get("Authorization")
         if not token:
@@ -112,8 +111,7 @@ class SQLAlchemyJWTAdminAuthentication(AdminAuthentication):
                 status_code=401,
             )
 
-        col = inspect(self.user_model).mapper.columns[self.pk_name]
-        python_type = col.type.python_type
+        python_type = get_model_info(self.user_model).python_types[self.pk_name]
 
         stmt = select(self.user_model).where(
             getattr(self.user_model, self.pk_name) == python_type(user_pk),
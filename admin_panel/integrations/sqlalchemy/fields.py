@@ -4,6 +4,8 @@ from pydantic.dataclasses import dataclass
 
 from admin_panel.auth import UserABC
 from admin_panel.exceptions import AdminAPIException, APIError, FieldError
+from admin_panel.integrations.sqlalchemy.model_info import get_model_info
+from admin_panel.integrations.sqlalchemy.pk import get_pk_codec
 from admin_panel.schema.category import FieldSchemaData
 from admin_panel.schema.table.fields.base import TableField
 from admin_panel.schema.table.table_models import Record
@@ -13,10 +15,8 @@ from admin_panel.utils import DeserializeAction
 
 
 def get_pk(obj):
-    pk_cols = obj.__mapper__.primary_key
-    if len(pk_cols) != 1:
-        raise NotImplementedError('Composite primary key is not supported')
-    return getattr(obj, pk_cols[0].key)
+    codec = get_pk_codec(type(obj))
+    return codec.encode(codec.get_value(obj))
 
 
 @dataclass
@@ -66,35 +66,28 @@ class SQLAlchemyRelatedField(TableField):
         return schema
 
     def _get_target_model(self, model, field_slug):
-        # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
+        model_info = get_model_info(model)
+
+        # RelationshipProperty
+        rel = model_info.relationships.get(field_slug)
+        if rel is not None:
+            return rel.mapper.class_
 
-        mapper = inspect(model).mapper
-        attr = mapper.attrs.get(field_slug)
-        if attr is None:
+        if field_slug not in model_info.attr_keys:
             msg = f'Field "{field_slug}" is not found on model "{model}"'
             raise AttributeError(msg)
 
-        # RelationshipProperty
-        if hasattr(attr, 'mapper'):
-            return attr.mapper.class_
-
-        # ColumnProperty (FK column). Try to resolve from foreign key target table.
-        col = getattr(model, field_slug).property.columns[0]
-        if not col.foreign_keys:
+        # ColumnProperty (FK column)
+        if field_slug not in model_info.columns or not model_info.columns[field_slug].foreign_keys:
             msg = f'Field "{field_slug}" is not a relationship and not a FK column'
             raise AttributeError(msg)
 
-        fk = next(iter(col.foreign_keys))
-        target_table = fk.column.table
-
-        # Find a mapped class that uses this table in the same registry
-        for m in mapper.registry.mappers:
-            if getattr(m, 'local_table', None) is target_table:
-                return m.class_
+        target_model = model_info.foreign_key_targets.get(field_slug)
+        if target_model is None:
+            msg = f'Cannot resolve target model for FK "{field_slug}"'
+            raise AttributeError(msg)
 
-        msg = f'Cannot resolve target model for FK "{field_slug}"'
-        raise AttributeError(msg)
+        return target_model
 
     async def autocomplete(self, model, data, user, *, extra: dict | None = None) -> List[Record]:
         # pylint: disable=import-outside-toplevel
@@ -212,7 +205,7 @@ class SQLAlchemyRelatedField(TableField):
 
             result = []
             for i in value:
-                obj = await session.get(self.target_model, i)
+                obj = await self.get_related_record(session, i)
                 if obj is None:
                     msg = _('related_not_found') % {
                         'model': self.target_model.__name__,
@@ -229,18 +222,22 @@ class SQLAlchemyRelatedField(TableField):
             getattr(record, rel_attr).extend(list(result))
             return
 
-        obj = await session.get(self.target_model, value)
+        obj = await self.get_related_record(session, value)
         setattr(record, rel_attr, obj)
 
-    async def apply_filter(self, stmt, value, model, column):
-        # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
+    async def get_related_record(self, session, pk):
+        try:
+            pk = get_pk_codec(self.target_model).parse(pk)
+        except (TypeError, ValueError):
+            return None
+        return await session.get(self.target_model, pk)
 
+    async def apply_filter(self, stmt, value, model, column):
         if value is None:
             return stmt
 
         rel = getattr(model, self.rel_name)
-        pk_col = inspect(self.target_model).primary_key[0]
+        pk_col = get_model_info(self.target_model).pk_column
 
         # many=False: FK (many-to-one)
         if not self.many:
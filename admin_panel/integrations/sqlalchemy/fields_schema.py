@@ -1,9 +1,15 @@
 import datetime
+import decimal
+import json
 from typing import Any
 
 from admin_panel import schema
-from admin_panel.exceptions import AdminAPIException, APIError
+from admin_panel.exceptions import AdminAPIException, APIError, FieldError
 from admin_panel.integrations.sqlalchemy.fields import SQLAlchemyRelatedField
+from admin_panel.integrations.sqlalchemy.filters import (
+    FilterOperator, compile_filter, get_python_type, is_string_column, split_lookup, string_condition)
+from admin_panel.integrations.sqlalchemy.model_info import get_model_info
+from admin_panel.integrations.sqlalchemy.pk import COMPOSITE_PK_NAME, get_pk_codec
 from admin_panel.schema.table.fields.base import DateTimeField
 from admin_panel.translations import TranslateText as _
 from admin_panel.utils import DeserializeAction, humanize_field_name
@@ -14,6 +20,13 @@ FIELD_FILTERS_NOT_FOUND = '{class_name} filter "{field_slug}" not found inside t
 class SQLAlchemyFieldsSchema(schema.FieldsSchema):
     model: Any
 
+    # Интроспекция модели выполняется при первом обращении к полям
+    deferred_setup = True
+
+    # Загружать после create значения, которые заполняет БД (server_default, Computed);
+    # pk для ответа берется из identity и refresh не требует
+    refresh_on_create: bool = False
+
     def __init__(self, *args, model=None, **kwargs):
         if model:
             self.model = model
@@ -24,15 +37,14 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
         generated_fields = super().generate_fields(kwargs)
 
         # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
         from sqlalchemy.dialects.postgresql import ARRAY
         from sqlalchemy.ext.mutable import Mutable
         from sqlalchemy.sql import sqltypes
         from sqlalchemy.sql.schema import Column
 
-        mapper = inspect(self.model).mapper
+        model_info = get_model_info(self.model)
 
-        for attr in mapper.column_attrs:
+        for attr in model_info.column_attrs:
             col: Column = attr.columns[0]
             field_slug = attr.key
 
@@ -44,7 +56,7 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
             field_data["label"] = info.get('label', humanize_field_name(field_slug))
             field_data["help_text"] = info.get('help_text')
 
-            field_data["read_only"] = col.primary_key
+            field_data["read_only"] = col.primary_key or field_slug == model_info.version_field
 
             # Whether the field is required on input (best-effort heuristic)
             field_data["required"] = (
@@ -58,10 +70,7 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
                 field_data["choices"] = [(c[0], c[1]) for c in info["choices"]]
 
             col_type = col.type
-            try:
-                py_t = col_type.python_type
-            except Exception:
-                py_t = None
+            py_t = model_info.python_types[field_slug]
 
             impl = getattr(attr, 'impl', None)
             is_mutable = isinstance(impl, Mutable)
@@ -119,13 +128,10 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
         return generated_fields
 
     def generate_related_fields(self):
-        # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
-
-        mapper = inspect(self.model).mapper
+        model_info = get_model_info(self.model)
 
         # relationship-поля
-        for rel in mapper.relationships:
+        for rel in model_info.relationships:
             field_slug = rel.key
 
             field_data = {}
@@ -148,18 +154,10 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
             yield field_slug, SQLAlchemyRelatedField(**field_data)
 
         # FK-поля
-        for attr in mapper.column_attrs:
+        for attr in model_info.column_attrs:
             col = attr.columns[0]
 
-            if not col.foreign_keys:
-                continue
-
-            rel_obj = None
-            for rel in mapper.relationships:
-                if col in rel.local_columns:
-                    rel_obj = rel
-                    break
-
+            rel_obj = model_info.column_relationships.get(attr.key)
             if not rel_obj:
                 continue
 
@@ -186,10 +184,10 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
             yield field_slug, SQLAlchemyRelatedField(**field_data)
 
     async def apply_filters(self, stmt, filters: dict):
-        # pylint: disable=import-outside-toplevel
-        from sqlalchemy import String, cast
-
-        for field_slug in filters.keys():
+        plain_filters = {}
+        lookup_filters = []
+        for key, value in filters.items():
+            field_slug, operator = split_lookup(key)
             field = self.get_field(field_slug)
 
             if not field:
@@ -201,8 +199,20 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
                 )
                 raise AttributeError(msg)
 
+            if operator is None:
+                plain_filters[field_slug] = value
+
+            elif callable(getattr(field, 'apply_filter', None)):
+                # Поле фильтрует само: eq идет тем же путем, что и фильтр без оператора
+                if operator != FilterOperator.EQ:
+                    raise FieldError(f'Filter operator "{operator}" is not supported for field "{field_slug}"')
+                plain_filters[field_slug] = value
+
+            else:
+                lookup_filters.append((field_slug, operator, value))
+
         deserialized_filters = await self.deserialize(
-            filters,
+            plain_filters,
             DeserializeAction.FILTERS,
             extra={'model': self.model},
         )
@@ -216,33 +226,46 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
                 stmt = await apply_filter(stmt, value, self.model, column)
 
             elif issubclass(type(field), DateTimeField) and field.range:
-                stmt = stmt.where(column >= value['from'])
-                stmt = stmt.where(column <= value['to'])
+                stmt = stmt.where(compile_filter(column, FilterOperator.RANGE, value))
 
             elif isinstance(value, list):
-                stmt = stmt.where(column.in_(value))
+                stmt = stmt.where(compile_filter(column, FilterOperator.IN, value))
 
-            elif isinstance(value, str):
-                stmt = stmt.where(
-                    cast(column, String).like(value)
-                )
+            elif isinstance(value, str) and is_string_column(column):
+                stmt = stmt.where(string_condition(column, value))
+
+            elif isinstance(value, str) and get_python_type(column) in (None, dict, list):
+                # pylint: disable=import-outside-toplevel
+                from sqlalchemy import String, cast
+
+                stmt = stmt.where(cast(column, String).like(value))
 
             else:
-                stmt = stmt.where(column == value)
+                stmt = stmt.where(compile_filter(column, FilterOperator.EQ, value))
+
+        for field_slug, operator, value in lookup_filters:
+            column = getattr(self.model, field_slug, None)
+            if column is None or field_slug not in get_model_info(self.model).columns:
+                raise FieldError(f'Filter operator "{operator}" is not supported for field "{field_slug}"')
+
+            stmt = stmt.where(compile_filter(column, operator, value))
 
         return stmt
 
     async def serialize(self, record, extra: dict, *args, **kwargs) -> dict:
-        # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
-
         # Convert model values to dict
         record_data = {
             attr.key: getattr(record, attr.key, None)
-            for attr in inspect(record).mapper.column_attrs
+            for attr in get_model_info(type(record)).column_attrs
             if self.get_field(attr.key)
         }
-        return await super().serialize(record_data, extra, *args, **kwargs)
+        data = await super().serialize(record_data, extra, *args, **kwargs)
+
+        # Составной ключ отдается одной строкой, по ней клиент запрашивает запись
+        pk_codec = get_pk_codec(type(record))
+        if pk_codec.composite:
+            data[COMPOSITE_PK_NAME] = pk_codec.encode(pk_codec.get_value(record))
+        return data
 
     def validate_incoming_data(self, data):
         '''
@@ -261,6 +284,9 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
                 )
 
     async def create(self, user, data, session):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import inspect
+
         self.validate_incoming_data(data)
 
         record = self.model()
@@ -291,18 +317,112 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
                     await field.update_related(record, field_slug, value, session)
 
         await session.commit()
-        await session.refresh(record)
+
+        # pk заполняется при INSERT (RETURNING или lastrowid); refresh нужен только для
+        # значений от БД, которые не пришли через RETURNING или истекли после commit
+        if self.refresh_on_create:
+            unloaded = inspect(record).unloaded
+            if any(key in unloaded for key in get_model_info(self.model).server_default_keys):
+                await session.refresh(record)
+
         return record
 
-    async def update(self, record, user, data, session):
+    def coerce_string_values(self, data: dict) -> dict:
+        '''
+        Converts string values (CSV import) to python types of model columns
+        '''
+        model_info = get_model_info(self.model)
+
+        result = {}
+        errors = {}
+        for field_slug, value in data.items():
+            if not isinstance(value, str) or field_slug not in model_info.columns:
+                result[field_slug] = value
+                continue
+
+            if value == '':
+                result[field_slug] = None
+                continue
+
+            python_type = model_info.python_types.get(field_slug) or str
+
+            try:
+                if python_type is bool:
+                    result[field_slug] = value.strip().lower() in ('1', 'true', 'yes', 'on')
+                elif python_type in (int, float, decimal.Decimal):
+                    result[field_slug] = python_type(value.strip())
+                elif python_type in (dict, list):
+                    result[field_slug] = json.loads(value)
+                else:
+                    result[field_slug] = value
+            except (ValueError, decimal.InvalidOperation):
+                errors[field_slug] = FieldError(f'bad {python_type.__name__} value: {value}')
+
+        if errors:
+            raise AdminAPIException(
+                APIError(message='Validation error', code='validation_error', field_errors=errors),
+                status_code=400,
+            )
+        return result
+
+    async def deserialize_insert_values(self, data: dict) -> dict:
+        '''
+        Deserializes data for INSERT: relations are converted into their FK columns
+        '''
         self.validate_incoming_data(data)
 
         deserialized_data = await self.deserialize(
+            data,
+            DeserializeAction.CREATE,
+            extra={'model': self.model},
+        )
+
+        model_info = get_model_info(self.model)
+
+        values = {}
+        for field_slug, value in deserialized_data.items():
+            # Не переданные поля оставляем на default колонок
+            if value is None and field_slug not in data:
+                continue
+
+            field = self.get_field(field_slug)
+            if not isinstance(field, SQLAlchemyRelatedField) or field_slug in model_info.columns:
+                values[field_slug] = value
+                continue
+
+            rel = model_info.relationships[field.rel_name]
+            local_columns = list(rel.local_columns)
+            if field.many or len(local_columns) != 1 or local_columns[0].key not in model_info.columns:
+                msg = _('import_related_not_supported') % {'field_slug': field_slug}
+                raise AdminAPIException(
+                    APIError(message=msg, code='import_related_not_supported'),
+                    status_code=400,
+                )
+
+            values[local_columns[0].key] = value
+
+        return values
+
+    async def deserialize_update(self, data) -> dict:
+        self.validate_incoming_data(data)
+
+        return await self.deserialize(
             data,
             DeserializeAction.UPDATE,
             extra={'model': self.model},
         )
 
+    async def update(self, record, user, data, session):
+        deserialized_data = await self.deserialize_update(data)
+        await self.apply_update(record, deserialized_data, session)
+
+        await session.commit()
+        return record
+
+    async def apply_update(self, record, deserialized_data: dict, session):
+        '''
+        Applies deserialized data to the record without commit
+        '''
         for field_slug, value in deserialized_data.items():
             field = self.get_field(field_slug)
 
@@ -311,6 +431,3 @@ class SQLAlchemyFieldsSchema(schema.FieldsSchema):
                 continue
 
             setattr(record, field_slug, value)
-
-        await session.commit()
-        return record
@@ -0,0 +1,130 @@
+import datetime
+import decimal
+import uuid
+
+from admin_panel.exceptions import FieldError
+from admin_panel.integrations.sqlalchemy.search import escape_like
+
+# Разделитель поля и оператора в ключе фильтра: {"title__prefix": "abc"}
+LOOKUP_SEPARATOR = '__'
+
+
+class FilterOperator:
+    EQ = 'eq'
+    IN = 'in'
+    RANGE = 'range'
+    PREFIX = 'prefix'
+    CONTAINS = 'contains'
+    ISNULL = 'isnull'
+
+    ALL = (EQ, IN, RANGE, PREFIX, CONTAINS, ISNULL)
+
+
+def split_lookup(key: str):
+    '''
+    "title__prefix" -> ("title", "prefix"); "title" -> ("title", None)
+    '''
+    field_slug, separator, operator = key.rpartition(LOOKUP_SEPARATOR)
+    if separator and operator in FilterOperator.ALL:
+        return field_slug, operator
+    return key, None
+
+
+def get_python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def is_string_column(column) -> bool:
+    return get_python_type(column) is str
+
+
+def coerce_value(column, value):
+    '''
+    Converts filter value to the column python type, so the comparison does not need CAST
+    '''
+    python_type = get_python_type(column)
+    if value is None or python_type is None or isinstance(value, python_type):
+        return value
+
+    if not isinstance(value, str):
+        if python_type is float and isinstance(value, int):
+            return value
+        raise FieldError(f'bad {python_type.__name__} value: {value}')
+
+    try:
+        if python_type is bool:
+            return value.strip().lower() in ('1', 'true', 'yes', 'on')
+        if python_type is datetime.datetime:
+            return datetime.datetime.fromisoformat(value)
+        if python_type is datetime.date:
+            return datetime.date.fromisoformat(value)
+        if python_type in (int, float, decimal.Decimal, uuid.UUID):
+            return python_type(value.strip())
+    except (ValueError, ArithmeticError) as e:
+        raise FieldError(f'bad {python_type.__name__} value: {value}') from e
+
+    return value
+
+
+def string_condition(column, value: str):
+    '''
+    LIKE predicate for a string value with optional % and _ wildcards; a prefix pattern is made sargable
+    '''
+    if '%' not in value and '_' not in value:
+        return column.like(value)
+
+    # 'abc%' - префиксный поиск, использует btree индекс
+    prefix = value[:-1]
+    if value.endswith('%') and '%' not in prefix and '_' not in prefix:
+        return column.like(escape_like(prefix) + '%', escape='\\')
+
+    return column.like(value)
+
+
+def compile_filter(column, operator: str, value):
+    '''
+    Compiles one filter operator into a WHERE condition without casting native types
+    '''
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import String, and_, cast, true
+
+    if operator == FilterOperator.ISNULL:
+        if isinstance(value, str):
+            value = value.strip().lower() in ('1', 'true', 'yes', 'on')
+        return column.is_(None) if value else column.is_not(None)
+
+    if operator == FilterOperator.IN:
+        if not isinstance(value, list):
+            raise FieldError(f'Expected list for "{operator}" filter')
+        return column.in_([coerce_value(column, i) for i in value])
+
+    if operator == FilterOperator.RANGE:
+        if not isinstance(value, dict):
+            raise FieldError(f'Expected {{"from": ..., "to": ...}} for "{operator}" filter')
+
+        conditions = []
+        if value.get('from') is not None:
+            conditions.append(column >= coerce_value(column, value['from']))
+        if value.get('to') is not None:
+            conditions.append(column <= coerce_value(column, value['to']))
+        return and_(true(), *conditions)
+
+    if operator in (FilterOperator.PREFIX, FilterOperator.CONTAINS):
+        if not isinstance(value, str):
+            raise FieldError(f'Expected string for "{operator}" filter')
+
+        pattern = escape_like(value) + '%'
+        if operator == FilterOperator.CONTAINS:
+            pattern = '%' + pattern
+
+        # Для нестроковых колонок без CAST не обойтись
+        target = column if is_string_column(column) else cast(column, String)
+        return target.like(pattern, escape='\\')
+
+    if isinstance(value, str) and is_string_column(column):
+        return column == value
+
+    return column == coerce_value(column, value)
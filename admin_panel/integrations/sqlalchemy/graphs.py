@@ -0,0 +1,405 @@
+import asyncio
+import datetime
+import decimal
+from typing import Any, List
+
+from admin_panel.exceptions import AdminAPIException, APIError, FieldError
+from admin_panel.integrations.sqlalchemy.fields_schema import SQLAlchemyFieldsSchema
+from admin_panel.schema.graphs.category_graphs import CategoryGraphs, ChartData, GraphData, GraphsDataResult
+from admin_panel.translations import TranslateText as _
+from admin_panel.utils import DeserializeAction, get_logger
+
+logger = get_logger()
+
+
+class TimeBucket:
+    HOUR = 'hour'
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
+    YEAR = 'year'
+
+    ALL = (HOUR, DAY, WEEK, MONTH, YEAR)
+
+    # Интервал выбирается по диапазону дат из фильтров
+    AUTO = 'auto'
+
+
+# Приблизительная длительность интервалов для выбора размера
+BUCKET_DURATIONS = {
+    TimeBucket.HOUR: datetime.timedelta(hours=1),
+    TimeBucket.DAY: datetime.timedelta(days=1),
+    TimeBucket.WEEK: datetime.timedelta(weeks=1),
+    TimeBucket.MONTH: datetime.timedelta(days=30),
+    TimeBucket.YEAR: datetime.timedelta(days=365),
+}
+
+
+def select_bucket(date_from: datetime.datetime | None, date_to: datetime.datetime | None, max_points: int) -> str:
+    '''
+    Smallest bucket that keeps the date range within max_points points
+    '''
+    if date_from is None or date_to is None:
+        return TimeBucket.DAY
+
+    span = date_to - date_from
+    for bucket in TimeBucket.ALL:
+        if span / BUCKET_DURATIONS[bucket] <= max_points:
+            return bucket
+    return TimeBucket.YEAR
+
+
+class Aggregate:
+    COUNT = 'count'
+    SUM = 'sum'
+    AVG = 'avg'
+    MIN = 'min'
+    MAX = 'max'
+
+    ALL = (COUNT, SUM, AVG, MIN, MAX)
+
+
+# Подписи интервалов одинаковые для всех диалектов, строки сортируются как даты
+SQLITE_BUCKET_FORMATS = {
+    TimeBucket.HOUR: '%Y-%m-%d %H:00',
+    TimeBucket.DAY: '%Y-%m-%d',
+    TimeBucket.MONTH: '%Y-%m',
+    TimeBucket.YEAR: '%Y',
+}
+MYSQL_BUCKET_FORMATS = SQLITE_BUCKET_FORMATS
+POSTGRESQL_BUCKET_FORMATS = {
+    TimeBucket.HOUR: 'YYYY-MM-DD HH24:00',
+    TimeBucket.DAY: 'YYYY-MM-DD',
+    TimeBucket.WEEK: 'YYYY-MM-DD',
+    TimeBucket.MONTH: 'YYYY-MM',
+    TimeBucket.YEAR: 'YYYY',
+}
+
+
+def date_trunc(dialect_name: str, bucket: str, column):
+    '''
+    Truncates the date column to the bucket start on the database side; returns a string label.
+    Weeks start on monday.
+    '''
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import func
+
+    if dialect_name == 'postgresql':
+        return func.to_char(func.date_trunc(bucket, column), POSTGRESQL_BUCKET_FORMATS[bucket])
+
+    if dialect_name == 'sqlite':
+        if bucket == TimeBucket.WEEK:
+            return func.date(column, '-6 days', 'weekday 1')
+        return func.strftime(SQLITE_BUCKET_FORMATS[bucket], column)
+
+    if dialect_name in ('mysql', 'mariadb'):
+        if bucket == TimeBucket.WEEK:
+            return func.date_format(func.subdate(column, func.weekday(column)), MYSQL_BUCKET_FORMATS[TimeBucket.DAY])
+        return func.date_format(column, MYSQL_BUCKET_FORMATS[bucket])
+
+    raise NotImplementedError(f'date_trunc is not implemented for dialect "{dialect_name}"')
+
+
+class SQLAlchemyChart:
+    '''
+    Time series chart: aggregate over model rows grouped by date bucket and optional group_by column.
+    '''
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            slug: str,
+            model: Any,
+            date_field: str,
+            bucket: str = TimeBucket.DAY,
+            aggregate: str = Aggregate.COUNT,
+            value_field: str | None = None,
+            group_by: str | None = None,
+            title: str | None = None,
+            type: str = 'line',  # pylint: disable=redefined-builtin
+            options: dict | None = None,
+            width: int | None = None,
+            height: int = 50,
+            max_points: int = 200,
+    ):
+        self.slug = slug
+        self.model = model
+        self.date_field = date_field
+        self.bucket = bucket
+        self.aggregate = aggregate
+        self.value_field = value_field
+        self.group_by = group_by
+        self.title = title
+        self.type = type
+        self.options = options
+        self.width = width
+        self.height = height
+        self.max_points = max_points
+
+        self.validate()
+
+    def validate(self):
+        if self.bucket not in (*TimeBucket.ALL, TimeBucket.AUTO):
+            raise AttributeError(f'Chart "{self.slug}": bucket "{self.bucket}" must be one of {TimeBucket.ALL}')
+
+        if self.aggregate not in Aggregate.ALL:
+            raise AttributeError(f'Chart "{self.slug}": aggregate "{self.aggregate}" must be one of {Aggregate.ALL}')
+
+        if self.aggregate != Aggregate.COUNT and not self.value_field:
+            raise AttributeError(f'Chart "{self.slug}": value_field is required for aggregate "{self.aggregate}"')
+
+        columns = self.model.__mapper__.columns
+        for field in (self.date_field, self.value_field, self.group_by):
+            if field and field not in columns:
+                raise AttributeError(f'Chart "{self.slug}": field "{field}" not found in model {self.model.__name__}')
+
+    def get_aggregate_expression(self):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import func
+
+        if self.aggregate == Aggregate.COUNT and not self.value_field:
+            return func.count()  # pylint: disable=not-callable
+
+        column = getattr(self.model, self.value_field)
+        return getattr(func, self.aggregate)(column)
+
+    def get_statement(self, dialect_name: str, bucket: str):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        bucket = date_trunc(dialect_name, bucket, getattr(self.model, self.date_field)).label('bucket')
+        columns = [bucket]
+        if self.group_by:
+            columns.append(getattr(self.model, self.group_by).label('group'))
+
+        stmt = select(*columns, self.get_aggregate_expression().label('value'))
+        stmt = stmt.where(getattr(self.model, self.date_field).is_not(None))
+        return stmt.group_by(*columns).order_by(*columns)
+
+    def build_chart_data(self, rows) -> ChartData:
+        labels = sorted({row.bucket for row in rows})
+        label_index = {label: i for i, label in enumerate(labels)}
+
+        # Пустой интервал для count/sum означает 0, для avg/min/max значения нет
+        empty_value = 0 if self.aggregate in (Aggregate.COUNT, Aggregate.SUM) else None
+
+        series = {}
+        for row in rows:
+            group = str(row.group) if self.group_by else (self.title or self.slug)
+            values = series.setdefault(group, [empty_value] * len(labels))
+            value = row.value
+            values[label_index[row.bucket]] = float(value) if isinstance(value, decimal.Decimal) else value
+
+        options = self.options
+        if options is None:
+            options = {'responsive': True, 'plugins': {'title': {'display': bool(self.title), 'text': self.title}}}
+
+        return ChartData(
+            slug=self.slug,
+            type=self.type,
+            data={
+                'labels': labels,
+                'datasets': [{'label': label, 'data': data} for label, data in sorted(series.items())],
+            },
+            options=options,
+            width=self.width,
+            height=self.height,
+        )
+
+
+class SQLAlchemyAdminGraphs(CategoryGraphs):
+    '''
+    Graphs category with charts aggregated in the database; only bucketed series are loaded.
+
+    Charts are limited by table_filters only: search is not supported, search_enabled stays False
+    and GraphData.search is ignored.
+    '''
+
+    charts: List[SQLAlchemyChart] = []
+
+    # Сводные таблицы SQLAlchemyRollup; подходящие графики строятся по ним вместо исходной таблицы
+    rollups: List[Any] = []
+
+    table_filters: SQLAlchemyFieldsSchema | None = None
+
+    db_async_session: Any = None
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, *args, charts=None, rollups=None, table_filters=None, db_async_session=None, **kwargs):
+        if charts:
+            self.charts = charts
+
+        if rollups:
+            self.rollups = rollups
+
+        if table_filters:
+            self.table_filters = table_filters
+
+        if db_async_session:
+            self.db_async_session = db_async_session
+
+        if not self.db_async_session:
+            msg = f'{type(self).__name__}.db_async_session is required for SQLAlchemy'
+            raise AttributeError(msg)
+
+        if not self.charts:
+            msg = f'{type(self).__name__}.charts is required'
+            raise AttributeError(msg)
+
+        slugs = [chart.slug for chart in self.charts]
+        if len(set(slugs)) != len(slugs):
+            msg = f'{type(self).__name__}.charts slugs must be unique: {slugs}'
+            raise AttributeError(msg)
+
+        if self.table_filters:
+            if not issubclass(type(self.table_filters), SQLAlchemyFieldsSchema):
+                msg = (
+                    f'{type(self).__name__}.table_filters {type(self.table_filters)} '
+                    'must be SQLAlchemyFieldsSchema subclass'
+                )
+                raise AttributeError(msg)
+
+            # Фильтры применяются к модели каждого графика
+            for chart in self.charts:
+                if chart.model is not self.table_filters.model:
+                    msg = f'{type(self).__name__}: chart "{chart.slug}" model must match table_filters model'
+                    raise AttributeError(msg)
+
+        super().__init__(*args, **kwargs)
+
+    def get_chart(self, chart_slug: str) -> SQLAlchemyChart:
+        for chart in self.charts:
+            if chart.slug == chart_slug:
+                return chart
+        raise AttributeError(f'{type(self).__name__}: chart "{chart_slug}" not found')
+
+    def get_chart_slugs(self) -> List[str]:
+        return [chart.slug for chart in self.charts]
+
+    async def apply_filters(self, stmt, data: GraphData):
+        # data.search не применяется: у графиков нет search_fields
+        if not self.table_filters or not data.filters:
+            return stmt
+
+        return await self.table_filters.apply_filters(stmt, data.filters)
+
+    async def get_date_range_filter(self, chart: SQLAlchemyChart, data: GraphData) -> dict | None:
+        if not self.table_filters or chart.date_field not in data.filters:
+            return None
+
+        deserialized = await self.table_filters.deserialize(
+            {chart.date_field: data.filters[chart.date_field]},
+            DeserializeAction.FILTERS,
+            extra={'model': chart.model},
+        )
+        value = deserialized.get(chart.date_field)
+        return value if isinstance(value, dict) else None
+
+    async def get_rollup_filters(self, rollup, chart: SQLAlchemyChart, data: GraphData) -> dict | None:
+        '''
+        Deserialized filters when all of them can be applied to the rollup table, otherwise None
+        '''
+        if not data.filters:
+            return {}
+
+        if not self.table_filters or not set(data.filters).issubset({chart.date_field, rollup.group_by}):
+            return None
+
+        for field_slug in data.filters:
+            field = self.table_filters.get_field(field_slug)
+            if field is None or getattr(field, 'apply_filter', None):
+                return None
+
+        filters = await self.table_filters.deserialize(
+            data.filters, DeserializeAction.FILTERS, extra={'model': chart.model},
+        )
+        if chart.date_field in filters and not isinstance(filters[chart.date_field], dict):
+            return None
+        return filters
+
+    async def get_chart_statement(self, session, chart: SQLAlchemyChart, data: GraphData):
+        dialect_name = session.bind.dialect.name
+        date_range = await self.get_date_range_filter(chart, data)
+
+        rollups = []
+        for rollup in self.rollups:
+            if rollup.can_serve(chart, chart.bucket if chart.bucket != TimeBucket.AUTO else rollup.bucket):
+                filters = await self.get_rollup_filters(rollup, chart, data)
+                if filters is not None:
+                    rollups.append((rollup, filters))
+
+        bucket = chart.bucket
+        if bucket == TimeBucket.AUTO:
+            if date_range:
+                date_from, date_to = date_range['from'], date_range['to']
+            elif rollups:
+                date_from, date_to = await rollups[0][0].get_date_range(session)
+            else:
+                # pylint: disable=import-outside-toplevel
+                from sqlalchemy import func, select
+
+                date_column = getattr(chart.model, chart.date_field)
+                date_from, date_to = (await session.execute(select(func.min(date_column), func.max(date_column)))).one()
+            bucket = select_bucket(date_from, date_to, chart.max_points)
+
+        for rollup, filters in rollups:
+            if rollup.can_serve(chart, bucket):
+                return rollup.get_chart_statement(chart, dialect_name, bucket, filters)
+
+        return await self.apply_filters(chart.get_statement(dialect_name, bucket), data)
+
+    async def get_chart_data(self, chart_slug: str, data: GraphData, user) -> ChartData:
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import exc
+
+        chart = self.get_chart(chart_slug)
+
+        async with self.db_async_session() as session:
+            try:
+                stmt = await self.get_chart_statement(session, chart, data)
+            except FieldError as e:
+                logger.exception(
+                    'SQLAlchemy %s graph %s filters field error: %s',
+                    type(self).__name__, chart_slug, e,
+                    extra={'data': data},
+                )
+                msg = _('filter_error') % {'error': e.message}
+                raise AdminAPIException(APIError(message=msg, code='filters_exception'), status_code=500) from e
+
+            try:
+                rows = (await session.execute(stmt)).all()
+            except exc.SQLAlchemyError as e:
+                logger.exception(
+                    'SQLAlchemy %s graph %s db error: %s',
+                    type(self).__name__, chart_slug, e,
+                    extra={'data': data},
+                )
+                raise AdminAPIException(
+                    APIError(message=_('db_error_graph'), code='db_error_graph'), status_code=500,
+                ) from e
+
+        return chart.build_chart_data(rows)
+
+    async def get_data(self, data: GraphData, user) -> GraphsDataResult:
+        charts = await asyncio.gather(*[self.get_chart_data(slug, data, user) for slug in self.get_chart_slugs()])
+        return GraphsDataResult(charts=list(charts))
+
+    async def create_rollup_tables(self):
+        async with self.db_async_session() as session:
+            for rollup in self.rollups:
+                await rollup.create_tables(session)
+            await session.commit()
+
+    async def refresh_rollups(self) -> int:
+        '''
+        Incremental rollup job: aggregates rows added since the last run. Run it periodically
+        from a single worker; returns the number of processed source rows.
+        '''
+        processed = 0
+        async with self.db_async_session() as session:
+            for rollup in self.rollups:
+                processed += await rollup.refresh(session)
+
+        if processed:
+            await self.invalidate_caches()
+        return processed
@@ -0,0 +1,125 @@
+import functools
+from typing import Any, Dict, List
+
+from admin_panel.integrations.sqlalchemy.filters import get_python_type
+
+# Все созданные ModelInfo; после конфигурации новых мапперов цели FK ищутся заново
+_model_infos: List['ModelInfo'] = []
+
+
+def reset_foreign_key_targets():
+    '''
+    after_configured handler: newly mapped models may be targets of already known foreign keys
+    '''
+    for model_info in _model_infos:
+        model_info.reset_foreign_key_targets()
+
+
+class ModelInfo:
+    '''
+    Mapper metadata of a model collected once: schemas and categories of the same model share it,
+    so request handling does not inspect the mapper again.
+    '''
+
+    def __init__(self, model):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import event, inspect
+        from sqlalchemy.orm import Mapper
+
+        mapper = inspect(model).mapper
+
+        self.model = model
+        self.mapper = mapper
+
+        self.columns = mapper.columns
+        self.column_attrs = list(mapper.column_attrs)
+        self.column_keys = frozenset(attr.key for attr in self.column_attrs)
+        self.relationships = mapper.relationships
+        self.attr_keys: List[str] = [attr.key for attr in mapper.attrs]
+
+        # python_type колонок; None, если тип его не определяет (JSON, ARRAY и т.п.)
+        self.python_types: Dict[str, Any] = {
+            attr.key: get_python_type(attr.columns[0]) for attr in self.column_attrs
+        }
+
+        self.pk_columns = list(mapper.primary_key)
+        self.pk_names: List[str] = [mapper.get_property_by_column(col).key for col in self.pk_columns]
+
+        # Колонки, значения которых заполняет БД: server_default, FetchedValue, Computed
+        self.server_default_keys: List[str] = [
+            attr.key for attr in self.column_attrs
+            if attr.columns[0].server_default is not None or attr.columns[0].server_onupdate is not None
+        ]
+
+        self.version_field: str | None = None
+        if mapper.version_id_col is not None:
+            self.version_field = mapper.get_property_by_column(mapper.version_id_col).key
+
+        # FK колонка -> relationship, который через нее построен
+        self.column_relationships: Dict[str, Any] = {}
+        for attr in self.column_attrs:
+            col = attr.columns[0]
+            if not col.foreign_keys:
+                continue
+
+            for rel in mapper.relationships:
+                if col in rel.local_columns:
+                    self.column_relationships[attr.key] = rel
+                    break
+
+        self.foreign_key_keys = frozenset(attr.key for attr in self.column_attrs if attr.columns[0].foreign_keys)
+        self._foreign_key_targets: Dict[str, Any] | None = None
+
+        _model_infos.append(self)
+        if not event.contains(Mapper, 'after_configured', reset_foreign_key_targets):
+            event.listen(Mapper, 'after_configured', reset_foreign_key_targets)
+
+    @property
+    def foreign_key_targets(self) -> Dict[str, Any]:
+        # Результат, включая ненайденные цели, кешируется до следующей конфигурации мапперов
+        if self._foreign_key_targets is None:
+            self._foreign_key_targets = self.resolve_foreign_key_targets()
+        return self._foreign_key_targets
+
+    def reset_foreign_key_targets(self):
+        self._foreign_key_targets = None
+
+    def resolve_foreign_key_targets(self) -> Dict[str, Any]:
+        '''
+        FK column -> target model; columns without relationship are resolved through the registry by table
+        '''
+        tables = {m.local_table: m.class_ for m in self.mapper.registry.mappers}
+
+        targets = {}
+        for attr in self.column_attrs:
+            col = attr.columns[0]
+            if not col.foreign_keys:
+                continue
+
+            rel = self.column_relationships.get(attr.key)
+            if rel is not None:
+                targets[attr.key] = rel.mapper.class_
+                continue
+
+            target_table = next(iter(col.foreign_keys)).column.table
+            if target_table in tables:
+                targets[attr.key] = tables[target_table]
+
+        return targets
+
+    @property
+    def pk_column(self):
+        return self.pk_columns[0]
+
+    @property
+    def pk_name(self) -> str:
+        return self.pk_names[0]
+
+    @property
+    def pk_python_type(self):
+        return self.python_types[self.pk_name]
+
+
+@functools.lru_cache(maxsize=None)
+def get_model_info(model) -> ModelInfo:
+    return ModelInfo(model)
@@ -0,0 +1,112 @@
+import datetime
+import functools
+from typing import Any, List, Sequence
+from urllib.parse import quote, unquote
+
+from admin_panel.integrations.sqlalchemy.model_info import get_model_info
+
+# Разделитель значений составного ключа: "tenant:123"
+COMPOSITE_PK_SEPARATOR = ':'
+
+# Ключ с закодированным составным pk внутри сериализованной записи
+COMPOSITE_PK_NAME = '_pk'
+
+
+def coerce_pk_value(python_type, value):
+    if value is None or python_type is None or isinstance(value, python_type):
+        return value
+
+    if python_type in (datetime.datetime, datetime.date) and isinstance(value, str):
+        return python_type.fromisoformat(value)
+
+    return python_type(value)
+
+
+class PrimaryKeyCodec:
+    '''
+    Parses and encodes record keys and builds WHERE conditions for them.
+
+    A single column pk is passed as is; values of a composite pk are joined with the separator
+    ("tenant:123"); "%" and the separator inside values are percent-encoded.
+    Invalid pk raises ValueError or TypeError.
+    '''
+
+    def __init__(self, model, pk_names: List[str] | None = None, separator: str = COMPOSITE_PK_SEPARATOR):
+        model_info = get_model_info(model)
+
+        self.model = model
+        self.names = pk_names or model_info.pk_names
+        self.separator = separator
+
+        if not self.names:
+            raise AttributeError(f'Model {model.__name__} has no primary key')
+
+        for name in self.names:
+            if name not in model_info.columns:
+                raise AttributeError(f'pk field "{name}" not found in model {model.__name__}')
+
+        self.columns = [getattr(model, name) for name in self.names]
+        self.python_types = [model_info.python_types[name] for name in self.names]
+
+    @property
+    def composite(self) -> bool:
+        return len(self.names) > 1
+
+    def parse(self, pk: Any):
+        '''
+        Request pk -> column value, or tuple of values for a composite pk
+        '''
+        if not self.composite:
+            return coerce_pk_value(self.python_types[0], pk)
+
+        if isinstance(pk, str):
+            values = [unquote(value) for value in pk.split(self.separator)]
+        elif isinstance(pk, (list, tuple)):
+            values = pk
+        else:
+            raise TypeError(f'Composite pk must be a string or a sequence; found: {pk!r}')
+
+        if len(values) != len(self.names):
+            raise ValueError(f'Composite pk "{pk}" must contain values of {self.names}')
+
+        return tuple(coerce_pk_value(python_type, value) for python_type, value in zip(self.python_types, values))
+
+    def encode(self, value: Any):
+        '''
+        Parsed pk -> value passed to the client
+        '''
+        if not self.composite:
+            return value
+        return self.separator.join(self.quote(str(item)) for item in value)
+
+    def quote(self, value: str) -> str:
+        return value.replace('%', '%25').replace(self.separator, quote(self.separator, safe=''))
+
+    def from_values(self, values: Sequence):
+        if not self.composite:
+            return values[0]
+        return tuple(values)
+
+    def get_value(self, record):
+        return self.from_values([getattr(record, name, None) for name in self.names])
+
+    def where(self, pk):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import and_
+
+        if not self.composite:
+            return self.columns[0] == pk
+        return and_(*(column == value for column, value in zip(self.columns, pk)))
+
+    def in_(self, pks: list):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import tuple_
+
+        if not self.composite:
+            return self.columns[0].in_(pks)
+        return tuple_(*self.columns).in_(pks)
+
+
+@functools.lru_cache(maxsize=None)
+def get_pk_codec(model) -> PrimaryKeyCodec:
+    return PrimaryKeyCodec(model)
@@ -0,0 +1,328 @@
+import asyncio
+import datetime
+from typing import Any, List
+
+from admin_panel.integrations.sqlalchemy.graphs import Aggregate, SQLAlchemyChart, TimeBucket, date_trunc
+from admin_panel.utils import iter_chunks
+
+# Какие интервалы графика можно собрать из интервала сводной таблицы без потери точности
+BUCKET_COMPATIBILITY = {
+    TimeBucket.HOUR: TimeBucket.ALL,
+    TimeBucket.DAY: (TimeBucket.DAY, TimeBucket.WEEK, TimeBucket.MONTH, TimeBucket.YEAR),
+    TimeBucket.WEEK: (TimeBucket.WEEK,),
+    TimeBucket.MONTH: (TimeBucket.MONTH, TimeBucket.YEAR),
+    TimeBucket.YEAR: (TimeBucket.YEAR,),
+}
+
+BUCKET_LABEL_FORMATS = ('%Y-%m-%d %H:00', '%Y-%m-%d', '%Y-%m', '%Y')
+
+WATERMARK_TABLE_NAME = 'rollup_watermark'
+PROCESSED_PK_TABLE_NAME = 'rollup_processed_pk'
+
+
+def parse_bucket_label(label) -> datetime.datetime:
+    if isinstance(label, datetime.datetime):
+        return label
+
+    for label_format in BUCKET_LABEL_FORMATS:
+        try:
+            return datetime.datetime.strptime(label, label_format)
+        except ValueError:
+            continue
+
+    raise ValueError(f'Unknown bucket label format: {label}')
+
+
+class SQLAlchemyRollup:
+    '''
+    Time series of model rows pre-aggregated into a summary table: row count,
+    sum and count of every value field per bucket and group_by value.
+
+    refresh() is incremental. The watermark is the largest pk seen by the previous run; each run
+    aggregates rows with pk above it and also re-scans the pk_lag pks below it. Pks of that window
+    that were already aggregated are stored in the rollup_processed_pk table and skipped.
+
+    A row whose transaction commits after a row with a larger pk is counted only if its pk is still
+    within pk_lag of the watermark when it becomes visible; later commits are never aggregated.
+    pk_lag=0 disables the re-scan. Changes and deletes of processed rows are not tracked,
+    so the source table must be append-only.
+    '''
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            slug: str,
+            model: Any,
+            date_field: str,
+            bucket: str = TimeBucket.HOUR,
+            group_by: str | None = None,
+            value_fields: List[str] | None = None,
+            table_name: str | None = None,
+            pk_lag: int = 1000,
+    ):
+        self.slug = slug
+        self.model = model
+        self.date_field = date_field
+        self.bucket = bucket
+        self.group_by = group_by
+        self.value_fields = value_fields or []
+        self.table_name = table_name or f'rollup_{slug}'
+        self.pk_lag = pk_lag
+
+        self.validate()
+
+        self.metadata, self.table, self.watermark_table, self.processed_pk_table = self.build_tables()
+
+        # Параллельные пересчеты одной сводной таблицы посчитали бы строки дважды
+        self._refresh_lock = asyncio.Lock()
+
+    def validate(self):
+        if self.bucket not in TimeBucket.ALL:
+            raise AttributeError(f'Rollup "{self.slug}": bucket "{self.bucket}" must be one of {TimeBucket.ALL}')
+
+        mapper = self.model.__mapper__
+        for field in (self.date_field, self.group_by, *self.value_fields):
+            if field and field not in mapper.columns:
+                raise AttributeError(f'Rollup "{self.slug}": field "{field}" not found in model {self.model.__name__}')
+
+        if len(mapper.primary_key) != 1:
+            raise AttributeError(f'Rollup "{self.slug}": model {self.model.__name__} must have single column pk')
+
+        if self.pk_lag < 0:
+            raise AttributeError(f'Rollup "{self.slug}": pk_lag must not be negative')
+
+    def get_pk_column(self):
+        return self.model.__mapper__.primary_key[0]
+
+    def build_tables(self):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String, Table
+
+        metadata = MetaData()
+        model_columns = self.model.__mapper__.columns
+
+        columns = [
+            Column('id', Integer, primary_key=True),
+            Column('bucket_start', DateTime, nullable=False, index=True),
+        ]
+        if self.group_by:
+            columns.append(Column('group_value', model_columns[self.group_by].type, nullable=True))
+
+        columns.append(Column('row_count', BigInteger, nullable=False))
+        for field in self.value_fields:
+            source_type = model_columns[field].type
+            sum_type = BigInteger() if getattr(source_type, 'python_type', None) is int else source_type
+            columns.append(Column(f'{field}_sum', sum_type, nullable=True))
+            columns.append(Column(f'{field}_count', BigInteger, nullable=False))
+
+        table = Table(self.table_name, metadata, *columns)
+        watermark_table = Table(
+            WATERMARK_TABLE_NAME,
+            metadata,
+            Column('slug', String(255), primary_key=True),
+            Column('last_pk', BigInteger, nullable=False),
+        )
+        processed_pk_table = Table(
+            PROCESSED_PK_TABLE_NAME,
+            metadata,
+            Column('slug', String(255), primary_key=True),
+            Column('pk', BigInteger, primary_key=True),
+        )
+        return metadata, table, watermark_table, processed_pk_table
+
+    def can_serve(self, chart: SQLAlchemyChart, bucket: str) -> bool:
+        if chart.model is not self.model or chart.date_field != self.date_field:
+            return False
+
+        if chart.group_by not in (None, self.group_by):
+            return False
+
+        if bucket not in BUCKET_COMPATIBILITY[self.bucket]:
+            return False
+
+        if chart.aggregate == Aggregate.COUNT:
+            return not chart.value_field or chart.value_field in self.value_fields
+
+        if chart.aggregate in (Aggregate.SUM, Aggregate.AVG):
+            return chart.value_field in self.value_fields
+
+        # min/max нельзя собрать из сумм, такие графики считаются по исходной таблице
+        return False
+
+    def get_aggregate_expression(self, chart: SQLAlchemyChart):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import func
+
+        columns = self.table.c
+        if chart.aggregate == Aggregate.COUNT:
+            if chart.value_field:
+                return func.sum(columns[f'{chart.value_field}_count'])
+            return func.sum(columns.row_count)
+
+        if chart.aggregate == Aggregate.SUM:
+            return func.sum(columns[f'{chart.value_field}_sum'])
+
+        return func.sum(columns[f'{chart.value_field}_sum']) * 1.0 / func.nullif(
+            func.sum(columns[f'{chart.value_field}_count']), 0,
+        )
+
+    def get_chart_statement(self, chart: SQLAlchemyChart, dialect_name: str, bucket: str, filters: dict):
+        '''
+        Chart series from the summary table; the date range is applied with the rollup bucket precision
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        columns = self.table.c
+        bucket_column = date_trunc(dialect_name, bucket, columns.bucket_start).label('bucket')
+        group_columns = [bucket_column]
+        if chart.group_by:
+            group_columns.append(columns.group_value.label('group'))
+
+        stmt = select(*group_columns, self.get_aggregate_expression(chart).label('value'))
+
+        date_range = filters.get(self.date_field)
+        if date_range:
+            stmt = stmt.where(columns.bucket_start >= date_range['from'], columns.bucket_start <= date_range['to'])
+
+        if self.group_by and self.group_by in filters:
+            value = filters[self.group_by]
+            if isinstance(value, list):
+                stmt = stmt.where(columns.group_value.in_(value))
+            else:
+                stmt = stmt.where(columns.group_value == value)
+
+        return stmt.group_by(*group_columns).order_by(*group_columns)
+
+    async def get_date_range(self, session):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import func, select
+
+        bucket_start = self.table.c.bucket_start
+        return (await session.execute(select(func.min(bucket_start), func.max(bucket_start)))).one()
+
+    async def create_tables(self, session):
+        connection = await session.connection()
+        await connection.run_sync(self.metadata.create_all)
+
+    async def refresh(self, session) -> int:
+        '''
+        Aggregates rows added since the watermark and merges them into the summary table.
+        Returns the number of processed source rows.
+        '''
+        async with self._refresh_lock:
+            processed = await self._refresh(session)
+            await session.commit()
+            return processed
+
+    # pylint: disable=too-many-locals
+    async def _refresh(self, session) -> int:
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import and_, delete, func, insert, or_, select, update
+
+        dialect_name = session.bind.dialect.name
+        pk_column = self.get_pk_column()
+        date_column = getattr(self.model, self.date_field)
+
+        watermark = (await session.execute(
+            select(self.watermark_table.c.last_pk).where(self.watermark_table.c.slug == self.slug)
+        )).scalar()
+
+        # Строки с pk ниже watermark могли закоммититься позже строк с большим pk: окно pk_lag пересматривается
+        lower_pk = None if watermark is None else watermark - self.pk_lag
+        lower_conditions = [] if lower_pk is None else [pk_column > lower_pk]
+
+        # Верхняя граница фиксируется заранее: строки, добавленные во время пересчета, войдут в следующий
+        upper_pk = (await session.execute(select(func.max(pk_column)).where(*lower_conditions))).scalar()
+        if upper_pk is None:
+            return 0
+        if watermark is not None:
+            upper_pk = max(upper_pk, watermark)
+
+        processed_pks = select(self.processed_pk_table.c.pk).where(self.processed_pk_table.c.slug == self.slug)
+
+        # pk из окна нового watermark выбираются явно и запоминаются: строка, закоммиченная между
+        # запросами, не будет отмечена обработанной без агрегации
+        window_start = upper_pk - self.pk_lag if lower_pk is None else max(lower_pk, upper_pk - self.pk_lag)
+        window_pks = [] if not self.pk_lag else (await session.execute(
+            select(pk_column).where(pk_column > window_start, pk_column <= upper_pk, pk_column.not_in(processed_pks))
+        )).scalars().all()
+
+        conditions = [
+            or_(
+                and_(*lower_conditions, pk_column <= upper_pk - self.pk_lag, pk_column.not_in(processed_pks)),
+                pk_column.in_(window_pks),
+            ),
+        ]
+
+        bucket_column = date_trunc(dialect_name, self.bucket, date_column).label('bucket')
+        group_columns = [bucket_column]
+        if self.group_by:
+            group_columns.append(getattr(self.model, self.group_by).label('group'))
+
+        aggregates = [func.count().label('row_count')]  # pylint: disable=not-callable
+        for field in self.value_fields:
+            column = getattr(self.model, field)
+            aggregates.append(func.sum(column).label(f'{field}_sum'))
+            aggregates.append(func.count(column).label(f'{field}_count'))
+
+        stmt = (
+            select(*group_columns, *aggregates)
+            .where(*conditions, date_column.is_not(None))
+            .group_by(*group_columns)
+        )
+
+        deltas = {}
+        for row in (await session.execute(stmt)).all():
+            key = (parse_bucket_label(row.bucket), row.group if self.group_by else None)
+            values = {'row_count': row.row_count}
+            for field in self.value_fields:
+                values[f'{field}_sum'] = row._mapping[f'{field}_sum']
+                values[f'{field}_count'] = row._mapping[f'{field}_count']
+            deltas[key] = values
+
+        columns = self.table.c
+        existing = {}
+        for chunk in iter_chunks(list({bucket_start for bucket_start, _ in deltas}), 500):
+            for row in (await session.execute(select(self.table).where(columns.bucket_start.in_(chunk)))).all():
+                existing[(row.bucket_start, row.group_value if self.group_by else None)] = row.id
+
+        new_rows = []
+        for (bucket_start, group_value), values in deltas.items():
+            row_id = existing.get((bucket_start, group_value))
+            if row_id is None:
+                new_row = {'bucket_start': bucket_start, **values}
+                if self.group_by:
+                    new_row['group_value'] = group_value
+                new_rows.append(new_row)
+                continue
+
+            # Прибавляем на стороне базы, чтобы не зависеть от прочитанных значений
+            increments = {}
+            for name, value in values.items():
+                if value is not None:
+                    increments[name] = func.coalesce(columns[name], 0) + value
+            await session.execute(update(self.table).where(columns.id == row_id).values(**increments))
+
+        if new_rows:
+            await session.execute(insert(self.table), new_rows)
+
+        if window_pks:
+            await session.execute(
+                insert(self.processed_pk_table), [{'slug': self.slug, 'pk': pk} for pk in window_pks],
+            )
+        await session.execute(
+            delete(self.processed_pk_table).where(
+                self.processed_pk_table.c.slug == self.slug,
+                self.processed_pk_table.c.pk <= upper_pk - self.pk_lag,
+            )
+        )
+
+        if watermark is None:
+            await session.execute(insert(self.watermark_table).values(slug=self.slug, last_pk=upper_pk))
+        else:
+            await session.execute(
+                update(self.watermark_table).where(self.watermark_table.c.slug == self.slug).values(last_pk=upper_pk)
+            )
+
+        return sum(values['row_count'] for values in deltas.values())
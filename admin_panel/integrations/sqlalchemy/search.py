@@ -0,0 +1,154 @@
+import abc
+import decimal
+import uuid
+
+
+def _get_python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def get_integer_bounds(column):
+    '''
+    (min, max) of the integer column type; None for other types
+    '''
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import BigInteger, Integer, SmallInteger
+
+    column_type = getattr(column, 'type', None)
+    if isinstance(column_type, BigInteger):
+        bits = 64
+    elif isinstance(column_type, SmallInteger):
+        bits = 16
+    elif isinstance(column_type, Integer):
+        bits = 32
+    else:
+        return None
+    return -2 ** (bits - 1), 2 ** (bits - 1) - 1
+
+
+def escape_like(value: str, escape: str = '\\') -> str:
+    return value.replace(escape, escape * 2).replace('%', escape + '%').replace('_', escape + '_')
+
+
+class SearchStrategy(abc.ABC):
+    '''
+    Builds search condition for one column.
+
+    get_condition returns None when the strategy can not be applied to the input,
+    e.g. not a number for an integer column; such column is skipped.
+    '''
+
+    @abc.abstractmethod
+    def get_condition(self, column, search: str):
+        raise NotImplementedError()
+
+
+class ExactSearch(SearchStrategy):
+    '''
+    column = value; value is converted to the column python type.
+    Uses regular btree index on integer, UUID and string columns.
+    '''
+
+    def get_condition(self, column, search: str):
+        python_type = _get_python_type(column)
+        if python_type is None:
+            return None
+
+        try:
+            if python_type is uuid.UUID:
+                value = uuid.UUID(search)
+            elif python_type is bool:
+                return None
+            else:
+                value = python_type(search)
+        except (TypeError, ValueError, ArithmeticError):
+            return None
+
+        # Число вне диапазона колонки не может совпасть, а драйвер упадет на переполнении
+        bounds = get_integer_bounds(column)
+        if bounds and not bounds[0] <= value <= bounds[1]:
+            return None
+
+        return column == value
+
+
+class ILikeSearch(SearchStrategy):
+    '''
+    column ILIKE value without cast; % and _ from the input work as wildcards.
+    '''
+
+    def get_condition(self, column, search: str):
+        return column.ilike(search)
+
+
+class PrefixSearch(SearchStrategy):
+    '''
+    column LIKE 'value%'; can use btree index (text_pattern_ops on PostgreSQL).
+    '''
+
+    def __init__(self, case_sensitive: bool = True):
+        self.case_sensitive = case_sensitive
+
+    def get_condition(self, column, search: str):
+        pattern = escape_like(search) + '%'
+        if self.case_sensitive:
+            return column.like(pattern, escape='\\')
+        return column.ilike(pattern, escape='\\')
+
+
+class TrigramSearch(SearchStrategy):
+    '''
+    column ILIKE '%value%'; on PostgreSQL uses GIN/GiST index with gin_trgm_ops (pg_trgm).
+    '''
+
+    def get_condition(self, column, search: str):
+        return column.ilike('%' + escape_like(search) + '%', escape='\\')
+
+
+class FullTextSearch(SearchStrategy):
+    '''
+    Full text search.
+
+    With config on PostgreSQL: to_tsvector(config, column) @@ plainto_tsquery(config, value),
+    matching the expression index ON to_tsvector(config, column).
+    Without config column.match(value) is compiled for the current dialect.
+    '''
+
+    def __init__(self, config: str | None = None):
+        self.config = config
+
+    def get_condition(self, column, search: str):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import func
+
+        if not self.config:
+            return column.match(search)
+
+        return func.to_tsvector(self.config, column).bool_op('@@')(func.plainto_tsquery(self.config, search))
+
+
+class CastSearch(SearchStrategy):
+    '''
+    CAST(column AS VARCHAR) ILIKE value; can not use indexes, only for columns of other types.
+    '''
+
+    def get_condition(self, column, search: str):
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import String, cast
+
+        return cast(column, String).ilike(search)
+
+
+def get_default_search_strategy(column) -> SearchStrategy:
+    python_type = _get_python_type(column)
+
+    if python_type is str:
+        return ILikeSearch()
+
+    if python_type in (int, float, decimal.Decimal, uuid.UUID):
+        return ExactSearch()
+
+    return CastSearch()
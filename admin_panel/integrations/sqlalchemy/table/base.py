@@ -1,9 +1,18 @@
+import datetime
 from typing import Any
 
 from admin_panel.integrations.sqlalchemy.autocomplete import SQLAlchemyAdminAutocompleteMixin
 from admin_panel.integrations.sqlalchemy.fields_schema import SQLAlchemyFieldsSchema
+from admin_panel.integrations.sqlalchemy.model_info import get_model_info
+from admin_panel.integrations.sqlalchemy.pk import COMPOSITE_PK_NAME, PrimaryKeyCodec, get_pk_codec
+from admin_panel.integrations.sqlalchemy.search import SearchStrategy, get_default_search_strategy
+from admin_panel.schema.table.admin_action import ActionData
 from admin_panel.schema.table.category_table import CategoryTable
+from admin_panel.search import SearchBackend
 from admin_panel.translations import TranslateText as _
+from admin_panel.utils import get_logger, iter_chunks
+
+logger = get_logger()
 
 EXCEPTION_REL_NAME = '''
 Model "{model_name}" doesn\'t contain rel_name:"{rel_name}" for field "{slug}"
@@ -18,10 +27,29 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
 
     search_fields = []
 
+    # Стратегии поиска по полям {field_slug: SearchStrategy};
+    # для остальных search_fields выбирается по типу колонки
+    search_strategies: dict = {}
+
+    # Внешний полнотекстовый индекс по search_fields; если задан, поиск в списке идет через него
+    search_backend: SearchBackend | None = None
+
+    # Максимальное количество pk, которое берется из search_backend;
+    # если совпадений больше, используется SQL поиск по search_fields
+    search_backend_limit: int = 1000
+
     table_schema: SQLAlchemyFieldsSchema
 
     db_async_session: Any = None
 
+    # Размер пачки при обходе записей действия (yield_per и чанки pk)
+    action_batch_size: int = 1000
+
+    # Поле версии записи для оптимистичной блокировки при update.
+    # По умолчанию берется version_id_col из __mapper_args__ модели,
+    # можно указать и обычную колонку, например updated_at.
+    version_field: str | None = None
+
     def __init__(
             self,
             *args,
@@ -31,6 +59,9 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
             ordering_fields=None,
             default_ordering=None,
             search_fields=None,
+            search_strategies=None,
+            search_backend=None,
+            version_field=None,
             **kwargs,
     ):
         if model:
@@ -39,6 +70,16 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
         if search_fields:
             self.search_fields = search_fields
 
+        if search_strategies:
+            self.search_strategies = search_strategies
+
+        if search_backend:
+            self.search_backend = search_backend
+
+        if self.search_backend and not self.search_fields:
+            msg = f'{type(self).__name__}.search_backend requires search_fields'
+            raise AttributeError(msg)
+
         if self.search_fields:
             self.search_enabled = True
             self.search_help = _('sqlalchemy_search_help') % {'fields': ', '.join(self.search_fields)}
@@ -49,6 +90,9 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
         if ordering_fields:
             self.ordering_fields = ordering_fields
 
+        if version_field:
+            self.version_field = version_field
+
         self.validate_fields()
 
         if table_schema:
@@ -75,18 +119,34 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
             msg = f'{type(self).__name__}.db_async_session is required for SQLAlchemy'
             raise AttributeError(msg)
 
-        # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
-        from sqlalchemy.sql.schema import Column
+        model_info = get_model_info(self.model)
+        if self.pk_name:
+            # Одна колонка составного ключа не уникальна: retrieve/update/delete затронули бы несколько записей
+            if len(model_info.pk_names) > 1:
+                msg = f'{type(self).__name__}.pk_name "{self.pk_name}" must not be set for model {self.model.__name__} with composite primary key {model_info.pk_names}'
+                raise AttributeError(msg)
+
+            self.pk_codec = PrimaryKeyCodec(self.model, [self.pk_name])
+        else:
+            self.pk_codec = get_pk_codec(self.model)
+            self.pk_name = COMPOSITE_PK_NAME if self.pk_codec.composite else self.pk_codec.names[0]
+
+        if not self.version_field:
+            self.version_field = model_info.version_field
 
-        for attr in inspect(self.model).mapper.column_attrs:
-            col: Column = attr.columns[0]
-            if col.primary_key and not self.pk_name:
-                self.pk_name = attr.key
-                break
+        if self.version_field and self.version_field not in model_info.columns:
+            msg = f'{type(self).__name__}.version_field "{self.version_field}" not found in model {self.model.__name__}'
+            raise AttributeError(msg)
+
+        self._search_strategies = {}
+        for field_slug in self.search_fields:
+            strategy = self.search_strategies.get(field_slug)
+            if strategy is None:
+                strategy = get_default_search_strategy(getattr(self.model, field_slug))
+            self._search_strategies[field_slug] = strategy
 
-        if not self.default_ordering and self.pk_name:
-            self.default_ordering = f'-{self.pk_name}'
+        if not self.default_ordering:
+            self.default_ordering = f'-{self.pk_codec.names[0]}'
 
         super().__init__(*args, **kwargs)
 
@@ -102,6 +162,17 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
                         f'{type(self).__name__}: search field "{field}" not found in model {self.model.__name__}'
                     )
 
+        for field, strategy in self.search_strategies.items():
+            if field not in self.search_fields:
+                raise AttributeError(
+                    f'{type(self).__name__}: search strategy field "{field}" not found in search_fields'
+                )
+
+            if not isinstance(strategy, SearchStrategy):
+                raise AttributeError(
+                    f'{type(self).__name__}: search strategy for "{field}" must be SearchStrategy instance'
+                )
+
         if self.ordering_fields:
             for field in self.ordering_fields:
                 column = getattr(self.model, field, None)
@@ -110,6 +181,21 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
                         f'{type(self).__name__}: ordering field "{field}" not found in model {self.model.__name__}'
                     )
 
+    def get_record_pk(self, record):
+        '''
+        Returns encoded pk from the identity key, so expired after commit record is not loaded again
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import inspect
+
+        state = inspect(record)
+        pk_names = get_model_info(state.mapper.class_).pk_names
+        if state.identity is None or not set(self.pk_codec.names) <= set(pk_names):
+            return self.pk_codec.encode(self.pk_codec.get_value(record))
+
+        values = [state.identity[pk_names.index(name)] for name in self.pk_codec.names]
+        return self.pk_codec.encode(self.pk_codec.from_values(values))
+
     def get_queryset(self):
         # pylint: disable=import-outside-toplevel
         from sqlalchemy import select
@@ -122,20 +208,206 @@ class SQLAlchemyAdminBase(SQLAlchemyAdminAutocompleteMixin, CategoryTable):
 
             # pylint: disable=protected-access
             if field._type == "related":
-
-                # pylint: disable=import-outside-toplevel
-                from sqlalchemy import inspect
-
-                model_attrs = [attr.key for attr in inspect(self.model).mapper.attrs]
                 if not hasattr(self.model, field.rel_name):
                     msg = EXCEPTION_REL_NAME.format(
                         slug=slug,
                         model_name=self.model.__name__,
                         rel_name=field.rel_name,
-                        model_attrs=model_attrs,
+                        model_attrs=get_model_info(self.model).attr_keys,
                     )
                     raise AttributeError(msg)
 
                 stmt = stmt.options(selectinload(getattr(self.model, field.rel_name)))
 
         return stmt
+
+    def apply_queryset_scope(self, stmt):
+        '''
+        Limits select, update or delete statement to the records visible through get_queryset()
+        '''
+        queryset = self.get_queryset()
+
+        # WHERE с join-ами ссылается на чужие таблицы, поэтому ограничение идет через pk IN (SELECT ...)
+        if queryset.get_final_froms() != [self.model.__table__]:
+            return stmt.where(self.pk_codec.in_(queryset.with_only_columns(*self.pk_codec.columns)))
+
+        if queryset.whereclause is not None:
+            stmt = stmt.where(queryset.whereclause)
+        return stmt
+
+    def parse_pk(self, pk):
+        return self.pk_codec.parse(pk)
+
+    def parse_version(self, version):
+        python_type = get_model_info(self.model).python_types[self.version_field]
+        if python_type is datetime.datetime and isinstance(version, str):
+            return datetime.datetime.fromisoformat(version)
+        return python_type(version)
+
+    async def search_backend_pks(self, search: str) -> list | None:
+        '''
+        Parsed pks found by search_backend; None when there are more than search_backend_limit matches
+        '''
+        found_pks = await self.search_backend.search(
+            self.get_search_index_name(), search, self.search_backend_limit + 1,
+        )
+        if len(found_pks) > self.search_backend_limit:
+            logger.warning(
+                'SQLAlchemy %s search index %s found more than %s records, SQL search is used',
+                type(self).__name__, self.get_search_index_name(), self.search_backend_limit,
+            )
+            return None
+
+        return [self.parse_pk(pk) for pk in found_pks]
+
+    async def apply_list_search(self, stmt, list_data):
+        '''
+        Search through search_backend when it is set, otherwise SQL search by search_strategies.
+
+        Matches above search_backend_limit are not cut off: the SQL search is used instead,
+        so total_count and send_to_all actions cover every matching record.
+        '''
+        if not self.search_backend or not list_data.search:
+            return self.apply_search(stmt, list_data)
+
+        pks = await self.search_backend_pks(list_data.search)
+        if pks is None:
+            return self.apply_search(stmt, list_data)
+
+        return stmt.where(self.pk_codec.in_(pks))
+
+    def get_search_index_name(self) -> str:
+        return self.slug
+
+    def get_search_document(self, values: tuple) -> str:
+        return ' '.join(str(value) for value in values if value is not None)
+
+    def get_search_documents(self, rows):
+        '''
+        (encoded pk, document) for rows selected as (*pk columns, *search_fields columns)
+        '''
+        size = len(self.pk_codec.names)
+        for row in rows:
+            pk = self.pk_codec.encode(self.pk_codec.from_values(row[:size]))
+            yield pk, self.get_search_document(tuple(row[size:]))
+
+    async def reindex_records(self, pks: list):
+        '''
+        Updates documents of the records inside search_backend; index errors do not break the request
+        '''
+        if not self.search_backend or not pks:
+            return
+
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        columns = [getattr(self.model, field_slug) for field_slug in self.search_fields]
+        index_name = self.get_search_index_name()
+
+        try:
+            async with self.db_async_session() as session:
+                for chunk in iter_chunks([self.parse_pk(pk) for pk in pks], self.action_batch_size):
+                    stmt = select(*self.pk_codec.columns, *columns).where(self.pk_codec.in_(chunk))
+                    documents = dict(self.get_search_documents((await session.execute(stmt)).all()))
+                    await self.search_backend.index(index_name, documents)
+
+                    missing = [pk for pk in map(self.pk_codec.encode, chunk) if pk not in documents]
+                    await self.search_backend.remove(index_name, missing)
+
+        except Exception as e:
+            logger.exception(
+                'SQLAlchemy %s search index %s update error: %s', type(self).__name__, index_name, e,
+            )
+
+    async def remove_from_search_index(self, pks: list):
+        if not self.search_backend or not pks:
+            return
+
+        try:
+            await self.search_backend.remove(
+                self.get_search_index_name(), [self.pk_codec.encode(self.parse_pk(pk)) for pk in pks],
+            )
+        except Exception as e:
+            logger.exception(
+                'SQLAlchemy %s search index %s remove error: %s', type(self).__name__, self.get_search_index_name(), e,
+            )
+
+    async def rebuild_search_index(self):
+        '''
+        Fills search_backend with all records of the model
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        index_name = self.get_search_index_name()
+        await self.search_backend.clear(index_name)
+
+        columns = [getattr(self.model, field_slug) for field_slug in self.search_fields]
+        stmt = select(*self.pk_codec.columns, *columns).execution_options(yield_per=self.action_batch_size)
+
+        async with self.db_async_session() as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions():
+                await self.search_backend.index(index_name, dict(self.get_search_documents(rows)))
+
+    async def iter_action_statements(self, action_data: ActionData, stmt=None, batch_size: int | None = None):
+        '''
+        Yields statements limited to the records the action is applied to.
+
+        With send_to_all a single statement with the list filters and search is yielded,
+        otherwise one statement per chunk of selected pks; both are limited by get_queryset().
+        Works for select, update and delete statements.
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        if stmt is None:
+            stmt = select(self.model)
+
+        # Записи, скрытые get_queryset(), не затрагиваются действием
+        stmt = self.apply_queryset_scope(stmt)
+
+        if action_data.send_to_all:
+            stmt = await self.apply_filters(stmt, action_data)
+            yield await self.apply_list_search(stmt, action_data)
+            return
+
+        pks = [self.parse_pk(pk) for pk in action_data.pks]
+        for chunk in iter_chunks(pks, batch_size or self.action_batch_size):
+            yield stmt.where(self.pk_codec.in_(chunk))
+
+    async def iter_action_pks(self, session, action_data: ActionData, batch_size: int | None = None):
+        '''
+        Streams pks of the action records in batches using server-side cursor.
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        batch_size = batch_size or self.action_batch_size
+        pk_columns = self.pk_codec.columns
+
+        base_stmt = select(*pk_columns).order_by(*pk_columns).execution_options(yield_per=batch_size)
+        async for stmt in self.iter_action_statements(action_data, base_stmt, batch_size):
+            result = await session.stream(stmt)
+            async for partition in result.partitions():
+                yield [self.pk_codec.from_values(row) for row in partition]
+
+    async def iter_action_records(self, session, action_data: ActionData, batch_size: int | None = None, stmt=None):
+        '''
+        Streams model records of the action in batches using server-side cursor.
+
+        Records are attached to the passed session, so changes can be committed by the caller.
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        batch_size = batch_size or self.action_batch_size
+
+        if stmt is None:
+            stmt = select(self.model)
+
+        base_stmt = stmt.order_by(*self.pk_codec.columns).execution_options(yield_per=batch_size)
+        async for stmt_part in self.iter_action_statements(action_data, base_stmt, batch_size):
+            result = await session.stream(stmt_part)
+            async for partition in result.scalars().partitions():
+                yield list(partition)
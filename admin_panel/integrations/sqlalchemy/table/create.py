@@ -1,3 +1,5 @@
+from typing import AsyncIterator
+
 from admin_panel import schema
 from admin_panel.auth import UserABC
 from admin_panel.exceptions import AdminAPIException, APIError
@@ -11,6 +13,9 @@ logger = get_logger()
 class SQLAlchemyAdminCreate:
     has_create: bool = True
 
+    # Количество строк в одном INSERT при импорте
+    import_batch_size: int = 1000
+
     async def create(
             self,
             data: dict,
@@ -26,7 +31,7 @@ class SQLAlchemyAdminCreate:
         try:
             async with self.db_async_session() as session:
                 record = await self.table_schema.create(user, data, session)
-                pk_value = getattr(record, self.pk_name, None)
+                pk_value = self.get_record_pk(record)
 
         except AdminAPIException as e:
             raise e
@@ -70,4 +75,120 @@ class SQLAlchemyAdminCreate:
             type(self).__name__, self.table_schema.model.__name__, pk_value, user.username,
             extra={'data': data},
         )
+        await self.reindex_records([pk_value])
+        await self.invalidate_caches([pk_value])
         return schema.CreateResult(pk=pk_value)
+
+    async def bulk_create(
+            self,
+            rows: AsyncIterator[tuple],
+            user: UserABC,
+            language_manager: LanguageManager,
+            coerce_strings: bool = False,
+    ) -> schema.BulkCreateResult:
+        '''
+        Imports rows (row_number, data, error) with batched INSERT statements.
+
+        Invalid rows are reported inside errors and do not abort other batches.
+        '''
+        if not self.has_create:
+            raise AdminAPIException(APIError(message=_('method_not_allowed')), status_code=500)
+
+        created = 0
+        errors = {}
+        batch = []
+
+        async for row_number, data, error in rows:
+            if error is not None:
+                errors[row_number] = error
+                continue
+
+            try:
+                if coerce_strings:
+                    data = self.table_schema.coerce_string_values(data)
+                batch.append((row_number, await self.table_schema.deserialize_insert_values(data)))
+            except AdminAPIException as e:
+                errors[row_number] = e.get_error()
+                continue
+
+            if len(batch) >= self.import_batch_size:
+                created += await self.insert_batch(batch, errors)
+                batch = []
+
+        if batch:
+            created += await self.insert_batch(batch, errors)
+
+        logger.info(
+            '%s model %s imported %s records by %s',
+            type(self).__name__, self.table_schema.model.__name__, created, user.username,
+            extra={'errors_count': len(errors)},
+        )
+        if created:
+            await self.invalidate_caches()
+        return schema.BulkCreateResult(created=created, errors=errors)
+
+    async def insert_batch(self, batch: list, errors: dict) -> int:
+        '''
+        Inserts one batch of (row_number, values) in its own transaction.
+
+        A batch failed with IntegrityError is split in halves, so valid rows are inserted
+        and only the offending rows are reported inside errors.
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import insert
+        from sqlalchemy.exc import IntegrityError
+
+        row_numbers = [row_number for row_number, _values in batch]
+
+        stmt = insert(self.model)
+        if self.search_backend:
+            # pk новых записей нужны для поискового индекса
+            stmt = stmt.returning(*self.pk_codec.columns)
+
+        try:
+            async with self.db_async_session() as session:
+                result = await session.execute(stmt, [values for _row_number, values in batch])
+                created_pks = [self.pk_codec.from_values(row) for row in result.all()] if self.search_backend else []
+                await session.commit()
+
+        except ConnectionRefusedError as e:
+            logger.exception(
+                'SQLAlchemy %s import %s db error: %s',
+                type(self).__name__, self.table_schema.model.__name__, e,
+                extra={'rows': row_numbers},
+            )
+            msg = _('connection_refused_error') % {'error': str(e)}
+            raise AdminAPIException(
+                APIError(message=msg, code='connection_refused_error'),
+                status_code=500,
+            ) from e
+
+        except IntegrityError as e:
+            # Пачка делится пополам, пока ошибка не останется только на виновных строках
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                return await self.insert_batch(batch[:middle], errors) + await self.insert_batch(batch[middle:], errors)
+
+            logger.warning(
+                'SQLAlchemy %s import %s db error: %s',
+                type(self).__name__, self.table_schema.model.__name__, e,
+                extra={'rows': row_numbers},
+            )
+            orig = e.orig
+            message = orig.args[0] if orig.args else type(orig).__name__
+            for row_number in row_numbers:
+                errors[row_number] = APIError(message=message, code='db_integrity_error')
+            return 0
+
+        except Exception as e:
+            logger.exception(
+                'SQLAlchemy %s import %s db error: %s',
+                type(self).__name__, self.table_schema.model.__name__, e,
+                extra={'rows': row_numbers},
+            )
+            for row_number in row_numbers:
+                errors[row_number] = APIError(message=_('db_error_create'), code='db_error_create')
+            return 0
+
+        await self.reindex_records(created_pks)
+        return len(batch)
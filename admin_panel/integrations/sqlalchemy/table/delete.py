@@ -1,11 +1,17 @@
 from admin_panel.exceptions import APIError, AdminAPIException
 from admin_panel.schema.table.admin_action import ActionData, ActionMessage, ActionResult, admin_action
 from admin_panel.translations import TranslateText as _
+from admin_panel.utils import get_logger
+
+logger = get_logger()
 
 
 class SQLAlchemyDeleteAction:
     has_delete: bool = True
 
+    # Максимальное количество pk внутри одного DELETE ... WHERE pk IN (...)
+    delete_batch_size: int = 1000
+
     @admin_action(
         title=_('delete'),
         confirmation_text=_('delete_confirmation_text'),
@@ -15,4 +21,97 @@ class SQLAlchemyDeleteAction:
     async def delete(self, action_data: ActionData):
         if not self.has_delete:
             raise AdminAPIException(APIError(message=_('method_not_allowed')), status_code=500)
-        return ActionResult(message=ActionMessage(_('deleted_successfully')))
+
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import delete
+        from sqlalchemy.exc import IntegrityError
+
+        deleted_count = 0
+
+        # pk для удаления из поискового индекса; убираются только после успешного commit
+        deleted_pks = list(action_data.pks)
+
+        try:
+            async with self.db_async_session() as session:
+                base_stmt = delete(self.model).execution_options(synchronize_session=False)
+                if self.search_backend and action_data.send_to_all:
+                    deleted_count = await self.delete_indexed_chunks(session, action_data, base_stmt, deleted_pks)
+                else:
+                    async for stmt in self.iter_action_statements(action_data, base_stmt, self.delete_batch_size):
+                        result = await session.execute(stmt)
+                        deleted_count += result.rowcount
+
+                await session.commit()
+
+        except AdminAPIException as e:
+            raise e
+
+        except ConnectionRefusedError as e:
+            logger.exception(
+                'SQLAlchemy %s delete %s db error: %s',
+                type(self).__name__, self.model.__name__, e,
+                extra={'action_data': action_data},
+            )
+            msg = _('connection_refused_error') % {'error': str(e)}
+            raise AdminAPIException(
+                APIError(message=msg, code='connection_refused_error'),
+                status_code=500,
+            ) from e
+
+        except IntegrityError as e:
+            logger.warning(
+                'SQLAlchemy %s delete %s db error: %s',
+                type(self).__name__, self.model.__name__, e,
+                extra={'action_data': action_data},
+            )
+            orig = e.orig
+            message = orig.args[0] if orig.args else type(orig).__name__
+            raise AdminAPIException(
+                APIError(message=message, code='db_integrity_error'), status_code=500,
+            ) from e
+
+        except Exception as e:
+            logger.exception(
+                'SQLAlchemy %s delete %s db error: %s',
+                type(self).__name__, self.model.__name__, e,
+                extra={'action_data': action_data},
+            )
+            raise AdminAPIException(
+                APIError(message=_('db_error_delete'), code='db_error_delete'), status_code=500,
+            ) from e
+
+        logger.info(
+            '%s model %s deleted %s records',
+            type(self).__name__, self.model.__name__, deleted_count,
+            extra={'action_data': action_data},
+        )
+        await self.remove_from_search_index(deleted_pks)
+        await self.invalidate_caches(None if action_data.send_to_all else action_data.pks)
+        return ActionResult(message=ActionMessage(_('deleted_count') % {'count': deleted_count}))
+
+    async def delete_indexed_chunks(self, session, action_data: ActionData, base_stmt, deleted_pks: list) -> int:
+        '''
+        Deletes send_to_all records by chunks of delete_batch_size pks; encoded pks are added to deleted_pks,
+        so the caller removes them from search_backend after commit
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        # Удаленные строки больше не попадают в выборку, поэтому каждый раз берется первый чанк
+        pk_stmt = self.apply_queryset_scope(select(*self.pk_codec.columns).limit(self.delete_batch_size))
+        pk_stmt = await self.apply_filters(pk_stmt, action_data)
+        pk_stmt = await self.apply_list_search(pk_stmt, action_data)
+
+        deleted_count = 0
+        while True:
+            pks = [self.pk_codec.from_values(row) for row in (await session.execute(pk_stmt)).all()]
+            if not pks:
+                break
+
+            result = await session.execute(base_stmt.where(self.pk_codec.in_(pks)))
+            deleted_pks.extend(self.pk_codec.encode(pk) for pk in pks)
+            deleted_count += result.rowcount
+            if not result.rowcount:
+                break
+
+        return deleted_count
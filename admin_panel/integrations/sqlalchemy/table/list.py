@@ -1,6 +1,11 @@
+import hashlib
+import json
+
 from admin_panel import auth, schema
+from admin_panel.cache import CacheBackend, LocalCacheBackend
 from admin_panel.exceptions import AdminAPIException, APIError, FieldError
 from admin_panel.integrations.sqlalchemy.fields_schema import SQLAlchemyFieldsSchema
+from admin_panel.integrations.sqlalchemy.search import ExactSearch, SearchStrategy
 from admin_panel.translations import LanguageManager
 from admin_panel.translations import TranslateText as _
 from admin_panel.utils import get_logger
@@ -12,6 +17,46 @@ class SQLAlchemyAdminListMixin:
     table_schema: SQLAlchemyFieldsSchema
     table_filters: SQLAlchemyFieldsSchema | None
 
+    # Время жизни кеша страниц списка в секундах; 0 - кеш выключен
+    list_cache_ttl: float = 0
+    list_cache_max_size: int = 1000
+    list_cache: CacheBackend | None = None
+
+    def get_list_cache(self) -> CacheBackend:
+        if self.list_cache is None:
+            self.list_cache = LocalCacheBackend(max_size=self.list_cache_max_size)
+        return self.list_cache
+
+    def get_list_cache_scope(self, user: auth.UserABC) -> str:
+        '''
+        Part of the cache key for users that see the same list; override for shared caches by role
+        '''
+        return user.username
+
+    async def get_list_cache_key(self, list_data: schema.ListData, user: auth.UserABC) -> str:
+        normalized = {
+            'page': max(1, list_data.page or 1),
+            'limit': self.get_page_limit(list_data),
+            'ordering': list_data.ordering or self.default_ordering,
+            'search': (list_data.search or '').strip(),
+            'filters': list_data.filters,
+            'scope': self.get_list_cache_scope(user),
+        }
+        digest = hashlib.blake2b(json.dumps(normalized, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+        generation = await self.get_list_cache().get(f'list:{self.slug}:generation') or 0
+        return f'list:{self.slug}:{generation}:{digest}'
+
+    async def invalidate_caches(self, pks=None):
+        await super().invalidate_caches(pks)
+
+        if not self.list_cache_ttl:
+            return
+
+        # Любое изменение может повлиять на любую страницу списка
+        cache = self.get_list_cache()
+        generation_key = f'list:{self.slug}:generation'
+        await cache.set(generation_key, (await cache.get(generation_key) or 0) + 1)
+
     def apply_ordering(self, stmt, list_data):
         # pylint: disable=import-outside-toplevel
         from sqlalchemy import asc, desc
@@ -39,29 +84,37 @@ class SQLAlchemyAdminListMixin:
 
         return stmt.order_by(direction(column))
 
+    def get_search_strategy(self, field_slug: str) -> SearchStrategy:
+        return self._search_strategies[field_slug]
+
     def apply_search(self, stmt, list_data: schema.ListData):
         # pylint: disable=import-outside-toplevel
-        from sqlalchemy import String, cast, or_
-        from sqlalchemy.orm import InstrumentedAttribute
+        from sqlalchemy import false, or_
 
         if not self.search_fields or not list_data.search:
             return stmt
 
-        search = list_data.search
-        conditions = []
+        search = list_data.search.strip()
 
+        # Строка в кавычках - точное совпадение
+        exact = len(search) >= 2 and search[0] == search[-1] == '"'
+        if exact:
+            search = search[1:-1]
+
+        conditions = []
         for field_slug in self.search_fields:
-            column = getattr(self.model, field_slug, None)
-            if not isinstance(column, InstrumentedAttribute):
-                msg = f'{type(self).__name__} filter "{field_slug}" not found as field inside model {self.model}'
-                raise AttributeError(msg)
+            column = getattr(self.model, field_slug)
+            strategy = ExactSearch() if exact else self.get_search_strategy(field_slug)
 
-            conditions.append(cast(column, String).ilike(search))
+            condition = strategy.get_condition(column, search)
+            if condition is not None:
+                conditions.append(condition)
 
-        if conditions:
-            stmt = stmt.where(or_(*conditions))
+        # Ни одно поле не подходит под ввод (например, текст для числовых полей)
+        if not conditions:
+            return stmt.where(false())
 
-        return stmt
+        return stmt.where(or_(*conditions))
 
     async def apply_filters(self, stmt, list_data: schema.ListData):
         if not self.table_filters or not list_data.filters:
@@ -73,9 +126,12 @@ class SQLAlchemyAdminListMixin:
 
         return await self.table_filters.apply_filters(stmt, list_data.filters)
 
+    def get_page_limit(self, list_data: schema.ListData) -> int:
+        return min(150, max(1, list_data.limit or 25))
+
     def apply_pagination(self, stmt, list_data: schema.ListData):
         page = max(1, list_data.page or 1)
-        limit = min(150, max(1, list_data.limit or 25))
+        limit = self.get_page_limit(list_data)
 
         offset = (page - 1) * limit
 
@@ -92,10 +148,17 @@ class SQLAlchemyAdminListMixin:
         # pylint: disable=import-outside-toplevel
         from sqlalchemy import exc, func, select
 
+        cache_key = None
+        if self.list_cache_ttl:
+            cache_key = await self.get_list_cache_key(list_data, user)
+            cached = await self.get_list_cache().get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
             stmt = self.get_queryset()
             stmt = await self.apply_filters(stmt, list_data)
-            stmt = self.apply_search(stmt, list_data)
+            stmt = await self.apply_list_search(stmt, list_data)
 
             count_stmt = select(func.count()).select_from(stmt.subquery())
             stmt = self.apply_pagination(stmt, list_data)
@@ -175,4 +238,8 @@ class SQLAlchemyAdminListMixin:
                 APIError(message=_('db_error_list'), code='db_error_list'), status_code=500,
             ) from e
 
-        return schema.TableListResult(data=data, total_count=int(total_count or 0))
+        result = schema.TableListResult(data=data, total_count=int(total_count or 0))
+        if cache_key:
+            await self.get_list_cache().set(cache_key, result, ttl=self.list_cache_ttl)
+
+        return result
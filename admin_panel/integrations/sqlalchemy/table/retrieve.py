@@ -1,6 +1,9 @@
-from typing import Any
+import hashlib
+import json
+from typing import Any, List
 
 from admin_panel import auth, schema
+from admin_panel.cache import CacheBackend, LocalCacheBackend
 from admin_panel.exceptions import AdminAPIException, APIError
 from admin_panel.translations import LanguageManager
 from admin_panel.translations import TranslateText as _
@@ -12,6 +15,79 @@ logger = get_logger()
 class SQLAlchemyAdminRetrieveMixin:
     has_retrieve: bool = True
 
+    # Максимальное количество pk в одном retrieve_many
+    retrieve_many_limit: int = 100
+
+    # Время жизни кеша retrieve в секундах; 0 - кеш выключен
+    retrieve_cache_ttl: float = 0
+    retrieve_cache: CacheBackend | None = None
+
+    def get_retrieve_cache(self) -> CacheBackend:
+        if self.retrieve_cache is None:
+            self.retrieve_cache = LocalCacheBackend()
+        return self.retrieve_cache
+
+    def get_retrieve_cache_scope(self, user: auth.UserABC) -> str:
+        '''
+        Users with the same scope get the same serialized record; override for shared caches by role
+        '''
+        return user.username
+
+    async def get_retrieve_cache_key(self, pk) -> str:
+        generation = await self.get_retrieve_cache().get(f'retrieve:{self.slug}:generation') or 0
+        return f'retrieve:{self.slug}:{generation}:{self.pk_codec.encode(pk)}'
+
+    def make_version_etag(self, pk, version, user: auth.UserABC, language_manager: LanguageManager) -> str:
+        # Ответ зависит от языка и пользователя, поэтому они тоже входят в ETag
+        variant = json.dumps([language_manager.language, self.get_retrieve_cache_scope(user)])
+        variant_hash = hashlib.blake2b(variant.encode(), digest_size=8).hexdigest()
+        return f'W/"{self.slug}-{self.pk_codec.encode(pk)}-{version}-{variant_hash}"'
+
+    async def get_retrieve_etag(
+            self, pk: Any, user: auth.UserABC, language_manager: LanguageManager,
+    ) -> str | None:
+        '''
+        ETag from version_field with a single column query
+        '''
+        if not self.version_field:
+            return None
+
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select
+
+        try:
+            pk = self.parse_pk(pk)
+        except (TypeError, ValueError):
+            # Некорректный pk: ошибку вернет retrieve
+            return None
+        stmt = select(getattr(self.model, self.version_field)).where(self.pk_codec.where(pk))
+
+        queryset_where = self.get_queryset().whereclause
+        if queryset_where is not None:
+            stmt = stmt.where(queryset_where)
+
+        async with self.db_async_session() as session:
+            row = (await session.execute(stmt)).first()
+
+        if row is None:
+            return None
+        return self.make_version_etag(pk, row[0], user, language_manager)
+
+    async def invalidate_caches(self, pks: List[Any] | None = None):
+        await super().invalidate_caches(pks)
+
+        if not self.retrieve_cache_ttl:
+            return
+
+        cache = self.get_retrieve_cache()
+        if pks is None:
+            generation_key = f'retrieve:{self.slug}:generation'
+            await cache.set(generation_key, (await cache.get(generation_key) or 0) + 1)
+            return
+
+        for pk in pks:
+            await cache.delete(await self.get_retrieve_cache_key(self.parse_pk(pk)))
+
     async def retrieve(
             self,
             pk: Any,
@@ -21,14 +97,31 @@ class SQLAlchemyAdminRetrieveMixin:
         if not self.has_delete:
             raise AdminAPIException(APIError(message=_('method_not_allowed')), status_code=500)
 
-        # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
+        assert self.pk_name
+        try:
+            pk = self.parse_pk(pk)
+        except (TypeError, ValueError) as e:
+            msg = _('record_not_found') % {'pk_name': self.pk_name, 'pk': pk}
+            raise AdminAPIException(
+                APIError(message=msg, code='record_not_found'),
+                status_code=400,
+            ) from e
 
-        col = inspect(self.model).mapper.columns[self.pk_name]
-        python_type = col.type.python_type
+        # Сериализация может зависеть от пользователя, поэтому кеш записи разделен по get_retrieve_cache_scope
+        cache_key = None
+        cache_scope = self.get_retrieve_cache_scope(user)
+        if self.retrieve_cache_ttl:
+            cache_key = await self.get_retrieve_cache_key(pk)
+            cached = await self.get_retrieve_cache().get(cache_key) or {}
+            if cache_scope in cached:
+                result = cached[cache_scope]
+                if not self.version_field:
+                    return result
+                # ETag зависит от языка, а кеш записи - нет
+                etag = self.make_version_etag(pk, result.version, user, language_manager)
+                return result.model_copy(update={'etag': etag})
 
-        assert self.pk_name
-        stmt = self.get_queryset().where(getattr(self.model, self.pk_name) == python_type(pk))
+        stmt = self.get_queryset().where(self.pk_codec.where(pk))
 
         try:
             async with self.db_async_session() as session:
@@ -47,15 +140,78 @@ class SQLAlchemyAdminRetrieveMixin:
             ) from e
 
         if record is None:
-            msg = _('record_not_found') % {'pk_name': self.pk_name, 'pk': pk}
+            msg = _('record_not_found') % {'pk_name': self.pk_name, 'pk': self.pk_codec.encode(pk)}
             raise AdminAPIException(
                 APIError(message=msg, code='record_not_found'),
                 status_code=400,
             )
 
+        version = getattr(record, self.version_field) if self.version_field else None
+
         logger.debug(
             '%s model %s #%s retrieved by %s',
             type(self).__name__, self.table_schema.model.__name__, pk, user.username,
             extra={'data': data},
         )
-        return schema.RetrieveResult(data=data)
+        etag = self.make_version_etag(pk, version, user, language_manager) if self.version_field else None
+        result = schema.RetrieveResult(data=data, version=version, etag=etag)
+
+        if cache_key:
+            cache = self.get_retrieve_cache()
+            cached = await cache.get(cache_key) or {}
+            await cache.set(cache_key, {**cached, cache_scope: result}, ttl=self.retrieve_cache_ttl)
+
+        return result
+
+    async def retrieve_many(
+            self,
+            pks: List[Any],
+            user: auth.UserABC,
+            language_manager: LanguageManager,
+    ) -> schema.RetrieveManyResult:
+        '''
+        Retrieves several records with one WHERE pk IN (...) query
+        '''
+        if len(pks) > self.retrieve_many_limit:
+            msg = _('bulk_limit_exceeded') % {'limit': self.retrieve_many_limit}
+            raise AdminAPIException(APIError(message=msg, code='bulk_limit_exceeded'), status_code=400)
+
+        parsed_pks = {}
+        for raw_pk in pks:
+            try:
+                parsed_pks[raw_pk] = self.parse_pk(raw_pk)
+            except (TypeError, ValueError):
+                parsed_pks[raw_pk] = None
+
+        pk_values = [pk for pk in parsed_pks.values() if pk is not None]
+        stmt = self.get_queryset().where(self.pk_codec.in_(pk_values))
+
+        serialized = {}
+        try:
+            async with self.db_async_session() as session:
+                for record in (await session.execute(stmt)).scalars().all():
+                    serialized[self.pk_codec.get_value(record)] = await self.table_schema.serialize(
+                        record,
+                        extra={"record": record, "user": user},
+                    )
+
+        except Exception as e:
+            logger.exception(
+                'SQLAlchemy %s retrieve many db error: %s', type(self).__name__, e,
+            )
+            raise AdminAPIException(
+                APIError(message=_('db_error_retrieve'), code='db_error_retrieve'), status_code=500,
+            ) from e
+
+        result = schema.RetrieveManyResult()
+        for raw_pk, pk in parsed_pks.items():
+            if pk in serialized:
+                result.data[str(self.pk_codec.encode(pk))] = serialized[pk]
+            else:
+                result.not_found.append(raw_pk)
+
+        logger.debug(
+            '%s model %s #%s retrieved by %s',
+            type(self).__name__, self.table_schema.model.__name__, list(result.data.keys()), user.username,
+        )
+        return result
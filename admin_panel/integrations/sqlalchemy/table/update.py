@@ -2,16 +2,26 @@ from typing import Any
 
 from admin_panel import auth, schema
 from admin_panel.exceptions import AdminAPIException, APIError
+from admin_panel.integrations.sqlalchemy.model_info import get_model_info
 from admin_panel.translations import LanguageManager
 from admin_panel.translations import TranslateText as _
 from admin_panel.utils import get_logger
 
 logger = get_logger()
 
+# Ключ с версией записи внутри данных update
+VERSION_KEY = '_version'
+
 
 class SQLAlchemyAdminUpdate:
     has_update: bool = True
 
+    # UPDATE без загрузки записи, если меняются только простые колонки
+    fast_update_enabled: bool = True
+
+    # Максимальное количество записей в одном bulk_update запросе
+    bulk_update_limit: int = 500
+
     # pylint: disable=too-many-locals
     async def update(
             self,
@@ -24,8 +34,8 @@ class SQLAlchemyAdminUpdate:
             raise AdminAPIException(APIError(message=_('method_not_allowed')), status_code=500)
 
         # pylint: disable=import-outside-toplevel
-        from sqlalchemy import inspect
         from sqlalchemy.exc import IntegrityError
+        from sqlalchemy.orm.exc import StaleDataError
 
         if pk is None:
             raise AdminAPIException(
@@ -33,26 +43,40 @@ class SQLAlchemyAdminUpdate:
                 status_code=400,
             )
 
-        col = inspect(self.table_schema.model).mapper.columns[self.pk_name]
-        python_type = col.type.python_type
+        pk = self.parse_pk(pk)
 
-        stmt = self.get_queryset().where(getattr(self.model, self.pk_name) == python_type(pk))
+        data, version = self.pop_version(data)
 
         try:
             async with self.db_async_session() as session:
-                record = (await session.execute(stmt)).scalars().first()
-                if record is None:
-                    msg = _('record_not_found') % {'pk_name': self.pk_name, 'pk': pk}
+                if self.can_fast_update(data):
+                    deserialized_data = await self.table_schema.deserialize_update(data)
+                    found = await self.fast_update(session, pk, deserialized_data, version)
+                    if found:
+                        await session.commit()
+                else:
+                    stmt = self.get_queryset().where(self.pk_codec.where(pk))
+                    record = (await session.execute(stmt)).scalars().first()
+                    found = record is not None
+                    if found:
+                        self.check_version(record, version)
+                        await self.lock_version(session, pk, version)
+                        await self.table_schema.update(record, user, data, session)
+
+                if not found:
+                    msg = _('record_not_found') % {'pk_name': self.pk_name, 'pk': self.pk_codec.encode(pk)}
                     raise AdminAPIException(
                         APIError(message=msg, code='record_not_found'),
                         status_code=400,
                     )
 
-                await self.table_schema.update(record, user, data, session)
-
         except AdminAPIException as e:
             raise e
 
+        except StaleDataError as e:
+            # version_id_col изменился между загрузкой записи и UPDATE
+            raise self.version_conflict_exception() from e
+
         except ConnectionRefusedError as e:
             logger.exception(
                 'SQLAlchemy %s update %s #%s db connection error: %s',
@@ -92,4 +116,274 @@ class SQLAlchemyAdminUpdate:
             type(self).__name__, self.table_schema.model.__name__, pk, user.username,
             extra={'data': data},
         )
-        return schema.UpdateResult(pk=pk)
+        await self.reindex_records([pk])
+        await self.invalidate_caches([pk])
+        return schema.UpdateResult(pk=self.pk_codec.encode(pk))
+
+    @property
+    def has_bulk_update(self):
+        # Переопределенный table_schema.update() коммитит каждую запись сам,
+        # поэтому bulk_update не может выполнить все строки в одной транзакции
+        return super().has_bulk_update and not self.has_schema_update_hook()
+
+    def has_schema_update_hook(self) -> bool:
+        '''
+        table_schema overrides update(), so records must be updated through it
+        '''
+        # pylint: disable=import-outside-toplevel
+        from admin_panel.integrations.sqlalchemy.fields_schema import SQLAlchemyFieldsSchema
+
+        return type(self.table_schema).update is not SQLAlchemyFieldsSchema.update
+
+    def can_fast_update(self, data: dict) -> bool:
+        '''
+        Only scalar columns are changed and neither the model nor table_schema has update hooks
+        '''
+        # pylint: disable=import-outside-toplevel
+        from admin_panel.integrations.sqlalchemy.fields import SQLAlchemyRelatedField
+        from admin_panel.integrations.sqlalchemy.fields_schema import SQLAlchemyFieldsSchema
+
+        fields = self.table_schema.get_fields()
+        field_slugs = [field_slug for field_slug in data if field_slug in fields and not fields[field_slug].read_only]
+        if not self.fast_update_enabled or not field_slugs:
+            return False
+
+        if self.has_schema_update_hook():
+            return False
+
+        if type(self.table_schema).apply_update is not SQLAlchemyFieldsSchema.apply_update:
+            return False
+
+        model_info = get_model_info(self.model)
+        mapper = model_info.mapper
+        if mapper.validators or mapper.version_id_col is not None:
+            return False
+
+        if mapper.dispatch.before_update or mapper.dispatch.after_update:
+            return False
+
+        # WHERE из get_queryset с join-ами ссылается на таблицы, которых нет в UPDATE
+        if self.get_queryset().get_final_froms() != [self.model.__table__]:
+            return False
+
+        for field_slug in field_slugs:
+            if field_slug not in model_info.column_keys:
+                return False
+
+            if isinstance(fields[field_slug], SQLAlchemyRelatedField):
+                return False
+
+        return True
+
+    def pop_version(self, data: dict):
+        '''
+        Returns data without VERSION_KEY and parsed version of the record sent by client
+        '''
+        if VERSION_KEY not in data:
+            return data, None
+
+        data = dict(data)
+        version = data.pop(VERSION_KEY)
+        if not self.version_field or version is None:
+            return data, None
+
+        try:
+            return data, self.parse_version(version)
+        except (TypeError, ValueError) as e:
+            raise self.version_conflict_exception() from e
+
+    def version_conflict_exception(self) -> AdminAPIException:
+        return AdminAPIException(
+            APIError(message=_('version_conflict'), code='version_conflict'),
+            status_code=409,
+        )
+
+    def check_version(self, record, version):
+        if version is not None and getattr(record, self.version_field) != version:
+            raise self.version_conflict_exception()
+
+    async def lock_version(self, session, pk, version):
+        '''
+        Checks version_field in the database with a locking UPDATE when it is not the mapper version_id_col
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import update
+
+        if version is None or get_model_info(self.model).mapper.version_id_col is not None:
+            return
+
+        # UPDATE без изменений блокирует строку до commit: между проверкой версии
+        # и сохранением записи ее не изменит другая транзакция.
+        # Колонки с onupdate перечислены явно, чтобы их значения не менялись
+        table = self.model.__table__
+        version_column = getattr(self.model, self.version_field)
+        values = {col: col for col in table.columns if col.onupdate is not None}
+        values[version_column] = version_column
+
+        stmt = (
+            update(table)
+            .where(self.pk_codec.where(pk), version_column == version)
+            .values(values)
+        )
+        result = await session.execute(stmt)
+        if result.rowcount == 0:
+            raise self.version_conflict_exception()
+
+    async def fast_update(self, session, pk, deserialized_data: dict, version=None) -> bool:
+        '''
+        UPDATE ... WHERE pk = :pk without loading the record; returns False if record is not found
+        '''
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy import select, update
+
+        stmt = (
+            update(self.model)
+            .where(self.pk_codec.where(pk))
+            .values(**deserialized_data)
+            .execution_options(synchronize_session=False)
+        )
+
+        # Ограничения get_queryset (например, по пользователю) применяются и здесь
+        queryset_where = self.get_queryset().whereclause
+        if queryset_where is not None:
+            stmt = stmt.where(queryset_where)
+
+        if version is not None:
+            stmt = stmt.where(getattr(self.model, self.version_field) == version)
+
+        if session.get_bind().dialect.update_returning:
+            result = await session.execute(stmt.returning(*self.pk_codec.columns))
+            updated = result.first() is not None
+        else:
+            result = await session.execute(stmt)
+            updated = result.rowcount > 0
+
+        if updated or version is None:
+            return updated
+
+        # Запись есть, но версия отличается
+        exists = (await session.execute(select(*self.pk_codec.columns).where(self.pk_codec.where(pk)))).first()
+        if exists:
+            raise self.version_conflict_exception()
+        return False
+
+    # pylint: disable=too-many-locals
+    async def bulk_update(
+            self,
+            data: dict,
+            user: auth.UserABC,
+            language_manager: LanguageManager,
+    ) -> schema.BulkUpdateResult:
+        '''
+        Updates several records in one transaction.
+
+        data is {pk: partial_data}; rows with errors are skipped and reported inside errors.
+        '''
+        if not self.has_bulk_update:
+            raise AdminAPIException(APIError(message=_('method_not_allowed')), status_code=500)
+
+        if len(data) > self.bulk_update_limit:
+            msg = _('bulk_limit_exceeded') % {'limit': self.bulk_update_limit}
+            raise AdminAPIException(APIError(message=msg, code='bulk_limit_exceeded'), status_code=400)
+
+        # pylint: disable=import-outside-toplevel
+        from sqlalchemy.exc import IntegrityError
+        from sqlalchemy.orm.exc import StaleDataError
+
+        errors = {}
+        updated_pks = []
+
+        # Сначала десериализация всех строк: ошибки валидации не трогают БД
+        rows = {}
+        for raw_pk, row_data in data.items():
+            try:
+                pk = self.parse_pk(raw_pk)
+            except (TypeError, ValueError):
+                msg = _('record_not_found') % {'pk_name': self.pk_name, 'pk': raw_pk}
+                errors[raw_pk] = APIError(message=msg, code='record_not_found')
+                continue
+
+            try:
+                row_data, version = self.pop_version(row_data)
+                rows[pk] = (raw_pk, await self.table_schema.deserialize_update(row_data), version)
+            except AdminAPIException as e:
+                errors[raw_pk] = e.get_error()
+
+        stmt = self.get_queryset().where(self.pk_codec.in_(list(rows.keys())))
+
+        try:
+            async with self.db_async_session() as session:
+                records = {
+                    self.pk_codec.get_value(record): record
+                    for record in (await session.execute(stmt)).scalars().all()
+                }
+
+                for pk, (raw_pk, deserialized_data, version) in rows.items():
+                    record = records.get(pk)
+                    if record is None:
+                        msg = _('record_not_found') % {'pk_name': self.pk_name, 'pk': raw_pk}
+                        errors[raw_pk] = APIError(message=msg, code='record_not_found')
+                        continue
+
+                    try:
+                        self.check_version(record, version)
+                        with session.no_autoflush:
+                            await self.table_schema.apply_update(record, deserialized_data, session)
+                    except AdminAPIException as e:
+                        # Откат несохраненных изменений строки
+                        session.expire(record)
+                        errors[raw_pk] = e.get_error()
+                        continue
+
+                    updated_pks.append(raw_pk)
+
+                await session.commit()
+
+        except AdminAPIException as e:
+            raise e
+
+        except StaleDataError as e:
+            raise self.version_conflict_exception() from e
+
+        except ConnectionRefusedError as e:
+            logger.exception(
+                'SQLAlchemy %s bulk update %s db connection error: %s',
+                type(self).__name__, self.table_schema.model.__name__, e,
+                extra={'data': data},
+            )
+            msg = _('connection_refused_error') % {'error': str(e)}
+            raise AdminAPIException(
+                APIError(message=msg, code='connection_refused_error'),
+                status_code=400,
+            ) from e
+
+        except IntegrityError as e:
+            logger.warning(
+                'SQLAlchemy %s bulk update %s db error: %s',
+                type(self).__name__, self.table_schema.model.__name__, e,
+                extra={'data': data},
+            )
+            orig = e.orig
+            message = orig.args[0] if orig.args else type(orig).__name__
+            raise AdminAPIException(
+                APIError(message=message, code='db_integrity_error'), status_code=500,
+            ) from e
+
+        except Exception as e:
+            logger.exception(
+                'SQLAlchemy %s bulk update %s db error: %s',
+                type(self).__name__, self.table_schema.model.__name__, e,
+                extra={'data': data}
+            )
+            raise AdminAPIException(
+                APIError(message=_('db_error_update'), code='db_error_update'), status_code=500,
+            ) from e
+
+        logger.info(
+            '%s model %s #%s bulk updated by %s',
+            type(self).__name__, self.table_schema.model.__name__, updated_pks, user.username,
+            extra={'data': data},
+        )
+        await self.reindex_records(updated_pks)
+        await self.invalidate_caches(updated_pks)
+        return schema.BulkUpdateResult(pks=updated_pks, errors=errors)
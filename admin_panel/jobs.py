@@ -0,0 +1,168 @@
+import abc
+import asyncio
+import contextvars
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from pydantic import Field
+from pydantic.dataclasses import dataclass
+
+from admin_panel.exceptions import AdminAPIException, APIError
+from admin_panel.translations import TranslateText
+from admin_panel.utils import DataclassBase, get_logger
+
+logger = get_logger()
+
+_current_job = contextvars.ContextVar('admin_panel_current_job', default=None)
+
+
+class ActionJobStatus:
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCESS = 'success'
+    ERROR = 'error'
+
+    FINISHED = (SUCCESS, ERROR)
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class ActionJob(DataclassBase):
+    id: str
+    category: str
+    action: str
+    username: str | None = None
+
+    status: str = ActionJobStatus.PENDING
+
+    progress: int = 0
+    total: int | None = None
+    progress_message: str | TranslateText | None = None
+
+    # ActionResult после успешного выполнения
+    result: Any = None
+    error: APIError | None = None
+
+    created_at: float = Field(default_factory=time.time)
+    finished_at: float | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ActionJobStatus.FINISHED
+
+
+class ActionJobStore(abc.ABC):
+    '''
+    Storage of background action jobs.
+
+    Subclass it to share jobs between workers (redis, database, etc.).
+    '''
+
+    @abc.abstractmethod
+    async def get(self, job_id: str) -> ActionJob | None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def save(self, job: ActionJob):
+        raise NotImplementedError()
+
+
+class LocalActionJobStore(ActionJobStore):
+    '''
+    In-process job storage; finished jobs are evicted first when max_jobs is reached.
+    '''
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, ActionJob] = OrderedDict()
+
+    async def get(self, job_id: str) -> ActionJob | None:
+        return self._jobs.get(job_id)
+
+    async def save(self, job: ActionJob):
+        self._jobs[job.id] = job
+
+        if len(self._jobs) <= self.max_jobs:
+            return
+
+        for job_id, stored_job in list(self._jobs.items()):
+            if stored_job.is_finished:
+                del self._jobs[job_id]
+                if len(self._jobs) <= self.max_jobs:
+                    return
+
+
+class ActionJobHandle:
+    '''
+    Available inside background action through get_current_job().
+    '''
+
+    def __init__(self, job: ActionJob, store: ActionJobStore):
+        self.job = job
+        self.store = store
+
+    async def set_progress(self, progress: int, total: int | None = None, message: str | TranslateText | None = None):
+        self.job.progress = progress
+        if total is not None:
+            self.job.total = total
+        if message is not None:
+            self.job.progress_message = message
+        await self.store.save(self.job)
+
+
+def get_current_job() -> ActionJobHandle | None:
+    '''
+    Returns handle of the background job of the running action or None
+    when the action is performed inside the request.
+    '''
+    return _current_job.get()
+
+
+class ActionJobRunner:
+    '''
+    Runs background actions as asyncio tasks of the current event loop.
+    '''
+
+    def __init__(self, store: ActionJobStore | None = None):
+        self.store = store or LocalActionJobStore()
+        self._tasks = set()
+
+    async def get_job(self, job_id: str) -> ActionJob | None:
+        return await self.store.get(job_id)
+
+    # pylint: disable=too-many-arguments
+    async def submit(self, fn, action_data, category: str, action: str, username: str | None = None) -> ActionJob:
+        job = ActionJob(id=uuid.uuid4().hex, category=category, action=action, username=username)
+        await self.store.save(job)
+
+        task = asyncio.create_task(self._run(job, fn, action_data))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: ActionJob, fn, action_data):
+        handle = ActionJobHandle(job, self.store)
+        _current_job.set(handle)
+
+        job.status = ActionJobStatus.RUNNING
+        await self.store.save(job)
+
+        try:
+            job.result = await fn(action_data)
+            job.status = ActionJobStatus.SUCCESS
+
+        except AdminAPIException as e:
+            job.error = e.get_error()
+            job.status = ActionJobStatus.ERROR
+
+        except Exception as e:
+            logger.exception(
+                'Background action %s.%s job %s error: %s', job.category, job.action, job.id, e,
+            )
+            job.error = APIError(message=str(e), code='user_action_error')
+            job.status = ActionJobStatus.ERROR
+
+        job.finished_at = time.time()
+        await self.store.save(job)
@@ -1,20 +1,20 @@
 import importlib.metadata
 import json
 from importlib import resources
-from typing import Any, Dict, List, Optional, Type
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type
 from urllib.parse import urljoin
 
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from pydantic.dataclasses import dataclass
 
 from admin_panel.auth import UserABC
-from admin_panel.docs import build_redoc_docs, build_scalar_docs
+from admin_panel.jobs import ActionJobRunner
 from admin_panel.schema.group import Group, GroupSchemaData
 from admin_panel.translations import LanguageManager, TranslateText
 from admin_panel.utils import DataclassBase
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI, Request
+
 
 @dataclass
 class AdminSchemaData(DataclassBase):
@@ -60,11 +60,17 @@ class AdminSchema:
 
     language_manager_class: Type[LanguageManager] = LanguageManager
 
+    # Исполнитель фоновых действий @admin_action(background=True)
+    action_job_runner: Any = None
+
     def __post_init__(self):
         for group in self.groups:
             if not issubclass(group.__class__, Group):
                 raise TypeError(f'Group "{group}" is not instance of Group subclass')
 
+        if self.action_job_runner is None:
+            self.action_job_runner = ActionJobRunner()
+
     def get_language_manager(self, language_slug: str | None) -> LanguageManager:
         return self.language_manager_class(language_slug)
 
@@ -85,6 +91,20 @@ class AdminSchema:
             profile=user,
         )
 
+    def setup_categories(self):
+        '''
+        Generates deferred fields of every category schema, so configuration errors fail on startup
+        '''
+        # pylint: disable=import-outside-toplevel
+        from admin_panel.schema.table.fields_schema import FieldsSchema
+
+        for group in self.groups:
+            for category in group.categories:
+                for attribute_name in ('table_schema', 'table_filters'):
+                    fields_schema = getattr(category, attribute_name, None)
+                    if isinstance(fields_schema, FieldsSchema):
+                        fields_schema.setup()
+
     def get_group(self, group_slug: str) -> Optional[Group]:
         for group in self.groups:
             if group.slug == group_slug:
@@ -92,7 +112,7 @@ class AdminSchema:
 
         return None
 
-    async def get_settings(self, request: Request) -> AdminSettingsData:
+    async def get_settings(self, request: 'Request') -> AdminSettingsData:
         language_slug = request.headers.get('Accept-Language')
         language_manager: LanguageManager = self.get_language_manager(language_slug)
 
@@ -121,7 +141,17 @@ class AdminSchema:
             include_scalar=False,
             include_docs=False,
             include_redoc=False,
-    ) -> FastAPI:
+    ) -> 'FastAPI':
+        # FastAPI и сборщики документации нужны только при создании приложения
+        # pylint: disable=import-outside-toplevel
+        from fastapi import FastAPI
+        from fastapi.middleware.cors import CORSMiddleware
+        from fastapi.staticfiles import StaticFiles
+
+        from admin_panel.docs import build_redoc_docs, build_scalar_docs
+
+        self.setup_categories()
+
         # pylint: disable=unused-variable
         language_manager = self.get_language_manager(language_slug=None)
 
@@ -159,7 +189,7 @@ class AdminSchema:
 
         return app
 
-    async def get_index_context_data(self, request: Request) -> dict:
+    async def get_index_context_data(self, request: 'Request') -> dict:
         language_manager = self.get_language_manager(language_slug=None)
         context = {'language_manager': language_manager}
 
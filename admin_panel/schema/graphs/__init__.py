@@ -1 +1 @@
-from .category_graphs import CategoryGraphs
+from .category_graphs import CategoryGraphs, chart_provider
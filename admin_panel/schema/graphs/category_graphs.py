@@ -1,11 +1,22 @@
-from typing import Any, Dict, List
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validate_call
 
+from admin_panel.cache import CacheBackend, LocalCacheBackend
+from admin_panel.downsampling import downsample_chart_data
+from admin_panel.exceptions import AdminAPIException, APIError
 from admin_panel.schema import Category
 from admin_panel.schema.category import GraphInfoSchemaData
 from admin_panel.schema.table.fields_schema import FieldsSchema
 from admin_panel.translations import LanguageManager, TranslateText
+from admin_panel.translations import TranslateText as _
+from admin_panel.utils import get_logger
+
+logger = get_logger()
 
 
 class GraphData(BaseModel):
@@ -14,16 +25,41 @@ class GraphData(BaseModel):
 
 
 class ChartData(BaseModel):
+    slug: str | None = None
     data: dict
     options: dict
     width: int | None = None
     height: int = 50
     type: str = 'line'
 
+    # Прореживание наборов данных длиннее max_points; по умолчанию берется из категории
+    downsample: str | None = Field(default=None, exclude=True)
+    max_points: int | None = Field(default=None, exclude=True)
+
 
 class GraphsDataResult(BaseModel):
     charts: List[ChartData]
 
+    # Ошибки графиков по slug; остальные графики отдаются как обычно
+    errors: Dict[str, APIError] = Field(default_factory=dict)
+
+
+@validate_call
+def chart_provider(slug: str | None = None, timeout: float | None = None):
+    '''
+    Declares async method (data: GraphData, user) -> ChartData as a separate chart of the category.
+    Charts are computed concurrently, each one with its own timeout and cache entry.
+    '''
+    def wrapper(func):
+        func.__chart__ = True
+        func.chart_info = {
+            'slug': slug or func.__name__,
+            'timeout': timeout,
+        }
+        return func
+
+    return wrapper
+
 
 class CategoryGraphs(Category):
     _type_slug: str = 'graphs'
@@ -33,6 +69,46 @@ class CategoryGraphs(Category):
 
     table_filters: FieldsSchema | None = None
 
+    # Время жизни кеша графиков в секундах; 0 - кеш выключен
+    graph_cache_ttl: float = 0
+    # Сколько секунд после ttl отдаются устаревшие данные, пока они пересчитываются в фоне
+    graph_cache_stale_ttl: float = 0
+    graph_cache_max_size: int = 1000
+    graph_cache: CacheBackend | None = None
+
+    # Метод прореживания длинных рядов DownsampleMethod; None - данные отдаются как есть
+    downsample_method: str | None = None
+    downsample_max_points: int = 1000
+
+    # Период пересчета графиков для потока обновлений (SSE) в секундах; None - поток выключен
+    live_interval: float | None = None
+
+    # Таймаут вычисления одного графика в секундах по умолчанию
+    chart_timeout: float | None = 30
+
+    _graph_refresh_tasks: Dict[str, asyncio.Task] | None = None
+    _graph_background_tasks: set | None = None
+    _graph_stream_hub: Any = None
+
+    # slug графика -> (имя метода, chart_info); собирается один раз для каждого класса
+    _chart_providers: Dict[str, tuple] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        chart_infos = {}
+        # Порядок графиков - порядок объявления методов в классе;
+        # переопределение без @chart_provider сохраняет chart_info базового метода
+        for klass in reversed(cls.__mro__):
+            for attribute_name, attribute in vars(klass).items():
+                if getattr(attribute, '__chart__', False):
+                    chart_infos[attribute_name] = attribute.chart_info
+                elif attribute_name in chart_infos and attribute is None:
+                    # None отключает унаследованный график
+                    del chart_infos[attribute_name]
+
+        cls._chart_providers = {info['slug']: (name, info) for name, info in chart_infos.items()}
+
     def generate_schema(self, user, language_manager: LanguageManager) -> GraphInfoSchemaData:
         schema = super().generate_schema(user, language_manager)
         graph = GraphInfoSchemaData(
@@ -48,3 +124,184 @@ class CategoryGraphs(Category):
 
     async def get_data(self, data: GraphData, user) -> GraphsDataResult:
         raise NotImplementedError('get_data is not implemented')
+
+    def get_chart_providers(self) -> Dict[str, Callable]:
+        return {slug: getattr(self, name) for slug, (name, _) in self._chart_providers.items()}
+
+    def get_chart_slugs(self) -> List[str]:
+        '''
+        Charts computed and cached separately through get_chart_data;
+        when empty, the whole get_data result is cached as one entry.
+        '''
+        return list(self.get_chart_providers().keys())
+
+    def get_chart_timeout(self, chart_slug: str) -> float | None:
+        _, chart_info = self._chart_providers.get(chart_slug, (None, {}))
+        if chart_info.get('timeout') is not None:
+            return chart_info['timeout']
+        return self.chart_timeout
+
+    async def get_chart_data(self, chart_slug: str, data: GraphData, user) -> ChartData:
+        if chart_slug not in self._chart_providers:
+            raise NotImplementedError(f'get_chart_data is not implemented for chart "{chart_slug}"')
+
+        attribute_name, _ = self._chart_providers[chart_slug]
+        chart = await getattr(self, attribute_name)(data, user)
+        if chart.slug is None:
+            chart.slug = chart_slug
+        return chart
+
+    async def downsample_chart(self, chart: ChartData) -> ChartData:
+        method = chart.downsample or self.downsample_method
+        if not method:
+            return chart
+
+        max_points = chart.max_points or self.downsample_max_points
+        # Прореживание больших рядов занимает процессор, поэтому выполняется вне event loop
+        chart.data = await asyncio.to_thread(downsample_chart_data, chart.data, max_points, method)
+        return chart
+
+    async def compute_chart(self, chart_slug: str, data: GraphData, user) -> ChartData:
+        return await self.downsample_chart(await self.get_chart_data(chart_slug, data, user))
+
+    async def compute_data(self, data: GraphData, user) -> GraphsDataResult:
+        result = await self.get_data(data, user)
+        result.charts = [await self.downsample_chart(chart) for chart in result.charts]
+        return result
+
+    def get_graph_stream_hub(self):
+        if self._graph_stream_hub is None:
+            # pylint: disable=import-outside-toplevel
+            from admin_panel.schema.graphs.stream import GraphStreamHub
+
+            self._graph_stream_hub = GraphStreamHub(self)
+        return self._graph_stream_hub
+
+    def get_graph_cache(self) -> CacheBackend:
+        if self.graph_cache is None:
+            self.graph_cache = LocalCacheBackend(max_size=self.graph_cache_max_size)
+        return self.graph_cache
+
+    def get_graph_cache_scope(self, user) -> str:
+        '''
+        Part of the cache key for users that see the same charts; override for shared caches by role
+        '''
+        return user.username
+
+    async def get_graph_cache_key(self, data: GraphData, user, chart_slug: str | None = None) -> str:
+        normalized = {
+            'search': (data.search or '').strip(),
+            'filters': data.filters,
+            'scope': self.get_graph_cache_scope(user),
+        }
+        digest = hashlib.blake2b(json.dumps(normalized, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+        generation = await self.get_graph_cache().get(f'graph:{self.slug}:generation') or 0
+        return f'graph:{self.slug}:{generation}:{digest}:{chart_slug or ""}'
+
+    async def invalidate_caches(self):
+        if not self.graph_cache_ttl:
+            return
+
+        cache = self.get_graph_cache()
+        generation_key = f'graph:{self.slug}:generation'
+        await cache.set(generation_key, (await cache.get(generation_key) or 0) + 1)
+
+    async def _compute_and_store(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        value = await compute()
+        # Время записи хранится рядом со значением: по нему отличаем свежие данные от устаревших
+        await self.get_graph_cache().set(
+            key, (value, time.time()), ttl=self.graph_cache_ttl + self.graph_cache_stale_ttl,
+        )
+        return value
+
+    def _schedule_refresh(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        if self._graph_refresh_tasks is None:
+            self._graph_refresh_tasks = {}
+
+        # Один пересчет на ключ, повторные запросы отдают устаревшие данные
+        if key in self._graph_refresh_tasks:
+            return
+
+        async def _refresh():
+            try:
+                await self._compute_and_store(key, compute)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.exception('Graph %s refresh error: %s', self.slug, e, extra={'cache_key': key})
+
+        task = asyncio.create_task(_refresh())
+        self._graph_refresh_tasks[key] = task
+        task.add_done_callback(lambda _: self._graph_refresh_tasks.pop(key, None))
+
+    async def _get_cached(self, key: str, compute: Callable[[], Awaitable[Any]]):
+        entry = await self.get_graph_cache().get(key)
+        if entry is None:
+            return await self._compute_and_store(key, compute)
+
+        value, created_at = entry
+        if time.time() - created_at > self.graph_cache_ttl:
+            self._schedule_refresh(key, compute)
+        return value
+
+    def _keep_in_background(self, task: asyncio.Task):
+        if self._graph_background_tasks is None:
+            self._graph_background_tasks = set()
+
+        def _done(task):
+            self._graph_background_tasks.discard(task)
+            if not task.cancelled() and task.exception():
+                logger.error('Graph %s background chart error: %s', self.slug, task.exception())
+
+        self._graph_background_tasks.add(task)
+        task.add_done_callback(_done)
+
+    async def _get_chart(self, chart_slug: str, data: GraphData, user) -> ChartData:
+        if not self.graph_cache_ttl:
+            return await self.compute_chart(chart_slug, data, user)
+
+        key = await self.get_graph_cache_key(data, user, chart_slug)
+        return await self._get_cached(key, lambda: self.compute_chart(chart_slug, data, user))
+
+    async def _get_chart_or_error(self, chart_slug: str, data: GraphData, user):
+        task = asyncio.ensure_future(self._get_chart(chart_slug, data, user))
+        try:
+            # С кешем график по таймауту досчитывается в фоне и попадает в кеш к следующему запросу
+            awaitable = asyncio.shield(task) if self.graph_cache_ttl else task
+            return await asyncio.wait_for(awaitable, self.get_chart_timeout(chart_slug)), None
+
+        except asyncio.TimeoutError:
+            if self.graph_cache_ttl:
+                self._keep_in_background(task)
+            logger.warning('Graph %s chart %s timeout', self.slug, chart_slug)
+            return None, APIError(message=_('graph_timeout'), code='graph_timeout')
+
+        except AdminAPIException as e:
+            return None, e.get_error()
+
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.exception('Graph %s chart %s error: %s', self.slug, chart_slug, e, extra={'data': data})
+            return None, APIError(message=_('graph_error'), code='graph_error')
+
+    async def get_cached_data(self, data: GraphData, user) -> GraphsDataResult:
+        '''
+        get_data with TTL cache and stale-while-revalidate refresh in a background task.
+        Separate charts are computed concurrently; failed or timed out charts are returned in errors.
+        '''
+        chart_slugs = self.get_chart_slugs()
+
+        if not chart_slugs:
+            if not self.graph_cache_ttl:
+                return await self.compute_data(data, user)
+
+            key = await self.get_graph_cache_key(data, user)
+            return await self._get_cached(key, lambda: self.compute_data(data, user))
+
+        # Отдельная запись на каждый график: медленный график не задерживает остальные
+        results = await asyncio.gather(*[self._get_chart_or_error(slug, data, user) for slug in chart_slugs])
+
+        result = GraphsDataResult(charts=[])
+        for chart_slug, (chart, error) in zip(chart_slugs, results):
+            if error is not None:
+                result.errors[chart_slug] = error
+            else:
+                result.charts.append(chart)
+        return result
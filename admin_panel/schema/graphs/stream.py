@@ -0,0 +1,169 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, Field
+
+from admin_panel.exceptions import APIError
+from admin_panel.schema.graphs.category_graphs import ChartData, GraphData, GraphsDataResult
+from admin_panel.utils import get_logger
+
+logger = get_logger()
+
+
+class GraphStreamEvent(BaseModel):
+    # snapshot - все графики целиком, patch - только изменившиеся хвосты рядов
+    type: str
+    charts: List[ChartData] = Field(default_factory=list)
+    patches: List[dict] = Field(default_factory=list)
+    errors: Dict[str, APIError] = Field(default_factory=dict)
+
+
+def get_chart_patch(previous: ChartData, current: ChartData) -> dict | None:
+    '''
+    Tail of the chart series starting from the first changed label or value;
+    None when nothing changed, {"chart": {...}} when the chart structure changed.
+    '''
+    if previous.data == current.data and previous.options == current.options:
+        return None
+
+    previous_labels = previous.data.get('labels')
+    labels = current.data.get('labels')
+    previous_datasets = previous.data.get('datasets') or []
+    datasets = current.data.get('datasets') or []
+
+    structure_changed = (
+        previous.options != current.options
+        or previous_labels is None
+        or labels is None
+        or len(previous_datasets) != len(datasets)
+        or any(
+            {k: v for k, v in old.items() if k != 'data'} != {k: v for k, v in new.items() if k != 'data'}
+            for old, new in zip(previous_datasets, datasets)
+        )
+    )
+    if structure_changed:
+        return {'slug': current.slug, 'chart': current.model_dump(mode='json')}
+
+    start = 0
+    limit = min(len(previous_labels), len(labels))
+    while start < limit and previous_labels[start] == labels[start] and all(
+            old['data'][start:start + 1] == new['data'][start:start + 1]
+            for old, new in zip(previous_datasets, datasets)
+    ):
+        start += 1
+
+    return {
+        'slug': current.slug,
+        'start': start,
+        'labels': labels[start:],
+        'datasets': [dataset['data'][start:] for dataset in datasets],
+    }
+
+
+class GraphStreamChannel:
+    '''
+    One upstream computation of category charts shared by all viewers with the same filters and scope.
+    '''
+
+    def __init__(self, hub: 'GraphStreamHub', key: str, data: GraphData, user: Any):
+        self.hub = hub
+        self.key = key
+        self.data = data
+        self.user = user
+
+        self.subscribers: set = set()
+        self.result: GraphsDataResult | None = None
+        self.task: asyncio.Task | None = None
+
+    def get_snapshot(self) -> GraphStreamEvent:
+        return GraphStreamEvent(type='snapshot', charts=self.result.charts, errors=self.result.errors)
+
+    def publish(self, queue: asyncio.Queue, event: GraphStreamEvent):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Медленный клиент пропустил изменения: вместо накопленных патчей отдаем текущее состояние
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self.get_snapshot())
+
+    def get_patch_event(self, previous: GraphsDataResult, result: GraphsDataResult) -> GraphStreamEvent | None:
+        if [chart.slug for chart in previous.charts] != [chart.slug for chart in result.charts]:
+            return GraphStreamEvent(type='snapshot', charts=result.charts, errors=result.errors)
+
+        patches = []
+        for index, (previous_chart, chart) in enumerate(zip(previous.charts, result.charts)):
+            patch = get_chart_patch(previous_chart, chart)
+            if patch is not None:
+                patches.append({'index': index, **patch})
+
+        if not patches and previous.errors.keys() == result.errors.keys():
+            return None
+        return GraphStreamEvent(type='patch', patches=patches, errors=result.errors)
+
+    async def run(self):
+        category = self.hub.category
+        while self.subscribers:
+            try:
+                result = await category.get_cached_data(self.data, self.user)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.exception('Graph %s stream error: %s', category.slug, e, extra={'data': self.data})
+                result = None
+
+            if result is not None:
+                previous, self.result = self.result, result
+                event = self.get_snapshot() if previous is None else self.get_patch_event(previous, result)
+                if event is not None:
+                    for queue in list(self.subscribers):
+                        self.publish(queue, event)
+
+            await asyncio.sleep(category.live_interval)
+
+
+class GraphStreamHub:
+    '''
+    Live chart updates for a graphs category: viewers with the same GraphData and scope
+    share one channel, so N viewers cause one computation per interval.
+    '''
+
+    queue_size: int = 100
+
+    def __init__(self, category):
+        self.category = category
+        self.channels: Dict[str, GraphStreamChannel] = {}
+
+    def get_channel_key(self, data: GraphData, user) -> str:
+        normalized = {
+            'search': (data.search or '').strip(),
+            'filters': data.filters,
+            'scope': self.category.get_graph_cache_scope(user),
+        }
+        return hashlib.blake2b(json.dumps(normalized, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, data: GraphData, user):
+        key = self.get_channel_key(data, user)
+        channel = self.channels.get(key)
+        if channel is None:
+            channel = GraphStreamChannel(self, key, data, user)
+            self.channels[key] = channel
+
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        channel.subscribers.add(queue)
+
+        if channel.result is not None:
+            channel.publish(queue, channel.get_snapshot())
+
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(channel.run())
+
+        try:
+            yield queue
+        finally:
+            channel.subscribers.discard(queue)
+            if not channel.subscribers:
+                self.channels.pop(key, None)
+                channel.task.cancel()
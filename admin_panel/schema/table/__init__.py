@@ -5,4 +5,5 @@ from .category_table import CategoryTable
 from .fields import *
 from .fields_schema import FieldsSchema
 from .table_models import (
-    AutocompleteData, AutocompleteResult, CreateResult, ListData, RetrieveResult, TableListResult, UpdateResult)
+    AutocompleteData, AutocompleteResult, BulkCreateResult, BulkUpdateResult, CreateResult, ListData, RetrieveManyData,
+    RetrieveManyResult, RetrieveResult, TableListResult, UpdateResult)
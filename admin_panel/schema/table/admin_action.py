@@ -30,6 +30,20 @@ class ActionResult(DataclassBase):
     message: ActionMessage | None = None
     persistent_message: str | TranslateText | None = None
 
+    # Идентификатор фоновой задачи для опроса прогресса
+    job_id: str | None = None
+
+
+class ActionJobResult(BaseModel):
+    id: str
+    status: str
+    progress: int
+    total: int | None = None
+    progress_message: str | None = None
+
+    result: dict | None = None
+    error: dict | None = None
+
 
 # pylint: disable=too-many-arguments
 # pylint: disable=too-many-positional-arguments
@@ -50,6 +64,9 @@ def admin_action(
 
     allow_empty_selection: bool = False,
     form_schema: Optional[FieldsSchema] = None,
+
+    # Выполнять действие в фоне; результат доступен через action-job endpoint
+    background: bool = False,
 ):
     def wrapper(func):
         func.__action__ = True
@@ -65,6 +82,7 @@ def admin_action(
 
             'allow_empty_selection': allow_empty_selection,
             'form_schema': form_schema,
+            'background': background,
         }
 
         @functools.wraps(func)
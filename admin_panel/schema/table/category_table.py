@@ -1,21 +1,24 @@
 import abc
 import asyncio
 import copy
-from typing import Awaitable, List
+from typing import TYPE_CHECKING, Any, Awaitable, List
 
-from fastapi import HTTPException, Request
 from pydantic import Field
 
 from admin_panel.auth import UserABC
 from admin_panel.exceptions import AdminAPIException, APIError
 from admin_panel.schema import Category
 from admin_panel.schema.category import TableInfoSchemaData
-from admin_panel.schema.table.admin_action import ActionData, ActionResult
+from admin_panel.schema.table.admin_action import ActionData, ActionMessage, ActionResult
 from admin_panel.schema.table.fields_schema import FieldsSchema
 from admin_panel.schema.table.table_models import AutocompleteData, AutocompleteResult, ListData, TableListResult
 from admin_panel.translations import LanguageManager, TranslateText
+from admin_panel.translations import TranslateText as _
 from admin_panel.utils import DeserializeAction
 
+if TYPE_CHECKING:
+    from fastapi import Request
+
 
 class CategoryTable(Category):
     _type_slug: str = 'table'
@@ -50,6 +53,11 @@ class CategoryTable(Category):
         fn = getattr(self, 'retrieve', None)
         return asyncio.iscoroutinefunction(fn)
 
+    @property
+    def has_retrieve_many(self):
+        fn = getattr(self, 'retrieve_many', None)
+        return self.has_retrieve and asyncio.iscoroutinefunction(fn)
+
     @property
     def has_create(self):
         fn = getattr(self, 'create', None)
@@ -60,6 +68,16 @@ class CategoryTable(Category):
         fn = getattr(self, 'update', None)
         return asyncio.iscoroutinefunction(fn)
 
+    @property
+    def has_import(self):
+        fn = getattr(self, 'bulk_create', None)
+        return self.has_create and asyncio.iscoroutinefunction(fn)
+
+    @property
+    def has_bulk_update(self):
+        fn = getattr(self, 'bulk_update', None)
+        return self.has_update and asyncio.iscoroutinefunction(fn)
+
     def generate_schema(self, user, language_manager: LanguageManager) -> dict:
         schema = super().generate_schema(user, language_manager)
 
@@ -123,7 +141,7 @@ class CategoryTable(Category):
     # pylint: disable=too-many-positional-arguments
     async def _perform_action(
             self,
-            request: Request,
+            request: 'Request',
             action: str,
             action_data: ActionData,
             language_manager: LanguageManager,
@@ -131,6 +149,9 @@ class CategoryTable(Category):
     ) -> ActionResult:
         action_fn = self._get_action_fn(action)
         if action_fn is None:
+            # pylint: disable=import-outside-toplevel
+            from fastapi import HTTPException
+
             raise HTTPException(status_code=404, detail=f'Action "{action}" is not found')
 
         try:
@@ -143,7 +164,23 @@ class CategoryTable(Category):
                 )
                 action_data.form_data = deserialized_data
 
-            result: ActionResult = await action_fn(action_data)
+            if action_fn.action_info.get('background'):
+                async def run_action(data: ActionData):
+                    try:
+                        return await action_fn(data)
+                    finally:
+                        await self.invalidate_caches()
+
+                job = await request.app.state.schema.action_job_runner.submit(
+                    run_action, action_data, category=self.slug, action=action, username=user.username,
+                )
+                return ActionResult(message=ActionMessage(_('action_started')), job_id=job.id)
+
+            try:
+                result: ActionResult = await action_fn(action_data)
+            finally:
+                # Действие могло изменить любые записи категории
+                await self.invalidate_caches()
         except AdminAPIException as e:
             raise e
         except Exception as e:
@@ -160,6 +197,19 @@ class CategoryTable(Category):
         """
         raise NotImplementedError('autocomplete is not implemented')
 
+    async def get_retrieve_etag(self, pk: Any, user: UserABC, language_manager: LanguageManager) -> str | None:
+        """
+        Cheap ETag of the record without serialization; None if not supported.
+        Must differ for responses that differ by user or language.
+        Used to answer If-None-Match with 304 before retrieve.
+        """
+        return None
+
+    async def invalidate_caches(self, pks: List[Any] | None = None):
+        """
+        Called after records are changed; pks=None invalidates all records.
+        """
+
     # pylint: disable=too-many-arguments
     @abc.abstractmethod
     async def get_list(self, list_data: ListData, user: UserABC, language_manager: LanguageManager) -> TableListResult:
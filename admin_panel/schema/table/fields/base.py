@@ -17,6 +17,10 @@ class TableField(abc.ABC, FieldSchemaData):
     label: str | TranslateText | None = None
     help_text: str | TranslateText | None = None
 
+    # Схема поля не зависит от пользователя и языка, кроме label и help_text:
+    # она генерируется один раз, а переводы подставляются на каждый запрос
+    static_schema: ClassVar[bool] = True
+
     def generate_schema(self, user, field_slug, language_manager: LanguageManager) -> FieldSchemaData:
         schema = FieldSchemaData(
             type=self._type,
@@ -30,6 +34,18 @@ class TableField(abc.ABC, FieldSchemaData):
 
         return schema
 
+    def generate_translated_schema(self, field_slug, language_manager: LanguageManager) -> dict:
+        '''
+        Language dependent part of the field schema
+        '''
+        translated = {'label': language_manager.get_text(self.label) or humanize_field_name(field_slug)}
+
+        help_text = language_manager.get_text(self.help_text)
+        if help_text is not None:
+            translated['help_text'] = help_text
+
+        return translated
+
     async def serialize(self, value, extra: dict, *args, **kwargs) -> Any:
         return value
 
@@ -15,6 +15,9 @@ NOT_FUND_EXCEPTION = '''Field slug "{field_slug}" not found inside generated fie
 Available options: {available_fields}
 '''
 
+# Ключи схемы поля, которые переводятся на каждый запрос
+TRANSLATED_SCHEMA_FIELDS = ('label', 'help_text')
+
 
 class DeserializeError(Exception):
     pass
@@ -30,8 +33,19 @@ class FieldsSchema:
     # Для передачи параметра read_only = True внутрь поля
     readonly_fields: ClassVar[List | None] = None
 
+    # Генерировать поля при первом обращении к схеме, а не при ее создании
+    deferred_setup: ClassVar[bool] = False
+
     # Generated fields
     _generated_fields: dict = None
+    _setup_args: tuple = ()
+    _setup_kwargs: dict = None
+
+    # validate_<field_slug> методы
+    _validators: dict = None
+
+    # Не зависящая от языка часть схем полей {field_slug: dict}
+    _static_schemas: dict = None
 
     def __init__(self, *args, table_schema=None, list_display=None, readonly_fields=None, fields=None, **kwargs):
         if fields:
@@ -50,13 +64,27 @@ class FieldsSchema:
         if readonly_fields:
             self.readonly_fields = readonly_fields
 
+        self._setup_args = args
+        self._setup_kwargs = kwargs
+
+        if not self.deferred_setup:
+            self.setup()
+
+    def setup(self):
+        '''
+        Generates and validates fields; runs once, on init or on first access when deferred_setup is set
+        '''
+        if self._generated_fields is not None:
+            return
+
+        args, kwargs = self._setup_args, self._setup_kwargs or {}
         generated_fields = self.generate_fields(kwargs)
 
         available_fields = list(generated_fields.keys())
         if self.fields is None:
             self.fields = available_fields
 
-        self._generated_fields = {}
+        selected_fields = {}
         for field_slug in self.fields:
             if not isinstance(field_slug, str):
                 msg = f'{type(self).__name__} field "{field_slug}" must be string'
@@ -70,9 +98,16 @@ class FieldsSchema:
                 )
                 raise AttributeError(msg)
 
-            self._generated_fields[field_slug] = generated_fields[field_slug]
+            selected_fields[field_slug] = generated_fields[field_slug]
 
-        self.validate_fields(*args, **kwargs)
+        self._generated_fields = selected_fields
+        self._static_schemas = {}
+        try:
+            self.validate_fields(*args, **kwargs)
+            self._validators = self.resolve_validators()
+        except Exception:
+            self._generated_fields = None
+            raise
 
     def validate_fields(self, *args, **kwargs):
         if not self.fields:
@@ -137,23 +172,72 @@ class FieldsSchema:
 
         return generated_fields
 
+    def resolve_validators(self) -> dict:
+        '''
+        Collects validate_<field_slug> methods once on schema init
+        '''
+        validators = {}
+        for field_slug in self.fields:
+            validate_method = getattr(self, f'validate_{field_slug}', None)
+            if not callable(validate_method):
+                continue
+
+            if not asyncio.iscoroutinefunction(validate_method):
+                msg = f'Validate method {type(self).__name__}.{field_slug} must be async'
+                raise AttributeError(msg)
+
+            validators[field_slug] = validate_method
+
+        return validators
+
+    def get_validators(self) -> dict:
+        self.setup()
+        return self._validators
+
     def get_field(self, field_slug) -> TableField | None:
         return self.get_fields().get(field_slug)
 
     def get_fields(self) -> Dict[str, TableField]:
+        if self._generated_fields is None:
+            self.setup()
         return self._generated_fields
 
     def generate_schema(self, user: UserABC, language_manager: LanguageManager) -> FieldsSchemaData:
+        self.setup()
         fields_schema = FieldsSchemaData(
             list_display=self.list_display,
         )
 
         for field_slug, field in self.get_fields().items():
-            field_schema: FieldSchemaData = field.generate_schema(user, field_slug, language_manager)
-            fields_schema.fields[field_slug] = field_schema.to_dict(keep_none=False)
+            fields_schema.fields[field_slug] = self.generate_field_schema(user, field_slug, field, language_manager)
 
         return fields_schema
 
+    def generate_field_schema(
+            self, user: UserABC, field_slug: str, field: TableField, language_manager: LanguageManager,
+    ) -> dict:
+        '''
+        Field schema dict: the static part is generated once, label and help_text are translated per request
+        '''
+        if not field.static_schema:
+            return field.generate_schema(user, field_slug, language_manager).to_dict(keep_none=False)
+
+        static_schema = self._static_schemas.get(field_slug)
+        if static_schema is None:
+            field_schema: FieldSchemaData = field.generate_schema(user, field_slug, language_manager)
+            static_schema = {
+                k: v for k, v in field_schema.to_dict(keep_none=False).items()
+                if k not in TRANSLATED_SCHEMA_FIELDS
+            }
+            self._static_schemas[field_slug] = static_schema
+
+        # Порядок ключей как у FieldSchemaData: type, label, help_text, ...
+        return {
+            'type': static_schema.get('type'),
+            **field.generate_translated_schema(field_slug, language_manager),
+            **static_schema,
+        }
+
     async def serialize(self, data: Any, extra: dict) -> dict:
         result = {}
         for field_slug, field in self.get_fields().items():
@@ -162,7 +246,7 @@ class FieldsSchema:
         return result
 
     async def deserialize(self, data: dict, action: DeserializeAction, extra) -> dict:
-        result = {}
+        deserialized = {}
         errors = {}
         for field_slug, field in self.get_fields().items():
 
@@ -173,27 +257,37 @@ class FieldsSchema:
             if action in [DeserializeAction.UPDATE, DeserializeAction.FILTERS] and field_slug not in data:
                 continue
 
-            value = data.get(field_slug)
             try:
-                deserialized_value = await field.deserialize(value, action, extra)
-
-                validate_method = getattr(self, f'validate_{field_slug}', None)
-                if callable(validate_method):
-                    if not asyncio.iscoroutinefunction(validate_method):
-                        msg = f'Validate method {type(self).__name__}.{field_slug} must be async'
-                        raise AttributeError(msg)
-                    deserialized_value = await validate_method(value)
-
-                field.set_deserialized_value(result, field_slug, deserialized_value, action, extra)
+                deserialized[field_slug] = await field.deserialize(data.get(field_slug), action, extra)
             except FieldError as e:
                 errors[field_slug] = e
 
+        # Валидаторы независимы друг от друга, поэтому выполняются параллельно
+        validators = self.get_validators()
+        validated_slugs = [field_slug for field_slug in deserialized if field_slug in validators]
+        validated_values = await asyncio.gather(
+            *(validators[field_slug](data.get(field_slug)) for field_slug in validated_slugs),
+            return_exceptions=True,
+        )
+        for field_slug, value in zip(validated_slugs, validated_values):
+            if isinstance(value, FieldError):
+                errors[field_slug] = value
+            elif isinstance(value, BaseException):
+                raise value
+            else:
+                deserialized[field_slug] = value
+
+        result = {}
+        for field_slug, value in deserialized.items():
+            if field_slug not in errors:
+                self.get_field(field_slug).set_deserialized_value(result, field_slug, value, action, extra)
+
         if errors:
             raise AdminAPIException(
                 APIError(
                     message='Validation error',
                     code='validation_error',
-                    field_errors=errors,
+                    field_errors={k: errors[k] for k in self.get_fields() if k in errors},
                 ),
                 status_code=400,
             )
@@ -3,6 +3,7 @@ from typing import Any, Dict, List
 from pydantic import BaseModel, Field
 from pydantic.dataclasses import dataclass
 
+from admin_panel.exceptions import APIError
 from admin_panel.utils import DataclassBase
 
 
@@ -44,6 +45,22 @@ class ListData(BaseModel):
 class RetrieveResult(BaseModel):
     data: dict
 
+    # Версия записи; передается обратно в update как _version
+    version: Any = None
+
+    # Отдается в заголовке ETag
+    etag: str | None = Field(default=None, exclude=True)
+
+
+class RetrieveManyData(BaseModel):
+    pks: List[str | int]
+
+
+class RetrieveManyResult(BaseModel):
+    # Сериализованные записи по str(pk) в порядке запроса
+    data: Dict[str, dict] = Field(default_factory=dict)
+    not_found: List[Any] = Field(default_factory=list)
+
 
 class CreateResult(BaseModel):
     pk: Any
@@ -51,3 +68,15 @@ class CreateResult(BaseModel):
 
 class UpdateResult(BaseModel):
     pk: Any
+
+
+@dataclass
+class BulkUpdateResult(DataclassBase):
+    pks: List[Any] = Field(default_factory=list)
+    errors: Dict[str, APIError] = Field(default_factory=dict)
+
+
+@dataclass
+class BulkCreateResult(DataclassBase):
+    created: int = 0
+    errors: Dict[int, APIError] = Field(default_factory=dict)
@@ -0,0 +1,143 @@
+import abc
+import asyncio
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List
+
+
+class SearchBackend(abc.ABC):
+    '''
+    External full-text index of category records.
+
+    Returns matching pks for the search string; the category limits the list query with pk IN (...).
+    '''
+
+    @abc.abstractmethod
+    async def search(self, index_name: str, query: str, limit: int) -> List[Any]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def index(self, index_name: str, documents: Dict[Any, str]):
+        '''
+        Adds or replaces documents {pk: text}
+        '''
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def remove(self, index_name: str, pks: List[Any]):
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def clear(self, index_name: str):
+        raise NotImplementedError()
+
+
+class SQLiteFTS5SearchBackend(SearchBackend):
+    '''
+    Local sidecar index in SQLite FTS5 (one virtual table per index).
+
+    path=":memory:" keeps the index in memory of the current process.
+    '''
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._connection = None
+        self._tables = set()
+        self._lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        return self._connection
+
+    def _get_table(self, index_name: str) -> str:
+        table = 'fts_' + re.sub(r'\W', '_', index_name)
+        if table not in self._tables:
+            connection = self._get_connection()
+            with connection:
+                # rowid документа берется из таблицы ключей, поиск по pk идет через ее индекс
+                connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS "{table}_keys" (id INTEGER PRIMARY KEY, pk TEXT NOT NULL UNIQUE)'
+                )
+                connection.execute(f'CREATE VIRTUAL TABLE IF NOT EXISTS "{table}" USING fts5(content)')
+            self._tables.add(table)
+        return table
+
+    def _delete(self, table: str, pks: list):
+        connection = self._get_connection()
+        for pk in pks:
+            row = connection.execute(f'SELECT id FROM "{table}_keys" WHERE pk = ?', (str(pk),)).fetchone()
+            if row is None:
+                continue
+            connection.execute(f'DELETE FROM "{table}" WHERE rowid = ?', row)
+            connection.execute(f'DELETE FROM "{table}_keys" WHERE id = ?', row)
+
+    @staticmethod
+    def build_match_query(query: str) -> str | None:
+        # Каждое слово как префикс: "abc"* "def"*
+        tokens = re.findall(r'\w+', query)
+        if not tokens:
+            return None
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    async def _run(self, fn):
+        def _locked():
+            with self._lock:
+                return fn()
+
+        return await asyncio.to_thread(_locked)
+
+    async def search(self, index_name: str, query: str, limit: int) -> List[Any]:
+        match_query = self.build_match_query(query)
+        if match_query is None:
+            return []
+
+        def _search():
+            table = self._get_table(index_name)
+            rows = self._get_connection().execute(
+                f'''SELECT k.pk FROM "{table}" JOIN "{table}_keys" k ON k.id = "{table}".rowid
+                WHERE "{table}" MATCH ? ORDER BY rank LIMIT ?''',
+                (match_query, limit),
+            )
+            return [row[0] for row in rows]
+
+        return await self._run(_search)
+
+    async def index(self, index_name: str, documents: Dict[Any, str]):
+        if not documents:
+            return
+
+        def _index():
+            table = self._get_table(index_name)
+            connection = self._get_connection()
+            with connection:
+                self._delete(table, list(documents.keys()))
+                for pk, text in documents.items():
+                    row_id = connection.execute(
+                        f'INSERT INTO "{table}_keys" (pk) VALUES (?)', (str(pk),),
+                    ).lastrowid
+                    connection.execute(f'INSERT INTO "{table}" (rowid, content) VALUES (?, ?)', (row_id, text))
+
+        await self._run(_index)
+
+    async def remove(self, index_name: str, pks: List[Any]):
+        if not pks:
+            return
+
+        def _remove():
+            table = self._get_table(index_name)
+            with self._get_connection():
+                self._delete(table, pks)
+
+        await self._run(_remove)
+
+    async def clear(self, index_name: str):
+        def _clear():
+            table = self._get_table(index_name)
+            connection = self._get_connection()
+            with connection:
+                connection.execute(f'DELETE FROM "{table}"')
+                connection.execute(f'DELETE FROM "{table}_keys"')
+
+        await self._run(_clear)
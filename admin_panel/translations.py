@@ -71,35 +71,61 @@ DEFAULT_PHRASES = {
         'delete': 'Удалить',
         'delete_confirmation_text': 'Вы уверены, что хотите удалить данные записи?\nДанное действие нельзя отменить.',
         'deleted_successfully': 'Записи успешно удалены.',
+        'deleted_count': 'Удалено записей: %(count)s.',
         'pk_not_found': 'Поле "%(pk_name)s" не найдено среди переданных данных.',
         'record_not_found': 'Запись по ключу %(pk_name)s=%(pk)s не найдена.',
         'db_error_create': 'Ошибка создания записи в базе данных.',
         'db_error_update': 'Ошибка обновления записи в базе данных.',
         'db_error_retrieve': 'Ошибка получения записи из базы данных.',
+        'db_error_delete': 'Ошибка удаления записей из базы данных.',
         'db_error_list': 'Ошибка получения данных таблицы из базы данных.',
+        'db_error_graph': 'Ошибка получения данных графика из базы данных.',
+        'graph_error': 'Ошибка построения графика.',
+        'graph_timeout': 'Превышено время построения графика.',
         'connection_refused_error': 'Ошибка подключения к базе данных: %(error)s',
         'search_help': 'Доступные поля для поиска: %(fields)s',
         'sqlalchemy_search_help': SQLALCHEMY_SEARCH_HELP_RU,
         'filters_exception': 'Произошла неизвестная техническая ошибка при фильтрации данных.',
         'method_not_allowed': 'Ошибка, данный метод недоступен.',
         'filter_error': 'Проишла ошибка при фильтрации: {error}',
+        'action_started': 'Действие запущено в фоновом режиме.',
+        'bulk_limit_exceeded': 'Превышено максимальное количество записей в запросе: %(limit)s.',
+        'bulk_update_bad_body': 'Тело запроса должно быть объектом вида {pk: данные записи}.',
+        'version_conflict': 'Запись была изменена другим пользователем. Обновите страницу и повторите изменения.',
+        'import_format_not_supported': 'Формат файла не поддерживается: %(content_type)s. Используйте CSV или JSONL.',
+        'import_parse_error': 'Ошибка разбора строки: %(error)s',
+        'import_columns_mismatch': 'Неверное количество колонок: ожидалось %(expected)s, получено %(got)s.',
+        'import_related_not_supported': 'Поле "%(field_slug)s" не поддерживается при импорте.',
     },
     'en': {
         'delete': 'Delete',
         'delete_confirmation_text': 'Are you sure you want to delete those records?\nThis action cannot be undone.',
         'deleted_successfully': 'The entries were successfully deleted.',
+        'deleted_count': 'Records deleted: %(count)s.',
         'pk_not_found': 'The "%(pk_name)s" field was not found in the submitted data.',
         'record_not_found': 'No record found for %(pk_name)s=%(pk)s.',
         'db_error_update': 'Error updating the record in the database.',
         'db_error_create': 'Error creating a record in the database.',
         'db_error_retrieve': 'Error retrieving the record from the database.',
+        'db_error_delete': 'Error deleting records from the database.',
         'db_error_list': 'Failed to retrieve table data from the database.',
+        'db_error_graph': 'Failed to retrieve chart data from the database.',
+        'graph_error': 'Failed to build the chart.',
+        'graph_timeout': 'The chart took too long to build.',
         'connection_refused_error': 'Database connection error: %(error)s',
         'search_help': 'Available search fields: %(fields)s',
         'sqlalchemy_search_help': sqlalchemy_search_help_EN,
         'filters_exception': 'An unknown technical error occurred while filtering data.',
         'method_not_allowed': 'Error, method not allowed. This action is not permitted.',
         'filter_error': 'An error occurred during filtering: {error}',
+        'action_started': 'The action has been started in the background.',
+        'bulk_limit_exceeded': 'The maximum number of records per request has been exceeded: %(limit)s.',
+        'bulk_update_bad_body': 'The request body must be an object {pk: record data}.',
+        'version_conflict': 'The record has been changed by another user. Reload the page and apply your changes again.',
+        'import_format_not_supported': 'File format is not supported: %(content_type)s. Use CSV or JSONL.',
+        'import_parse_error': 'Row parse error: %(error)s',
+        'import_columns_mismatch': 'Wrong number of columns: expected %(expected)s, got %(got)s.',
+        'import_related_not_supported': 'Field "%(field_slug)s" is not supported for import.',
     }
 }
 
@@ -1,10 +1,12 @@
+import functools
+import hashlib
 import logging
 import re
 
 from pydantic import TypeAdapter
 
 
-def get_logger():
+def _create_logger():
     try:
         # pylint: disable=import-outside-toplevel
         import structlog
@@ -13,6 +15,23 @@ def get_logger():
         return logging.getLogger('admin_panel')
 
 
+class LazyLogger:
+    '''
+    Creates the logger on first use, so modules do not import structlog at import time
+    '''
+
+    _logger = None
+
+    def __getattr__(self, name):
+        if self._logger is None:
+            self._logger = _create_logger()
+        return getattr(self._logger, name)
+
+
+def get_logger():
+    return LazyLogger()
+
+
 class DeserializeAction:
     CREATE = 0
     UPDATE = 1
@@ -20,9 +39,17 @@ class DeserializeAction:
     FILTERS = 3
 
 
+@functools.lru_cache(maxsize=None)
+def get_type_adapter(type_) -> TypeAdapter:
+    '''
+    TypeAdapter builds the validation and serialization schema of the type, so it is created once per type
+    '''
+    return TypeAdapter(type_)
+
+
 class DataclassBase:
     def model_dump(self, *args, **kwargs) -> dict:
-        adapter = TypeAdapter(type(self))
+        adapter = get_type_adapter(type(self))
         return adapter.dump_python(self, *args, **kwargs)
 
     def to_dict(self, keep_none=True) -> dict:
@@ -33,6 +60,15 @@ class DataclassBase:
         }
 
 
+def iter_chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def make_etag(content: bytes) -> str:
+    return f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
 def humanize_field_name(name: str) -> str:
     # Convert snake_case / kebab-case / mixed tokens to Title Case with acronyms preserved
     s = name.replace("-", "_")
@@ -66,6 +66,9 @@ LANGUAGES_PHRASES = {
         'status': 'Статус',
         'endpoint': 'Эндпоинт',
         'action_with_exception': 'Действие с ошибкой',
+        'recalculate_payments': 'Пересчитать платежи',
+        'recalculate_payments_description': 'Пересчет выполняется в фоне, прогресс отображается по мере выполнения.',
+        'recalculated_successfully': 'Платежи пересчитаны.',
         'is_throw_error': 'Выбросить ошибку?',
         'throw_error': 'Пример ошибки валидации поля.',
         'exception_example': 'Пример ошибки исключения.',
@@ -98,6 +101,9 @@ LANGUAGES_PHRASES = {
         'status': 'Status',
         'endpoint': 'Endpoint',
         'action_with_exception': 'Action with exception',
+        'recalculate_payments': 'Recalculate payments',
+        'recalculate_payments_description': 'Recalculation runs in the background, progress is shown as it goes.',
+        'recalculated_successfully': 'Payments have been recalculated.',
         'is_throw_error': 'Is throw error?',
         'throw_error': 'Example of a field validation error.',
         'exception_example': 'Exception example.',
@@ -92,8 +92,11 @@ class Merchant(BaseIDModel):
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # pylint: disable=not-callable
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False)
     terminals: Mapped[list["Terminal"]] = relationship(back_populates="merchant")
 
+    __mapper_args__ = {"version_id_col": version_id}
+
     def __repr__(self):
         return f"<Merchant(id={self.id}, title='{self.title}')>"
 
@@ -192,3 +195,16 @@ class TerminalFactory(SQLAlchemyFactoryBase):
         "random_element",
         elements=[None, 5, 10, 30, 60],
     )
+
+
+class TerminalSetting(ModelBase):
+    __tablename__ = "terminal_setting"
+
+    # Составной ключ: настройка в пределах арендатора
+    tenant: Mapped[str] = mapped_column(String(50), primary_key=True)
+    key: Mapped[str] = mapped_column(String(100), primary_key=True)
+
+    value: Mapped[str] = mapped_column(String(255), nullable=False)
+
+    def __str__(self):
+        return f'{self.tenant}:{self.key}'
@@ -7,6 +7,7 @@ from faker import Faker
 
 from admin_panel import auth, schema
 from admin_panel.exceptions import FieldError
+from admin_panel.jobs import get_current_job
 from admin_panel.schema.table.admin_action import ActionData, ActionMessage, ActionResult, admin_action
 from admin_panel.translations import LanguageManager
 from admin_panel.translations import TranslateText as _
@@ -122,6 +123,21 @@ class PaymentsAdmin(schema.CategoryTable):
         await asyncio.sleep(1)
         return ActionResult(message=ActionMessage(_('deleted_successfully')))
 
+    @admin_action(
+        title=_('recalculate_payments'),
+        description=_('recalculate_payments_description'),
+        allow_empty_selection=True,
+        background=True,
+    )
+    async def recalculate_payments(self, action_data: ActionData):
+        job = get_current_job()
+        total = 5
+        for i in range(total):
+            await asyncio.sleep(0.01)
+            if job:
+                await job.set_progress(i + 1, total)
+        return ActionResult(message=ActionMessage(_('recalculated_successfully')))
+
     @admin_action(title=_('action_with_exception'), allow_empty_selection=True)
     async def action_with_exception(self, action_data: ActionData):
         await asyncio.sleep(0.5)
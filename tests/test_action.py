@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -24,3 +26,49 @@ async def test_exception_handle(mocker):
         'message': 'Пример ошибки исключения.',
     }
     assert response.json() == response_data
+
+
+def test_background_action_progress():
+    url = app.url_path_for(
+        'table_action',
+        group='payments',
+        category='payments',
+        action='recalculate_payments',
+    )
+    with TestClient(app) as background_client:
+        response = background_client.post(url, json=ActionData().model_dump(mode='json'))
+        assert response.status_code == 200, response.content.decode()
+        job_id = response.json()['job_id']
+        assert job_id
+
+        job_url = app.url_path_for(
+            'table_action_job',
+            group='payments',
+            category='payments',
+            job_id=job_id,
+        )
+        for _ in range(100):
+            job_data = background_client.get(job_url).json()
+            if job_data['status'] == 'success':
+                break
+            time.sleep(0.01)
+
+    assert job_data == {
+        'id': job_id,
+        'status': 'success',
+        'progress': 5,
+        'total': 5,
+        'progress_message': None,
+        'result': {
+            'message': {'text': 'Платежи пересчитаны.', 'type': 'success', 'position': 'top-center'},
+            'persistent_message': None,
+            'job_id': None,
+        },
+        'error': None,
+    }
+
+
+def test_background_action_job_not_found():
+    url = app.url_path_for('table_action_job', group='payments', category='payments', job_id='unknown')
+    response = client.get(url)
+    assert response.status_code == 404, response.content.decode()
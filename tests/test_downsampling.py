@@ -0,0 +1,101 @@
+import math
+import time
+
+import pytest
+
+from admin_panel import downsampling
+from admin_panel.auth import UserABC
+from admin_panel.downsampling import DownsampleMethod, downsample_chart_data
+from admin_panel.schema.graphs.category_graphs import CategoryGraphs, ChartData, GraphData, chart_provider
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'python'])
+def numpy_mode(request, monkeypatch):
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(downsampling, 'get_numpy', lambda: None)
+    return request.param
+
+
+def make_series(size):
+    return [math.sin(i / 50) * 100 + (500 if i == size // 3 else 0) for i in range(size)]
+
+
+@pytest.mark.parametrize('method', DownsampleMethod.ALL)
+def test_downsample_shared_labels(numpy_mode, method):
+    size = 10_000
+    data = {
+        'labels': list(range(size)),
+        'datasets': [
+            {'label': 'first', 'data': make_series(size)},
+            {'label': 'second', 'data': [-v for v in make_series(size)]},
+        ],
+    }
+
+    result = downsample_chart_data(data, 500, method)
+
+    assert len(result['labels']) <= 1000
+    assert result['labels'] == sorted(result['labels'])
+    assert all(len(dataset['data']) == len(result['labels']) for dataset in result['datasets'])
+    assert [dataset['label'] for dataset in result['datasets']] == ['first', 'second']
+
+    if method == DownsampleMethod.LTTB:
+        assert {0, size - 1} <= set(result['labels'])
+
+    if method != DownsampleMethod.AVERAGE:
+        # Выброс сохраняется
+        assert size // 3 in result['labels']
+
+
+def test_downsample_points_and_gaps():
+    points = [{'x': i, 'y': i % 7} for i in range(5000)]
+    result = downsample_chart_data({'datasets': [{'data': points}]}, 100, DownsampleMethod.LTTB)
+    assert len(result['datasets'][0]['data']) == 100
+
+    # Пропуски в данных: график не прореживается
+    data = {'labels': list(range(5000)), 'datasets': [{'data': [None] + [1] * 4999}]}
+    assert downsample_chart_data(data, 100, DownsampleMethod.LTTB) is data
+
+    small = {'labels': [1, 2], 'datasets': [{'data': [1, 2]}]}
+    assert downsample_chart_data(small, 100, DownsampleMethod.LTTB) is small
+
+
+@pytest.mark.parametrize('method', DownsampleMethod.ALL)
+def test_downsample_1m_points(numpy_mode, method):
+    size = 1_000_000
+    data = {'labels': list(range(size)), 'datasets': [{'data': make_series(size)}]}
+
+    start = time.monotonic()
+    result = downsample_chart_data(data, 1000, method)
+    elapsed = time.monotonic() - start
+
+    assert len(result['labels']) <= 1000
+    # Грубая граница, чтобы заметить квадратичную сложность, а не измерять скорость
+    assert elapsed < 30
+
+
+class LargeGraphs(CategoryGraphs):
+    slug = 'large-graphs'
+
+    downsample_method = DownsampleMethod.LTTB
+    downsample_max_points = 100
+
+    @chart_provider()
+    async def large(self, data, user):
+        return ChartData(data={'labels': list(range(10_000)), 'datasets': [{'data': make_series(10_000)}]}, options={})
+
+    @chart_provider()
+    async def raw(self, data, user):
+        return ChartData(
+            data={'labels': list(range(10_000)), 'datasets': [{'data': make_series(10_000)}]},
+            options={},
+            max_points=10_000,
+        )
+
+
+@pytest.mark.asyncio
+async def test_graphs_downsampling():
+    result = await LargeGraphs().get_cached_data(GraphData(), UserABC(username='test'))
+    assert [len(chart.data['labels']) for chart in result.charts] == [100, 10_000]
+    assert 'max_points' not in result.charts[0].model_dump()
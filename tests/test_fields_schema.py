@@ -0,0 +1,87 @@
+import asyncio
+import time
+from unittest import mock
+
+import pytest
+
+from admin_panel import schema
+from admin_panel.auth import UserABC
+from admin_panel.exceptions import AdminAPIException, FieldError
+from admin_panel.translations import TranslateText as _
+from admin_panel.utils import DeserializeAction
+from example.main import CustomLanguageManager
+
+
+class UniqueFieldsSchema(schema.FieldsSchema):
+    title = schema.StringField()
+    slug = schema.StringField()
+    email = schema.StringField()
+
+    async def validate_slug(self, value):
+        await asyncio.sleep(0.1)
+        return value.lower()
+
+    async def validate_email(self, value):
+        await asyncio.sleep(0.1)
+        if '@' not in value:
+            raise FieldError('Bad email', 'bad_email')
+        return value
+
+
+@pytest.mark.asyncio
+async def test_deserialize_validators_concurrently():
+    fields_schema = UniqueFieldsSchema()
+
+    start = time.monotonic()
+    result = await fields_schema.deserialize(
+        {'title': 'Title', 'slug': 'SLUG', 'email': 'test@example.com'},
+        DeserializeAction.CREATE,
+        extra={},
+    )
+    assert time.monotonic() - start < 0.19
+
+    assert result == {'title': 'Title', 'slug': 'slug', 'email': 'test@example.com'}
+
+
+@pytest.mark.asyncio
+async def test_deserialize_validators_errors():
+    fields_schema = UniqueFieldsSchema()
+
+    with pytest.raises(AdminAPIException) as e:
+        await fields_schema.deserialize(
+            {'title': 1, 'slug': 'SLUG', 'email': 'test'},
+            DeserializeAction.CREATE,
+            extra={},
+        )
+
+    assert set(e.value.get_error().field_errors.keys()) == {'title', 'email'}
+
+
+def test_sync_validator_not_allowed():
+    class SyncValidatorSchema(schema.FieldsSchema):
+        title = schema.StringField()
+
+        def validate_title(self, value):
+            return value
+
+    with pytest.raises(AttributeError):
+        SyncValidatorSchema()
+
+
+def test_generate_schema_static_part_cached():
+    class TranslatedFieldsSchema(schema.FieldsSchema):
+        title = schema.StringField(label=_('description'), max_length=10)
+        slug = schema.StringField()
+
+    fields_schema = TranslatedFieldsSchema()
+    user = UserABC(username='test')
+
+    with mock.patch.object(schema.StringField, 'generate_schema', autospec=True,
+                           side_effect=schema.StringField.generate_schema) as generate_schema:
+        ru_schema = fields_schema.generate_schema(user, CustomLanguageManager('ru'))
+        en_schema = fields_schema.generate_schema(user, CustomLanguageManager('en'))
+
+    assert generate_schema.call_count == 2
+    assert ru_schema.fields['title'] == {**en_schema.fields['title'], 'label': ru_schema.fields['title']['label']}
+    assert ru_schema.fields['title']['label'] != en_schema.fields['title']['label']
+    assert list(en_schema.fields['title']) == ['type', 'label', 'header', 'read_only', 'required', 'max_length']
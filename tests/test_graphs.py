@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from admin_panel import schema
+from admin_panel.auth import UserABC
+from admin_panel.schema.graphs.category_graphs import ChartData, GraphData, GraphsDataResult
+from example.main import app
+
+
+class CountingGraphs(schema.CategoryGraphs):
+    slug = 'counting-graphs'
+
+    graph_cache_ttl = 60
+    graph_cache_stale_ttl = 60
+
+    def __init__(self):
+        self.calls = {}
+
+    def get_chart_slugs(self):
+        return ['fast', 'slow']
+
+    async def get_chart_data(self, chart_slug, data, user):
+        self.calls[chart_slug] = self.calls.get(chart_slug, 0) + 1
+        if chart_slug == 'slow':
+            await asyncio.sleep(0.1)
+        return ChartData(data={'value': self.calls[chart_slug], 'filters': data.filters}, options={})
+
+
+@pytest.mark.asyncio
+async def test_graph_cache_per_chart():
+    graphs = CountingGraphs()
+    user = UserABC(username='test')
+    data = GraphData(filters={'id': 1})
+
+    result = await graphs.get_cached_data(data, user)
+    assert isinstance(result, GraphsDataResult)
+    assert [c.data['value'] for c in result.charts] == [1, 1]
+
+    # Пустой поиск нормализуется и попадает в ту же запись
+    await graphs.get_cached_data(GraphData(filters={'id': 1}, search=' '), user)
+    assert graphs.calls == {'fast': 1, 'slow': 1}
+
+    await graphs.get_cached_data(GraphData(filters={'id': 2}), user)
+    await graphs.get_cached_data(data, UserABC(username='other'))
+    assert graphs.calls == {'fast': 3, 'slow': 3}
+
+    await graphs.invalidate_caches()
+    await graphs.get_cached_data(data, user)
+    assert graphs.calls == {'fast': 4, 'slow': 4}
+
+
+@pytest.mark.asyncio
+async def test_graph_cache_stale_while_revalidate():
+    graphs = CountingGraphs()
+    user = UserABC(username='test')
+    data = GraphData()
+
+    await graphs.get_cached_data(data, user)
+
+    # Данные устарели: отдаются сразу, пересчет идет в фоне
+    graphs.graph_cache_ttl = 0.01
+    await asyncio.sleep(0.02)
+
+    result = await graphs.get_cached_data(data, user)
+    assert [c.data['value'] for c in result.charts] == [1, 1]
+    await graphs.get_cached_data(data, user)
+
+    await asyncio.gather(*graphs._graph_refresh_tasks.values())
+    assert graphs.calls == {'fast': 2, 'slow': 2}
+
+    graphs.graph_cache_ttl = 60
+    result = await graphs.get_cached_data(data, user)
+    assert [c.data['value'] for c in result.charts] == [2, 2]
+
+
+class ProvidersGraphs(schema.CategoryGraphs):
+    slug = 'providers-graphs'
+
+    chart_timeout = 1
+
+    @schema.chart_provider()
+    async def first(self, data, user):
+        await asyncio.sleep(0.3)
+        return ChartData(data={'value': 1}, options={})
+
+    @schema.chart_provider(slug='second')
+    async def second_chart(self, data, user):
+        await asyncio.sleep(0.3)
+        return ChartData(data={'value': 2}, options={})
+
+    @schema.chart_provider(timeout=0.05)
+    async def slow(self, data, user):
+        await asyncio.sleep(2)
+
+    @schema.chart_provider()
+    async def broken(self, data, user):
+        raise ValueError('broken chart')
+
+
+@pytest.mark.asyncio
+async def test_graph_chart_providers_concurrently():
+    graphs = ProvidersGraphs()
+    assert graphs.get_chart_slugs() == ['first', 'second', 'slow', 'broken']
+
+    start = time.monotonic()
+    result = await graphs.get_cached_data(GraphData(), UserABC(username='test'))
+    # Последовательно заняло бы больше 0.65 секунд
+    assert time.monotonic() - start < 0.5
+
+    assert [(c.slug, c.data['value']) for c in result.charts] == [('first', 1), ('second', 2)]
+    assert {slug: e.code for slug, e in result.errors.items()} == {'slow': 'graph_timeout', 'broken': 'graph_error'}
+
+
+class OverriddenProvidersGraphs(ProvidersGraphs):
+    slug = 'overridden-providers-graphs'
+
+    broken = None
+
+    async def slow(self, data, user):
+        return ChartData(data={'value': 3}, options={})
+
+
+@pytest.mark.asyncio
+async def test_graph_chart_provider_override():
+    graphs = OverriddenProvidersGraphs()
+    # Переопределение без декоратора остается графиком с тем же slug и таймаутом
+    assert graphs.get_chart_slugs() == ['first', 'second', 'slow']
+    assert graphs.get_chart_timeout('slow') == 0.05
+    assert graphs.get_chart_timeout('first') == 1
+
+    chart = await graphs.get_chart_data('slow', GraphData(), UserABC(username='test'))
+    assert chart.data['value'] == 3
+
+
+class LiveGraphs(schema.CategoryGraphs):
+    slug = 'live-graphs'
+
+    live_interval = 0.01
+
+    def __init__(self):
+        self.calls = 0
+
+    @schema.chart_provider()
+    async def live(self, data, user):
+        self.calls += 1
+        # Каждый пересчет добавляет новую точку и обновляет последнюю
+        dataset = {'label': 'a', 'data': [1] * self.calls + [0, self.calls]}
+        return ChartData(data={'labels': list(range(self.calls + 2)), 'datasets': [dataset]}, options={})
+
+
+@pytest.mark.asyncio
+async def test_graph_stream_shared_channel():
+    graphs = LiveGraphs()
+    hub = graphs.get_graph_stream_hub()
+    user = UserABC(username='test')
+
+    async with hub.subscribe(GraphData(), user) as first, hub.subscribe(GraphData(), user) as second:
+        assert len(hub.channels) == 1
+
+        snapshot = await asyncio.wait_for(first.get(), 1)
+        assert snapshot.type == 'snapshot'
+        assert snapshot.charts[0].data['labels'] == [0, 1, 2]
+
+        patch = await asyncio.wait_for(first.get(), 1)
+        assert patch.type == 'patch'
+        assert patch.patches == [{'index': 0, 'slug': 'live', 'start': 1, 'labels': [1, 2, 3], 'datasets': [[1, 0, 2]]}]
+
+        assert (await asyncio.wait_for(second.get(), 1)).type == 'snapshot'
+        assert (await asyncio.wait_for(second.get(), 1)) is patch
+
+        # Два подписчика - один пересчет за интервал
+        calls = graphs.calls
+        await asyncio.sleep(0.1)
+        assert graphs.calls - calls <= 11
+
+    assert not hub.channels
+
+
+def test_graph_stream_disabled():
+    with TestClient(app) as test_client:
+        response = test_client.get('/admin/graph/statistics/graphs-example/stream/')
+        assert response.status_code == 500
+        assert response.json()['code'] == 'method_not_allowed'
@@ -13,6 +13,7 @@ category_schema_data = {
         'actions': {
             'action_with_exception': {
                 'allow_empty_selection': True,
+                'background': False,
                 'base_color': None,
                 'confirmation_text': None,
                 'description': None,
@@ -23,6 +24,7 @@ category_schema_data = {
             },
             'create_payment': {
                 'allow_empty_selection': True,
+                'background': False,
                 'base_color': None,
                 'confirmation_text': None,
                 'description': 'Создать платеж и отправить его на обработку в платежную '
@@ -53,8 +55,20 @@ category_schema_data = {
                 'title': 'Создать платеж',
                 'variant': None,
             },
+            'recalculate_payments': {
+                'allow_empty_selection': True,
+                'background': True,
+                'base_color': None,
+                'confirmation_text': None,
+                'description': 'Пересчет выполняется в фоне, прогресс отображается по мере выполнения.',
+                'form_schema': None,
+                'icon': None,
+                'title': 'Пересчитать платежи',
+                'variant': None,
+            },
             'delete': {
                 'allow_empty_selection': False,
+                'background': False,
                 'base_color': 'red-lighten-2',
                 'confirmation_text': 'Вы уверены, что хотите удалить данные записи?\n'
                 'Данное действие нельзя отменить.',
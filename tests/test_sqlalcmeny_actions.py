@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import select
+
+from admin_panel import sqlalchemy
+from admin_panel.schema.table.admin_action import ActionData
+from example.sections.models import CurrencyFactory, MerchantFactory, Terminal, TerminalFactory
+
+
+def get_category(sqlite_sessionmaker):
+    return sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        search_fields=['title'],
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id'],
+        ),
+        table_filters=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['title'],
+        ),
+    )
+
+
+async def create_terminals(titles):
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    return [await TerminalFactory(title=title, merchant=merchant, currency=currency) for title in titles]
+
+
+@pytest.mark.asyncio
+async def test_iter_action_pks_send_to_all(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    terminals = await create_terminals(['Match 1', 'Match 2', 'Other', 'Match 3', 'Match 4', 'Match 5'])
+    expected = [t.id for t in terminals if t.title.startswith('Match')]
+
+    action_data = ActionData(send_to_all=True, filters={'title': 'Match%'})
+    async with sqlite_sessionmaker() as session:
+        batches = [batch async for batch in category.iter_action_pks(session, action_data, batch_size=2)]
+
+    assert batches == [expected[0:2], expected[2:4], expected[4:]]
+
+
+@pytest.mark.asyncio
+async def test_iter_action_pks_search(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    terminals = await create_terminals(['Match 1', 'Other'])
+
+    action_data = ActionData(send_to_all=True, search='Other')
+    async with sqlite_sessionmaker() as session:
+        batches = [batch async for batch in category.iter_action_pks(session, action_data)]
+
+    assert batches == [[terminals[1].id]]
+
+
+@pytest.mark.asyncio
+async def test_iter_action_records_selected(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    terminals = await create_terminals(['First', 'Second', 'Third'])
+
+    action_data = ActionData(pks=[terminals[0].id, str(terminals[2].id)])
+    async with sqlite_sessionmaker() as session:
+        async for records in category.iter_action_records(session, action_data, batch_size=1):
+            for record in records:
+                record.title = f'{record.title} updated'
+        await session.commit()
+
+        titles = (await session.execute(select(Terminal.title).order_by(Terminal.id))).scalars().all()
+
+    assert titles == ['First updated', 'Second', 'Third updated']
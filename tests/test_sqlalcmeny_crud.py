@@ -1,12 +1,20 @@
 from unittest import mock
 
 import pytest
-from sqlalchemy import select
+from fastapi.testclient import TestClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
 from admin_panel import auth, schema, sqlalchemy
-from example.main import CustomLanguageManager
-from example.sections.models import Currency, CurrencyFactory, MerchantFactory, Terminal, TerminalFactory
+from admin_panel.exceptions import AdminAPIException
+from admin_panel.importers import ImportFormat, iter_import_rows
+from admin_panel.schema.table.admin_action import ActionData
+from admin_panel.search import SQLiteFTS5SearchBackend
+from example.main import CustomLanguageManager, app
+from example.sections.models import (
+    Currency, CurrencyFactory, Merchant, MerchantFactory, Terminal, TerminalFactory, TerminalSetting)
+from example.sqlite import ASYNC_ENGINE
 from tests.test_sqlalcmeny_schema import FIELDS
 
 
@@ -273,3 +281,620 @@ async def test_autocomplete(sqlite_sessionmaker):
         language_manager=language_manager,
     )
     assert autocomplete_result == schema.AutocompleteResult()
+
+
+@pytest.mark.asyncio
+async def test_delete(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    category.delete_batch_size = 2
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminals = [await TerminalFactory(merchant=merchant, currency=currency) for _ in range(5)]
+
+    action_data = ActionData(pks=[t.id for t in terminals[:3]])
+    result = await category.delete(action_data)
+    assert result.message.text.translation_kwargs == {'count': 3}
+
+    async with sqlite_sessionmaker() as session:
+        left = (await session.execute(select(Terminal.id).order_by(Terminal.id))).scalars().all()
+
+    assert left == [terminals[3].id, terminals[4].id]
+
+
+@pytest.mark.asyncio
+async def test_delete_send_to_all(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id'],
+        ),
+        table_filters=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['title'],
+        ),
+    )
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    await TerminalFactory(title='Remove first', merchant=merchant, currency=currency)
+    await TerminalFactory(title='Remove second', merchant=merchant, currency=currency)
+    terminal_keep = await TerminalFactory(title='Keep', merchant=merchant, currency=currency)
+
+    action_data = ActionData(send_to_all=True, filters={'title': 'Remove%'})
+    result = await category.delete(action_data)
+    assert result.message.text.translation_kwargs == {'count': 2}
+
+    async with sqlite_sessionmaker() as session:
+        left = (await session.execute(select(Terminal.id))).scalars().all()
+
+    assert left == [terminal_keep.id]
+
+
+@pytest.mark.asyncio
+async def test_delete_send_to_all_queryset_scope(sqlite_sessionmaker):
+    merchant = await MerchantFactory(title='Visible')
+    hidden_merchant = await MerchantFactory(title='Hidden')
+    currency = await CurrencyFactory()
+    hidden = await TerminalFactory(title='Remove', merchant=hidden_merchant, currency=currency)
+
+    class WhereScopedAdmin(sqlalchemy.SQLAlchemyAdmin):
+        def get_queryset(self):
+            return super().get_queryset().where(Terminal.merchant_id == merchant.id)
+
+    class JoinScopedAdmin(sqlalchemy.SQLAlchemyAdmin):
+        def get_queryset(self):
+            return super().get_queryset().join(Terminal.merchant).where(Merchant.title == 'Visible')
+
+    for admin_class in (WhereScopedAdmin, JoinScopedAdmin):
+        await TerminalFactory(title='Remove', merchant=merchant, currency=currency)
+        category = admin_class(
+            model=Terminal,
+            db_async_session=sqlite_sessionmaker,
+            table_schema=sqlalchemy.SQLAlchemyFieldsSchema(model=Terminal, fields=['id']),
+        )
+        await category.delete(ActionData(send_to_all=True))
+        await category.delete(ActionData(pks=[hidden.id]))
+
+        async with sqlite_sessionmaker() as session:
+            left = (await session.execute(select(Terminal.id))).scalars().all()
+        assert left == [hidden.id]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminals = [
+        await TerminalFactory(description='old', merchant=merchant, currency=currency)
+        for _ in range(3)
+    ]
+
+    update_data = {
+        str(terminals[0].id): {'description': 'first'},
+        str(terminals[1].id): {'unknown_field': 'value'},
+        str(terminals[2].id): {'description': 'third'},
+        '999999': {'description': 'missing'},
+    }
+    result = await category.bulk_update(update_data, user=user, language_manager=language_manager)
+
+    assert result.pks == [str(terminals[0].id), str(terminals[2].id)]
+    assert set(result.errors.keys()) == {str(terminals[1].id), '999999'}
+    assert result.errors['999999'].code == 'record_not_found'
+
+    async with sqlite_sessionmaker() as session:
+        stmt = select(Terminal.description).order_by(Terminal.id)
+        descriptions = (await session.execute(stmt)).scalars().all()
+
+    assert descriptions == ['first', 'old', 'third']
+
+
+def test_bulk_update_bad_body():
+    with TestClient(app) as test_client:
+        url = app.url_path_for('table_bulk_update', group='merchants', category='terminal')
+        for body in ([{'description': 'x'}], {'1': ['x']}, 'text'):
+            response = test_client.patch(url, json=body)
+            assert response.status_code == 400, response.content.decode()
+            assert response.json()['code'] == 'bulk_update_bad_body'
+
+
+async def iter_chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_csv(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    category.import_batch_size = 2
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+
+    content = (
+        'title,description,merchant_id,currency_id,is_h2h\n'
+        f'First,"multi\nline, description",{merchant.id},{currency.id},true\n'
+        f'Second,second,{merchant.id},{currency.id},false\n'
+        f'Bad merchant,bad,abc,{currency.id},true\n'
+        f',no title,{merchant.id},{currency.id},true\n'
+        'Broken,row\n'
+        f'Third,third,{merchant.id},{currency.id},1\n'
+    ).encode()
+
+    rows = iter_import_rows(iter_chunks(content, 7), ImportFormat.CSV)
+    result = await category.bulk_create(rows, user, language_manager, coerce_strings=True)
+
+    assert result.created == 3
+    assert set(result.errors.keys()) == {3, 4, 5}
+    assert result.errors[5].code == 'import_parse_error'
+
+    async with sqlite_sessionmaker() as session:
+        stmt = select(Terminal).order_by(Terminal.id)
+        terminals = (await session.execute(stmt)).scalars().all()
+
+    assert [(t.title, t.description, t.is_h2h) for t in terminals] == [
+        ('First', 'multi\nline, description', True),
+        ('Second', 'second', False),
+        ('Third', 'third', True),
+    ]
+    assert all(t.secret_key for t in terminals)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_jsonl(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+
+    content = (
+        f'{{"title": "First", "description": "d", "merchant_id": {merchant.id}, "currency_id": {currency.id}}}\n'
+        '{"title": \n'
+        f'{{"title": "Second", "description": "d", "merchant_id": {{"key": {merchant.id}}}, '
+        f'"currency_id": {currency.id}}}\n'
+    ).encode()
+
+    rows = iter_import_rows(iter_chunks(content, 1024), ImportFormat.JSONL)
+    result = await category.bulk_create(rows, user, language_manager)
+
+    assert result.created == 2
+    assert list(result.errors.keys()) == [2]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_jsonl_unicode_line_separator(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+
+    content = (
+        f'{{"title": "First", "description": "a\u2028b\x85c", "merchant_id": {merchant.id}, '
+        f'"currency_id": {currency.id}}}\r\n'
+    ).encode()
+
+    rows = iter_import_rows(iter_chunks(content, 5), ImportFormat.JSONL)
+    result = await category.bulk_create(rows, user, language_manager)
+
+    assert result.created == 1
+    assert not result.errors
+
+    async with sqlite_sessionmaker() as session:
+        terminal = (await session.execute(select(Terminal))).scalar_one()
+    assert terminal.description == 'a\u2028b\x85c'
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_integrity_error_rows(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=TerminalSetting,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=TerminalSetting,
+            tenant=schema.StringField(),
+            key=schema.StringField(),
+        ),
+    )
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    # Строки 2 и 4 дублируют ключ строки 1: остальные строки пачки вставляются
+    content = ''.join(
+        f'{{"tenant": "acme", "key": "{key}", "value": "v"}}\n'
+        for key in ['theme', 'theme', 'lang', 'theme', 'tz']
+    ).encode()
+
+    rows = iter_import_rows(iter_chunks(content, 1024), ImportFormat.JSONL)
+    result = await category.bulk_create(rows, user, language_manager)
+
+    assert result.created == 3
+    assert sorted(result.errors.keys()) == [2, 4]
+    assert result.errors[2].code == 'db_integrity_error'
+
+    async with sqlite_sessionmaker() as session:
+        keys = (await session.execute(select(TerminalSetting.key))).scalars().all()
+    assert sorted(keys) == ['lang', 'theme', 'tz']
+
+
+@pytest.mark.parametrize('refresh_on_create, expire_on_commit, expected', [
+    # pk берется из identity, истекшие после commit колонки не загружаются
+    (False, True, ['SELECT', 'SELECT', 'INSERT']),
+    # server_default колонки пришли через RETURNING
+    (True, False, ['SELECT', 'SELECT', 'INSERT']),
+    # после commit они истекли и загружаются refresh
+    (True, True, ['SELECT', 'SELECT', 'INSERT', 'SELECT']),
+])
+@pytest.mark.asyncio
+async def test_create_refresh_server_defaults(sqlite_sessionmaker, refresh_on_create, expire_on_commit, expected):
+    category = get_category(async_sessionmaker(ASYNC_ENGINE, expire_on_commit=expire_on_commit, class_=AsyncSession))
+    category.table_schema.refresh_on_create = refresh_on_create
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(ASYNC_ENGINE.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        async with category.db_async_session() as session:
+            record = await category.table_schema.create(
+                user,
+                {
+                    'merchant_id': merchant.id,
+                    'currency_id': currency.id,
+                    'description': 'test',
+                    'title': 'test',
+                },
+                session,
+            )
+    finally:
+        event.remove(ASYNC_ENGINE.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert category.get_record_pk(record) == 1
+    assert [s.split()[0] for s in statements if s.split()[0] != 'PRAGMA'] == expected
+    if refresh_on_create:
+        assert record.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_update_scalar_fields_single_statement(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    terminal = await TerminalFactory(merchant=await MerchantFactory(), currency=await CurrencyFactory())
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(ASYNC_ENGINE.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        update_result = await category.update(
+            pk=str(terminal.id),
+            data={'title': 'new title', 'is_h2h': False},
+            user=user,
+            language_manager=language_manager,
+        )
+    finally:
+        event.remove(ASYNC_ENGINE.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+    assert update_result == schema.UpdateResult(pk=terminal.id)
+    statements = [s for s in statements if not s.startswith('PRAGMA')]
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE terminal SET')
+
+    async with sqlite_sessionmaker() as session:
+        record = await session.get(Terminal, terminal.id)
+        assert (record.title, record.is_h2h) == ('new title', False)
+
+    with pytest.raises(AdminAPIException) as e:
+        await category.update(pk=999, data={'title': 'x'}, user=user, language_manager=language_manager)
+    assert e.value.get_error().code == 'record_not_found'
+
+
+@pytest.mark.asyncio
+async def test_update_schema_hook(sqlite_sessionmaker):
+    calls = []
+
+    class AuditFieldsSchema(sqlalchemy.SQLAlchemyFieldsSchema):
+        async def update(self, record, user, data, session):
+            calls.append((record.id, data))
+            return await super().update(record, user, data, session)
+
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=AuditFieldsSchema(model=Terminal, fields=FIELDS),
+    )
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    terminal = await TerminalFactory(merchant=await MerchantFactory(), currency=await CurrencyFactory())
+
+    assert not category.can_fast_update({'title': 'new title'})
+
+    await category.update(pk=terminal.id, data={'title': 'new title'}, user=user, language_manager=language_manager)
+    assert calls == [(terminal.id, {'title': 'new title'})]
+
+    # update() коммитит каждую запись сам, одной транзакции для bulk_update не получится
+    assert not category.has_bulk_update
+    with pytest.raises(AdminAPIException):
+        await category.bulk_update(
+            data={str(terminal.id): {'title': 'bulk title'}}, user=user, language_manager=language_manager,
+        )
+
+    async with sqlite_sessionmaker() as session:
+        record = await session.get(Terminal, terminal.id)
+        assert record.title == 'new title'
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_single_transaction(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminals = [await TerminalFactory(title='old', merchant=merchant, currency=currency) for _ in range(2)]
+
+    # Вторая строка падает в БД: первая тоже не должна сохраниться
+    with pytest.raises(AdminAPIException) as e:
+        await category.bulk_update(
+            data={
+                str(terminals[0].id): {'title': 'first'},
+                str(terminals[1].id): {'title': 'second', 'currency_id': 999999},
+            },
+            user=user,
+            language_manager=language_manager,
+        )
+    assert e.value.get_error().code == 'db_integrity_error'
+
+    async with sqlite_sessionmaker() as session:
+        titles = (await session.execute(select(Terminal.title).order_by(Terminal.id))).scalars().all()
+    assert titles == ['old', 'old']
+
+
+@pytest.mark.asyncio
+async def test_update_version_conflict(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Merchant,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Merchant,
+            fields=['id', 'title', 'description'],
+        ),
+    )
+    assert category.version_field == 'version_id'
+
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+
+    retrieve_result = await category.retrieve(merchant.id, user, language_manager)
+    assert retrieve_result.version == 1
+
+    await category.update(merchant.id, {'title': 'first', '_version': 1}, user, language_manager)
+
+    with pytest.raises(AdminAPIException) as e:
+        await category.update(merchant.id, {'title': 'second', '_version': 1}, user, language_manager)
+    assert e.value.status_code == 409
+    assert e.value.get_error().code == 'version_conflict'
+
+    retrieve_result = await category.retrieve(merchant.id, user, language_manager)
+    assert retrieve_result.version == 2
+    assert retrieve_result.data['title'] == 'first'
+
+
+@pytest.mark.asyncio
+async def test_update_version_field_token(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    category.version_field = 'registered_delay'
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    terminal = await TerminalFactory(
+        registered_delay=10,
+        merchant=await MerchantFactory(),
+        currency=await CurrencyFactory(),
+    )
+
+    with pytest.raises(AdminAPIException) as e:
+        await category.update(terminal.id, {'title': 'new', '_version': '11'}, user, language_manager)
+    assert e.value.get_error().code == 'version_conflict'
+
+    await category.update(terminal.id, {'title': 'new', '_version': '10'}, user, language_manager)
+
+    with pytest.raises(AdminAPIException) as e:
+        await category.update(999, {'title': 'new', '_version': '10'}, user, language_manager)
+    assert e.value.get_error().code == 'record_not_found'
+
+
+@pytest.mark.asyncio
+async def test_update_version_field_checked_in_database(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    category.version_field = 'registered_delay'
+    category.fast_update_enabled = False
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    terminal = await TerminalFactory(
+        registered_delay=10,
+        title='old',
+        merchant=await MerchantFactory(),
+        currency=await CurrencyFactory(),
+    )
+
+    # Загруженная запись уже устарела: версию проверяет UPDATE в базе
+    with mock.patch.object(category, 'check_version'):
+        with pytest.raises(AdminAPIException) as e:
+            await category.update(terminal.id, {'title': 'new', '_version': '11'}, user, language_manager)
+    assert e.value.get_error().code == 'version_conflict'
+
+    await category.update(terminal.id, {'title': 'new', '_version': '10'}, user, language_manager)
+
+    async with sqlite_sessionmaker() as session:
+        assert (await session.get(Terminal, terminal.id)).title == 'new'
+
+
+@pytest.mark.asyncio
+async def test_retrieve_cache_invalidation(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    category.retrieve_cache_ttl = 60
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    terminal = await TerminalFactory(
+        title='cached',
+        merchant=await MerchantFactory(),
+        currency=await CurrencyFactory(),
+    )
+
+    assert (await category.retrieve(terminal.id, user, language_manager)).data['title'] == 'cached'
+
+    # Изменение в обход админки не видно до истечения кеша
+    async with sqlite_sessionmaker() as session:
+        record = await session.get(Terminal, terminal.id)
+        record.title = 'changed outside'
+        await session.commit()
+    assert (await category.retrieve(str(terminal.id), user, language_manager)).data['title'] == 'cached'
+
+    await category.update(terminal.id, {'description': 'new'}, user, language_manager)
+    result = await category.retrieve(terminal.id, user, language_manager)
+    assert (result.data['title'], result.data['description']) == ('changed outside', 'new')
+
+
+def test_retrieve_etag():
+    with TestClient(app) as test_client:
+        url = app.url_path_for('table_retrieve', group='merchants', category='merchant', pk='1')
+        response = test_client.post(url)
+        assert response.status_code == 200, response.content.decode()
+        etag = response.headers['ETag']
+        assert response.json()['version'] == 1
+
+        response = test_client.post(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.headers['Vary'].startswith('Accept-Language, Authorization')
+
+        # Другой язык - другой вариант ответа
+        response = test_client.post(url, headers={'If-None-Match': etag, 'Accept-Language': 'en'})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+        # Некорректный pk - обычная ошибка, а не 500
+        bad_url = app.url_path_for('table_retrieve', group='merchants', category='merchant', pk='abc')
+        assert test_client.post(bad_url, headers={'If-None-Match': etag}).status_code == 400
+
+        update_url = app.url_path_for('table_update', group='merchants', category='merchant', pk='1')
+        response = test_client.patch(update_url, json={'title': 'new title', '_version': 1})
+        assert response.status_code == 200, response.content.decode()
+
+        response = test_client.post(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+
+        # ETag по содержимому для моделей без версии
+        url = app.url_path_for('table_retrieve', group='merchants', category='terminal', pk='1')
+        etag = test_client.post(url).headers['ETag']
+        assert test_client.post(url, headers={'If-None-Match': etag}).status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_retrieve_many(sqlite_sessionmaker):
+    category = get_category(sqlite_sessionmaker)
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminals = [await TerminalFactory(merchant=merchant, currency=currency) for _ in range(3)]
+
+    result = await category.retrieve_many(
+        [terminals[2].id, str(terminals[0].id), 999, 'bad'],
+        user,
+        language_manager,
+    )
+
+    assert list(result.data.keys()) == [str(terminals[2].id), str(terminals[0].id)]
+    assert result.data[str(terminals[0].id)]['title'] == terminals[0].title
+    assert result.data[str(terminals[2].id)]['merchant_id'] == {'key': merchant.id, 'title': str(merchant)}
+    assert result.not_found == [999, 'bad']
+
+    with TestClient(app) as test_client:
+        url = app.url_path_for('table_retrieve_many', group='merchants', category='terminal')
+        response = test_client.post(url, json={'pks': [1, 2]})
+        assert response.status_code == 200, response.content.decode()
+        assert list(response.json()['data'].keys()) == ['1', '2']
+
+        # Непримитивные pk отклоняются валидацией запроса
+        for pks in ([[1, 2]], [{}]):
+            assert test_client.post(url, json={'pks': pks}).status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_composite_pk(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=TerminalSetting,
+        db_async_session=sqlite_sessionmaker,
+        # Натуральный ключ задается при создании
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=TerminalSetting,
+            tenant=schema.StringField(),
+            key=schema.StringField(),
+        ),
+        search_fields=['value'],
+        search_backend=SQLiteFTS5SearchBackend(),
+    )
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    assert category.pk_name == '_pk'
+    with pytest.raises(ValueError):
+        category.parse_pk('acme')
+    with pytest.raises(ValueError):
+        category.parse_pk('acme:theme:dark')
+
+    # Разделитель и "%" внутри значений кодируются
+    for value in [('acme:eu', 'theme'), ('50%', 'a:b%3A'), ('2024-01-01 10:00:00', '')]:
+        encoded = category.pk_codec.encode(value)
+        assert encoded.count(':') == 1
+        assert category.parse_pk(encoded) == value
+
+    class TenantAdmin(sqlalchemy.SQLAlchemyAdmin):
+        pk_name = 'tenant'
+
+    with pytest.raises(AttributeError):
+        TenantAdmin(model=TerminalSetting, db_async_session=sqlite_sessionmaker)
+
+    created = await category.create({'tenant': 'acme', 'key': 'theme', 'value': 'dark'}, user, language_manager)
+    assert created.pk == 'acme:theme'
+    await category.create({'tenant': 'acme', 'key': 'lang', 'value': 'ru'}, user, language_manager)
+    await category.create({'tenant': 'other', 'key': 'theme', 'value': 'light'}, user, language_manager)
+
+    result = await category.get_list(schema.ListData(search='dark'), user, language_manager)
+    assert [line['_pk'] for line in result.data] == ['acme:theme']
+
+    retrieved = await category.retrieve('other:theme', user, language_manager)
+    assert retrieved.data == {'tenant': 'other', 'key': 'theme', 'value': 'light', '_pk': 'other:theme'}
+
+    created = await category.create({'tenant': 'acme:eu', 'key': 'theme', 'value': 'blue'}, user, language_manager)
+    assert created.pk == 'acme%3Aeu:theme'
+    retrieved = await category.retrieve(created.pk, user, language_manager)
+    assert retrieved.data['value'] == 'blue'
+
+    updated = await category.update('acme:lang', {'value': 'en'}, user, language_manager)
+    assert updated.pk == 'acme:lang'
+
+    many = await category.retrieve_many(['acme:lang', 'acme:missing'], user, language_manager)
+    assert many.data['acme:lang']['value'] == 'en'
+    assert many.not_found == ['acme:missing']
+
+    await category.delete(ActionData(pks=['acme:theme', 'acme:lang']))
+    async with sqlite_sessionmaker() as session:
+        left = (await session.execute(select(TerminalSetting.tenant, TerminalSetting.key))).all()
+    assert sorted(left) == [('acme:eu', 'theme'), ('other', 'theme')]
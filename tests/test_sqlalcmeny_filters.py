@@ -1,8 +1,13 @@
 from datetime import datetime
+from unittest import mock
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from admin_panel import auth, schema, sqlalchemy
+from admin_panel.exceptions import AdminAPIException
+from admin_panel.schema.table.admin_action import ActionData
+from admin_panel.search import SQLiteFTS5SearchBackend
 from example.main import CustomLanguageManager
 from example.sections.models import Currency, CurrencyFactory, MerchantFactory, Terminal, TerminalFactory
 
@@ -227,3 +232,292 @@ async def test_ordering(sqlite_sessionmaker):
     assert list_result == schema.TableListResult(
         data=[{'id': terminal_2.id}, {'id': terminal_1.id, }], total_count=2
     ), 'сортировка по убыванию'
+
+
+@pytest.mark.asyncio
+async def test_list_search(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        search_fields=['id', 'title', 'secret_key'],
+        search_strategies={'secret_key': sqlalchemy.PrefixSearch()},
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id'],
+        ),
+    )
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminal_1 = await TerminalFactory(title='Test terminal', secret_key='abc_1', merchant=merchant, currency=currency)
+    terminal_2 = await TerminalFactory(title='Test', secret_key='abcd', merchant=merchant, currency=currency)
+
+    stmt = category.apply_search(category.get_queryset(), schema.ListData(search='Test%'))
+    assert 'CAST' not in str(stmt.compile())
+
+    async def search(value):
+        result = await category.get_list(schema.ListData(search=value), user, language_manager)
+        return sorted(line['id'] for line in result.data)
+
+    assert await search('Test%') == [terminal_1.id, terminal_2.id]
+    assert await search('"test"') == [], 'кавычки - точное совпадение'
+    assert await search('"Test"') == [terminal_2.id]
+    assert await search(str(terminal_2.id)) == [terminal_2.id]
+    # _ экранируется в префиксном поиске
+    assert await search('abc_') == [terminal_1.id]
+    # Число вне диапазона integer колонки не ломает запрос
+    assert await search('1' * 30) == []
+
+
+def get_filters_category(sqlite_sessionmaker):
+    return sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id'],
+        ),
+        table_filters=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id', 'title', 'is_h2h', 'registered_delay', 'created_at'],
+            created_at=schema.DateTimeField(range=True),
+        ),
+    )
+
+
+@pytest.mark.parametrize('filters', [
+    {'id': 1},
+    {'title': 'Test terminal'},
+    {'title': 'Test%'},
+    {'is_h2h': True},
+    {'created_at': {'from': '2024-01-01T00:00:00', 'to': '2024-02-01T00:00:00'}},
+    {'id__in': ['1', '2']},
+    {'id__range': {'from': '1', 'to': 5}},
+    {'title__prefix': 'Test_'},
+    {'title__contains': 'term'},
+    {'registered_delay__isnull': True},
+    {'registered_delay__eq': '10'},
+])
+@pytest.mark.asyncio
+async def test_filters_without_cast(sqlite_sessionmaker, filters):
+    category = get_filters_category(sqlite_sessionmaker)
+
+    stmt = await category.apply_filters(category.get_queryset(), schema.ListData(filters=filters))
+    sql = str(stmt.compile())
+    assert 'CAST' not in sql
+    assert 'WHERE' in sql
+
+
+@pytest.mark.asyncio
+async def test_filters_operators(sqlite_sessionmaker):
+    category = get_filters_category(sqlite_sessionmaker)
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminal_1 = await TerminalFactory(
+        title='Test_terminal', registered_delay=None, merchant=merchant, currency=currency,
+    )
+    terminal_2 = await TerminalFactory(
+        title='Test terminal', registered_delay=10, merchant=merchant, currency=currency,
+    )
+
+    async def filter_ids(filters):
+        result = await category.get_list(schema.ListData(filters=filters), user, language_manager)
+        return sorted(line['id'] for line in result.data)
+
+    assert await filter_ids({'title__prefix': 'Test_'}) == [terminal_1.id]
+    assert await filter_ids({'title__contains': 'terminal'}) == [terminal_1.id, terminal_2.id]
+    assert await filter_ids({'registered_delay__isnull': True}) == [terminal_1.id]
+    assert await filter_ids({'registered_delay__isnull': False}) == [terminal_2.id]
+    assert await filter_ids({'id__in': [str(terminal_2.id)]}) == [terminal_2.id]
+    assert await filter_ids({'registered_delay__range': {'from': 5}}) == [terminal_2.id]
+
+    # Фильтр без оператора - LIKE, как и раньше
+    assert await filter_ids({'title': 'test terminal'}) == [terminal_2.id]
+
+
+@pytest.mark.asyncio
+async def test_filters_lookup_custom_apply_filter(sqlite_sessionmaker):
+    class TitleField(schema.StringField):
+        async def apply_filter(self, stmt, value, model, column):
+            return stmt.where(column == value.upper())
+
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(model=Terminal, fields=['id']),
+        table_filters=sqlalchemy.SQLAlchemyFieldsSchema(model=Terminal, fields=['title'], title=TitleField()),
+    )
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminal = await TerminalFactory(title='UPPER', merchant=merchant, currency=currency)
+
+    async def filter_ids(filters):
+        result = await category.get_list(schema.ListData(filters=filters), user, language_manager)
+        return [line['id'] for line in result.data]
+
+    assert await filter_ids({'title': 'upper'}) == [terminal.id]
+    assert await filter_ids({'title__eq': 'upper'}) == [terminal.id]
+    with pytest.raises(AdminAPIException):
+        await filter_ids({'title__prefix': 'up'})
+
+
+@pytest.mark.asyncio
+async def test_list_search_backend(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        search_fields=['title', 'description'],
+        search_backend=SQLiteFTS5SearchBackend(),
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id', 'title', 'description', 'merchant_id', 'currency_id'],
+        ),
+    )
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    existed = await TerminalFactory(title='Existed gateway', merchant=merchant, currency=currency)
+
+    async def search(value):
+        result = await category.get_list(schema.ListData(search=value), user, language_manager)
+        return sorted(line['id'] for line in result.data)
+
+    # Записи, созданные в обход админки, появляются после rebuild
+    assert await search('gateway') == []
+    await category.rebuild_search_index()
+    assert await search('gate') == [existed.id]
+
+    created = await category.create(
+        {
+            'title': 'Payment gateway',
+            'description': 'Primary processing',
+            'merchant_id': merchant.id,
+            'currency_id': currency.id,
+        },
+        user,
+        language_manager,
+    )
+    assert await search('gateway') == [existed.id, created.pk]
+    assert await search('primary gate') == [created.pk]
+
+    await category.update(created.pk, {'description': 'Reserve processing'}, user, language_manager)
+    assert await search('primary') == []
+    assert await search('reserve') == [created.pk]
+
+    await category.delete(ActionData(send_to_all=True, search='existed'))
+    assert await search('gateway') == [created.pk]
+
+
+@pytest.mark.asyncio
+async def test_search_backend_limit(sqlite_sessionmaker):
+    backend = SQLiteFTS5SearchBackend()
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        search_fields=['title'],
+        search_backend=backend,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id', 'title'],
+        ),
+    )
+    category.search_backend_limit = 2
+    category.delete_batch_size = 1
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    for title in ['Gateway 1', 'Gateway 2', 'Gateway 3', 'Other']:
+        await TerminalFactory(title=title, merchant=merchant, currency=currency)
+    await category.rebuild_search_index()
+
+    # Совпадений больше лимита - список не обрезается
+    result = await category.get_list(schema.ListData(search='Gateway%'), user, language_manager)
+    assert result.total_count == 3
+
+    result = await category.delete(ActionData(send_to_all=True, search='Gateway%'))
+    assert result.message.text.translation_kwargs == {'count': 3}
+    assert await backend.search(category.get_search_index_name(), 'gateway', 10) == []
+
+    result = await category.get_list(schema.ListData(), user, language_manager)
+    assert [line['title'] for line in result.data] == ['Other']
+
+
+@pytest.mark.asyncio
+async def test_search_backend_delete_commit_failed(sqlite_sessionmaker):
+    backend = SQLiteFTS5SearchBackend()
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        search_fields=['title'],
+        search_backend=backend,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(model=Terminal, fields=['id', 'title']),
+    )
+    category.delete_batch_size = 1
+
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    for title in ['Gateway 1', 'Gateway 2']:
+        await TerminalFactory(title=title, merchant=merchant, currency=currency)
+    await category.rebuild_search_index()
+
+    # Откат транзакции оставляет записи, значит и документы индекса
+    with mock.patch.object(AsyncSession, 'commit', side_effect=RuntimeError('commit failed')):
+        with pytest.raises(AdminAPIException):
+            await category.delete(ActionData(send_to_all=True, search='Gateway'))
+
+    assert len(await backend.search(category.get_search_index_name(), 'gateway', 10)) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_cache(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(
+            model=Terminal,
+            fields=['id', 'title'],
+        ),
+    )
+    category.list_cache_ttl = 60
+    language_manager = CustomLanguageManager('ru')
+    user = auth.UserABC(username="test")
+
+    merchant = await MerchantFactory()
+    currency = await CurrencyFactory()
+    terminal = await TerminalFactory(title='first', merchant=merchant, currency=currency)
+
+    list_data = schema.ListData(filters={}, page=1)
+    result = await category.get_list(list_data, user, language_manager)
+    assert result.data == [{'id': terminal.id, 'title': 'first'}]
+
+    # Ключ кеша строится по фактическому лимиту страницы
+    async def cache_key(**kwargs):
+        return await category.get_list_cache_key(schema.ListData.model_construct(**kwargs), user)
+
+    assert await cache_key(limit=None) == await cache_key(limit=0) == await cache_key(limit=25)
+    assert await cache_key(limit=500) == await cache_key(limit=150)
+
+    # Изменение в обход админки не видно до инвалидации
+    await TerminalFactory(title='second', merchant=merchant, currency=currency)
+    assert (await category.get_list(schema.ListData(), user, language_manager)).total_count == 1
+
+    # Другой пользователь не получает чужой кеш
+    other_user = auth.UserABC(username="other")
+    assert (await category.get_list(schema.ListData(), other_user, language_manager)).total_count == 2
+
+    await category.update(terminal.id, {'title': 'updated'}, user, language_manager)
+    result = await category.get_list(schema.ListData(), user, language_manager)
+    assert result.total_count == 2
+    assert result.data[-1] == {'id': terminal.id, 'title': 'updated'}
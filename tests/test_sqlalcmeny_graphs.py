@@ -0,0 +1,195 @@
+import datetime
+
+import pytest
+
+from admin_panel import schema, sqlalchemy
+from admin_panel.auth import UserABC
+from admin_panel.schema.graphs.category_graphs import GraphData
+from example.sections.models import Terminal, TerminalFactory
+
+
+class TerminalGraphs(sqlalchemy.SQLAlchemyAdminGraphs):
+    slug = 'terminal-graphs'
+
+    table_filters = sqlalchemy.SQLAlchemyFieldsSchema(model=Terminal, fields=['is_active'])
+
+    charts = [
+        sqlalchemy.SQLAlchemyChart(
+            slug='created',
+            model=Terminal,
+            date_field='created_at',
+            bucket=sqlalchemy.TimeBucket.DAY,
+            group_by='is_active',
+        ),
+        sqlalchemy.SQLAlchemyChart(
+            slug='delay',
+            model=Terminal,
+            date_field='created_at',
+            bucket=sqlalchemy.TimeBucket.MONTH,
+            aggregate=sqlalchemy.Aggregate.SUM,
+            value_field='registered_delay',
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_graphs_aggregation(sqlite_sessionmaker):
+    for day, is_active, delay in [(1, True, 5), (1, False, 10), (1, True, None), (3, True, 30), (40, False, 60)]:
+        await TerminalFactory.create_async(
+            created_at=datetime.datetime(2024, 1, 1) + datetime.timedelta(days=day - 1),
+            is_active=is_active,
+            registered_delay=delay,
+        )
+
+    graphs = TerminalGraphs(db_async_session=sqlite_sessionmaker)
+    user = UserABC(username='test')
+
+    result = await graphs.get_data(GraphData(), user)
+    created, delay = result.charts
+
+    assert created.data['labels'] == ['2024-01-01', '2024-01-03', '2024-02-09']
+    assert created.data['datasets'] == [
+        {'label': 'False', 'data': [1, 0, 1]},
+        {'label': 'True', 'data': [2, 1, 0]},
+    ]
+
+    assert delay.data['labels'] == ['2024-01', '2024-02']
+    assert delay.data['datasets'] == [{'label': 'delay', 'data': [45, 60]}]
+
+    result = await graphs.get_data(GraphData(filters={'is_active': True}), user)
+    assert result.charts[0].data['datasets'] == [{'label': 'True', 'data': [2, 1]}]
+
+
+def test_sqlalchemy_chart_validation():
+    with pytest.raises(AttributeError):
+        sqlalchemy.SQLAlchemyChart(slug='bad', model=Terminal, date_field='created_at', aggregate='sum')
+
+    with pytest.raises(AttributeError):
+        sqlalchemy.SQLAlchemyChart(slug='bad', model=Terminal, date_field='unknown')
+
+
+class TerminalGraphsFilters(sqlalchemy.SQLAlchemyFieldsSchema):
+    created_at = schema.DateTimeField(range=True)
+
+
+class TerminalRollupGraphs(sqlalchemy.SQLAlchemyAdminGraphs):
+    slug = 'terminal-rollup-graphs'
+
+    table_filters = TerminalGraphsFilters(model=Terminal, fields=['is_active', 'created_at', 'title'])
+
+    rollups = [
+        sqlalchemy.SQLAlchemyRollup(
+            slug='terminal_hourly',
+            model=Terminal,
+            date_field='created_at',
+            group_by='is_active',
+            value_fields=['registered_delay'],
+        ),
+    ]
+
+    charts = [
+        sqlalchemy.SQLAlchemyChart(
+            slug='created',
+            model=Terminal,
+            date_field='created_at',
+            bucket=sqlalchemy.TimeBucket.AUTO,
+            group_by='is_active',
+        ),
+        sqlalchemy.SQLAlchemyChart(
+            slug='delay',
+            model=Terminal,
+            date_field='created_at',
+            bucket=sqlalchemy.TimeBucket.DAY,
+            aggregate=sqlalchemy.Aggregate.AVG,
+            value_field='registered_delay',
+        ),
+    ]
+
+
+async def create_terminals(rows):
+    for hours, is_active, delay in rows:
+        await TerminalFactory.create_async(
+            created_at=datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=hours),
+            is_active=is_active,
+            registered_delay=delay,
+        )
+
+
+@pytest.mark.asyncio
+async def test_sqlalchemy_graphs_rollups(sqlite_sessionmaker):
+    graphs = TerminalRollupGraphs(db_async_session=sqlite_sessionmaker)
+    raw_graphs = TerminalRollupGraphs(db_async_session=sqlite_sessionmaker)
+    raw_graphs.rollups = []
+    user = UserABC(username='test')
+
+    await graphs.create_rollup_tables()
+    await create_terminals([(1, True, 5), (1, False, 10), (2, True, None), (30, True, 30)])
+    assert await graphs.refresh_rollups() == 4
+
+    # Новые строки в том же часе добавляются к уже посчитанным
+    await create_terminals([(1, True, 7), (80, False, 60)])
+    assert await graphs.refresh_rollups() == 2
+    assert await graphs.refresh_rollups() == 0
+
+    async with sqlite_sessionmaker() as session:
+        stmt = await graphs.get_chart_statement(session, graphs.charts[0], GraphData(filters={'is_active': True}))
+        assert 'rollup_terminal_hourly' in str(stmt)
+
+    for data in [
+        GraphData(),
+        GraphData(filters={'is_active': True}),
+        GraphData(filters={'created_at': {'from': '2024-01-01T00:00:00', 'to': '2024-01-01T12:00:00'}}),
+    ]:
+        result = await graphs.get_data(data, user)
+        raw_result = await raw_graphs.get_data(data, user)
+        assert result.charts == raw_result.charts
+
+    result = await graphs.get_data(GraphData(), user)
+    created, delay = result.charts
+    # Диапазон в 79 часов - почасовые точки
+    assert created.data['labels'][0] == '2024-01-01 01:00'
+    assert created.data['datasets'][1] == {'label': 'True', 'data': [2, 1, 1, 0]}
+    assert delay.data['datasets'] == [{'label': 'delay', 'data': [22 / 3, 30, 60]}]
+
+    # Фильтр по полю, которого нет в сводной таблице, считается по исходной
+    rollup = graphs.rollups[0]
+    assert await graphs.get_rollup_filters(rollup, graphs.charts[0], GraphData(filters={'title': 'x'})) is None
+
+
+@pytest.mark.asyncio
+async def test_rollup_refresh_late_commit(sqlite_sessionmaker):
+    rollup = sqlalchemy.SQLAlchemyRollup(
+        slug='terminal_late', model=Terminal, date_field='created_at', pk_lag=10,
+    )
+    created_at = datetime.datetime(2024, 1, 1)
+
+    async with sqlite_sessionmaker() as session:
+        await rollup.create_tables(session)
+
+    await TerminalFactory.create_async(id=1, created_at=created_at)
+    await TerminalFactory.create_async(id=3, created_at=created_at)
+    async with sqlite_sessionmaker() as session:
+        assert await rollup.refresh(session) == 2
+
+    # Строка с меньшим pk закоммичена после пересчета
+    await TerminalFactory.create_async(id=2, created_at=created_at)
+    async with sqlite_sessionmaker() as session:
+        assert await rollup.refresh(session) == 1
+        assert await rollup.refresh(session) == 0
+
+    # Строка вне окна pk_lag уже не учитывается
+    await TerminalFactory.create_async(id=20, created_at=created_at)
+    async with sqlite_sessionmaker() as session:
+        assert await rollup.refresh(session) == 1
+    await TerminalFactory.create_async(id=5, created_at=created_at)
+    async with sqlite_sessionmaker() as session:
+        assert await rollup.refresh(session) == 0
+        row_count = (await session.execute(rollup.table.select())).one().row_count
+    assert row_count == 4
+
+
+def test_select_bucket():
+    start = datetime.datetime(2024, 1, 1)
+    assert sqlalchemy.graphs.select_bucket(start, start + datetime.timedelta(days=2), 200) == 'hour'
+    assert sqlalchemy.graphs.select_bucket(start, start + datetime.timedelta(days=90), 200) == 'day'
+    assert sqlalchemy.graphs.select_bucket(start, start + datetime.timedelta(days=3650), 200) == 'month'
@@ -1,11 +1,14 @@
 from unittest import mock
 
 import pytest
+from sqlalchemy import Column, ForeignKey, Integer, Table
+from sqlalchemy.orm import configure_mappers, registry
 
 from admin_panel import schema, sqlalchemy
 from admin_panel.auth import UserABC
+from admin_panel.integrations.sqlalchemy.model_info import get_model_info
 from example.main import CustomLanguageManager
-from example.sections.models import Terminal
+from example.sections.models import Merchant, Terminal
 
 category_schema_data = {
     'graph_info': None,
@@ -14,6 +17,7 @@ category_schema_data = {
         'actions': {
             'delete': {
                 'allow_empty_selection': False,
+                'background': False,
                 'base_color': 'red-lighten-2',
                 'confirmation_text': 'Вы уверены, что хотите удалить данные записи?\n'
                 'Данное действие нельзя отменить.',
@@ -154,3 +158,74 @@ async def test_generate_category_schema(sqlite_sessionmaker):
     language_manager = CustomLanguageManager('ru')
     new_schema = category.generate_schema(UserABC(username="test"), language_manager)
     assert new_schema.model_dump() == category_schema_data, new_schema.model_dump()
+
+
+def test_model_info_shared_between_schemas():
+    model_info = get_model_info(Terminal)
+    assert get_model_info(Terminal) is model_info
+
+    assert model_info.pk_name == 'id'
+    assert model_info.pk_python_type is int
+    assert model_info.foreign_key_targets['merchant_id'] is Merchant
+    assert model_info.column_relationships['merchant_id'].key == 'merchant'
+
+
+@pytest.mark.asyncio
+async def test_request_path_does_not_inspect_mapper(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(model=Terminal, fields=FIELDS),
+    )
+    category.table_schema.get_fields()
+
+    with mock.patch('sqlalchemy.inspect', side_effect=AssertionError('inspect called')):
+        category.get_queryset()
+        assert category.parse_pk('5') == 5
+        assert category.table_schema.get_field('merchant_id')._get_target_model(Terminal, 'merchant_id')
+
+
+def test_generate_app_validates_deferred_schemas(sqlite_sessionmaker):
+    category = sqlalchemy.SQLAlchemyAdmin(
+        model=Terminal,
+        db_async_session=sqlite_sessionmaker,
+        table_schema=sqlalchemy.SQLAlchemyFieldsSchema(model=Terminal, fields=['no_field']),
+    )
+    admin_schema = schema.AdminSchema(
+        groups=[schema.Group(slug='terminals', categories=[category])],
+        auth=None,
+    )
+
+    # Поля генерируются отложенно, но ошибка конфигурации видна при старте приложения
+    with pytest.raises(AttributeError, match='no_field'):
+        admin_schema.generate_app()
+
+
+def test_model_info_resolves_late_foreign_key_target():
+    mapper_registry = registry()
+    target_table = Table('late_target', mapper_registry.metadata, Column('id', Integer, primary_key=True))
+    source_table = Table(
+        'late_source', mapper_registry.metadata,
+        Column('id', Integer, primary_key=True),
+        Column('target_id', ForeignKey('late_target.id')),
+    )
+
+    class Source:
+        pass
+
+    class Target:
+        pass
+
+    mapper_registry.map_imperatively(Source, source_table)
+    model_info = get_model_info(Source)
+    assert 'target_id' not in model_info.foreign_key_targets
+
+    # Ненайденная цель кешируется: повторное обращение не обходит registry
+    with mock.patch.object(model_info, 'resolve_foreign_key_targets') as resolve:
+        assert 'target_id' not in model_info.foreign_key_targets
+    resolve.assert_not_called()
+
+    # Модель-цель замаплена после первого обращения
+    mapper_registry.map_imperatively(Target, target_table)
+    configure_mappers()
+    assert model_info.foreign_key_targets['target_id'] is Target
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import admin_panel
+
+
+def get_imported_modules(code: str) -> set:
+    '''
+    Names of modules imported by the code in a fresh interpreter
+    '''
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True,
+    )
+
+    # import time: self [us] | cumulative | imported package
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def test_import_package_is_lazy():
+    modules = get_imported_modules('import admin_panel')
+
+    assert 'admin_panel' in modules
+    for module in ('pydantic', 'admin_panel.schema', 'admin_panel.integrations.sqlalchemy'):
+        assert module not in modules, f'{module} imported on startup'
+
+    assert admin_panel.schema.AdminSchema
+    assert admin_panel.sqlalchemy.SQLAlchemyAdmin
+
+
+def test_import_schema_skips_optional_subsystems():
+    modules = get_imported_modules('import admin_panel.schema')
+
+    assert 'admin_panel.schema' in modules
+    for module in ('fastapi', 'sqlalchemy', 'numpy', 'structlog', 'admin_panel.integrations.sqlalchemy'):
+        assert module not in modules, f'{module} imported on startup'
+
+
+def test_import_sqlalchemy_integration_skips_web_stack():
+    modules = get_imported_modules('import admin_panel.integrations.sqlalchemy')
+
+    assert 'admin_panel.integrations.sqlalchemy' in modules
+    for module in ('fastapi', 'numpy'):
+        assert module not in modules, f'{module} imported on startup'